@@ -8,16 +8,15 @@ from dotenv import load_dotenv
 from flask import (Flask, jsonify, make_response, render_template,
                    send_from_directory)
 from flask_login import LoginManager
-from flask_pymongo import PyMongo
 from flask_wtf.csrf import CSRFProtect
 from pywebpush import webpush, WebPushException
 
 from app.auth.auth_utils import UserManager
+from app.indexes import ensure_indexes
 from app.models import AssignmentSubscription
-from app.utils import limiter
+from app.utils import get_mongo_client, limiter
 
 csrf = CSRFProtect()
-mongo = PyMongo()
 login_manager = LoginManager()
 
 # Global variable to control notification thread
@@ -46,24 +45,25 @@ def create_app():
     else:
         app.logger.info("VAPID keys configured properly.")
 
-    mongo.init_app(app)
-    app.mongo = mongo
+    db = get_mongo_client(app.config["MONGO_URI"]).get_default_database()
     # csrf.init_app(app)
     limiter.init_app(app)
 
     with app.app_context():
-        if "users" not in mongo.db.list_collection_names():
-            mongo.db.create_collection("users")
-        if "teams" not in mongo.db.list_collection_names():
-            mongo.db.create_collection("teams")
-        if "team_data" not in mongo.db.list_collection_names():
-            mongo.db.create_collection("team_data")
-        if "pit_scouting" not in mongo.db.list_collection_names():
-            mongo.db.create_collection("pit_scouting")
-        if "assignments" not in mongo.db.list_collection_names():
-            mongo.db.create_collection("assignments")
-        if "assignment_subscriptions" not in mongo.db.list_collection_names():
-            mongo.db.create_collection("assignment_subscriptions")
+        if "users" not in db.list_collection_names():
+            db.create_collection("users")
+        if "teams" not in db.list_collection_names():
+            db.create_collection("teams")
+        if "team_data" not in db.list_collection_names():
+            db.create_collection("team_data")
+        if "pit_scouting" not in db.list_collection_names():
+            db.create_collection("pit_scouting")
+        if "assignments" not in db.list_collection_names():
+            db.create_collection("assignments")
+        if "assignment_subscriptions" not in db.list_collection_names():
+            db.create_collection("assignment_subscriptions")
+
+        ensure_indexes(db)
             
     login_manager.init_app(app)
     login_manager.login_view = "auth.login"
@@ -83,8 +83,6 @@ def create_app():
             app.logger.error(f"Error loading user: {e}")
             return None
 
-    user_manager = UserManager(app.config["MONGO_URI"])
-
     # Import blueprints inside create_app to avoid circular imports
     from app.auth.routes import auth_bp
     from app.scout.routes import scouting_bp
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from copy import deepcopy
 from datetime import datetime, timezone
 
 from flask_login import current_user
@@ -8,7 +9,7 @@ from gridfs import GridFS
 from werkzeug.security import generate_password_hash
 
 from app.models import User
-from app.utils import DatabaseManager, allowed_file, with_mongodb_retry
+from app.utils import DatabaseManager, allowed_file, user_cache, with_mongodb_retry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -93,6 +94,7 @@ class UserManager(DatabaseManager):
                         {"_id": user._id},
                         {"$set": {"last_login": datetime.now(timezone.utc)}},
                     )
+                    user_cache.pop(str(user._id))
                     logger.info(f"Successful login: {login}")
                     return True, user
             logger.warning(f"Failed login attempt: {login}")
@@ -102,13 +104,19 @@ class UserManager(DatabaseManager):
             return False, None
 
     def get_user_by_id(self, user_id):
-        """Retrieve user by ID with retry mechanism"""
+        """Retrieve user by ID, from the user cache when possible"""
+        if user_data := user_cache.get(str(user_id)):
+            return User.create_from_db(deepcopy(user_data))
+
         self.ensure_connected()
         try:
             from bson.objectid import ObjectId
 
             user_data = self.db.users.find_one({"_id": ObjectId(user_id)})
-            return User.create_from_db(user_data) if user_data else None
+            if not user_data:
+                return None
+            user_cache.set(str(user_id), user_data)
+            return User.create_from_db(deepcopy(user_data))
         except Exception as e:
             logger.error(f"Error loading user: {str(e)}")
             return None
@@ -137,6 +145,7 @@ class UserManager(DatabaseManager):
                 {"_id": ObjectId(user_id)},
                 {"$set": valid_updates}
             )
+            user_cache.pop(str(user_id))
 
             if result.modified_count > 0:
                 return True, "Profile updated successfully"
@@ -173,6 +182,7 @@ class UserManager(DatabaseManager):
                 {"_id": ObjectId(user_id)},
                 {"$set": {"profile_picture_id": file_id}}
             )
+            user_cache.pop(str(user_id))
             
             # If update was successful and there was an old picture, delete it
             if result.modified_count > 0 and old_picture_id:
@@ -223,6 +233,7 @@ class UserManager(DatabaseManager):
 
             # Delete user document
             result = self.db.users.delete_one({"_id": ObjectId(user_id)})
+            user_cache.pop(str(user_id))
             
             if result.deleted_count > 0:
                 return True, "Account deleted successfully"
@@ -1,15 +1,12 @@
 from __future__ import annotations
 
-import asyncio
 import os
-from functools import wraps
 from urllib.parse import urljoin, urlparse
 
 from bson import ObjectId
 from flask import (Blueprint, current_app, flash, jsonify, redirect,
                    render_template, request, send_file, url_for)
 from flask_login import current_user, login_required, login_user, logout_user
-from flask_pymongo import PyMongo
 from gridfs import GridFS
 from werkzeug.utils import secure_filename
 
@@ -60,33 +57,14 @@ def send_profile_picture(file_id):
         return send_file("static/images/default_profile.png")
 
 
-def run_async(coro):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
-def async_route(f):
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        return run_async(f(*args, **kwargs))
-
-    return wrapper
-
-
 auth_bp = Blueprint("auth", __name__)
 user_manager = None
-mongo = None
 
 
 @auth_bp.record
 def on_blueprint_init(state):
-    global user_manager, mongo
+    global user_manager
     app = state.app
-    mongo = PyMongo(app)
     user_manager = UserManager(app.config["MONGO_URI"])
 
 
@@ -0,0 +1,229 @@
+"""Index registry for every collection the app queries.
+
+`ensure_indexes` is run at startup and is idempotent. Running this module
+prints the winning plan for each known hot query shape and exits non-zero if
+any of them falls back to a collection scan:
+
+    python -m app.indexes
+"""
+import logging
+import os
+import sys
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Scouting entries are unique per robot per match for each scouting team
+TEAM_DATA_UNIQUE_KEYS = [
+    ("scouting_team_number", 1), ("event_code", 1), ("match_number", 1), ("team_number", 1),
+]
+
+# collection -> [(keys, options)]
+INDEXES = {
+    "users": [
+        ([("username", 1)], {"unique": True}),
+        ([("email", 1)], {"unique": True}),
+        ([("teamNumber", 1)], {}),
+    ],
+    "teams": [
+        ([("team_number", 1)], {"unique": True}),
+        ([("team_join_code", 1)], {"unique": True}),
+    ],
+    "team_data": [
+        ([("event_code", 1), ("match_number", 1), ("team_number", 1)], {}),
+        ([("team_number", 1)], {}),
+        # Keyset pagination of the scouting list, newest first
+        ([("scouter_id", 1), ("_id", -1)], {}),
+        ([("scouting_team_number", 1), ("_id", -1)], {}),
+        ([("scouting_team_number", 1), ("team_number", 1)], {}),
+        # One entry per robot per match for each scouting team
+        (TEAM_DATA_UNIQUE_KEYS, {"unique": True}),
+    ],
+    "pit_scouting": [
+        ([("team_number", 1)], {}),
+        ([("scouter_id", 1)], {}),
+        ([("scouting_team_number", 1), ("team_number", 1)], {}),
+    ],
+    "team_stats": [
+        ([("scope", 1), ("team_number", 1)], {"unique": True}),
+    ],
+    "assignments": [
+        ([("team_number", 1)], {}),
+        # Reminder outbox: only assignments with a pending reschedule
+        ([("reminders_pending", 1)],
+         {"partialFilterExpression": {"reminders_pending": {"$exists": True}}}),
+    ],
+    "assignment_subscriptions": [
+        ([("sent", 1), ("status", 1), ("scheduled_time", 1)], {}),
+        ([("user_id", 1), ("team_number", 1), ("assignment_id", 1)], {}),
+        ([("team_number", 1), ("assignment_id", 1)], {}),
+        ([("assignment_id", 1), ("sent", 1)], {}),
+        # Next lease to expire: only notifications currently claimed
+        ([("lease_expires_at", 1)],
+         {"partialFilterExpression": {"status": "claimed"}}),
+    ],
+    "tba_teams": [
+        ([("search_terms", 1)], {}),
+    ],
+    "tba_cache": [
+        ([("updated_at", 1)], {"expireAfterSeconds": 7 * 24 * 60 * 60}),
+    ],
+}
+
+# (description, collection, filter, sort) for the hot read paths
+QUERY_SHAPES = [
+    ("scouting duplicate check", "team_data",
+     {"scouting_team_number": 334, "event_code": "EVENT", "match_number": 1}, None),
+    ("scouting list page (team access)", "team_data",
+     {"$or": [{"scouting_team_number": 334}, {"scouter_id": ObjectId()}],
+      "_id": {"$lt": ObjectId()}}, [("_id", -1)]),
+    ("team scouting data", "team_data",
+     {"team_number": 334, "scouting_team_number": 334}, [("match_number", -1)]),
+    ("pit scouting duplicate check", "pit_scouting",
+     {"team_number": 334, "scouting_team_number": 334}, None),
+    ("team stats point read", "team_stats",
+     {"scope": "all", "team_number": 334}, None),
+    ("team directory search", "tba_teams",
+     {"search_terms": {"$all": ["t:rob", "t:obo"]}}, None),
+    ("team directory number and name search", "tba_teams",
+     {"$or": [{"search_terms": {"$all": ["n:334"]}},
+              {"search_terms": {"$all": ["t:tea", "t:eam"]}}]}, None),
+    ("login by username", "users", {"username": "user"}, None),
+    ("login by email", "users", {"email": "user@example.com"}, None),
+    ("team by number", "teams", {"team_number": 334}, None),
+    ("team by join code", "teams", {"team_join_code": "ABC123"}, None),
+    ("team assignments", "assignments", {"team_number": 334}, None),
+    ("next scheduled notification", "assignment_subscriptions",
+     {"sent": False, "status": "pending", "scheduled_time": {"$type": "date"}},
+     [("scheduled_time", 1)]),
+    ("next lease expiry", "assignment_subscriptions",
+     {"sent": False, "status": "claimed"}, [("lease_expires_at", 1)]),
+    ("reminder outbox", "assignments", {"reminders_pending": {"$exists": True}}, None),
+    ("unsent assignment reminders", "assignment_subscriptions",
+     {"assignment_id": "assignment", "sent": False}, None),
+    ("user subscription", "assignment_subscriptions",
+     {"user_id": "user", "team_number": 334, "assignment_id": None}, None),
+]
+
+
+def _timed_query_shapes(now):
+    """Query shapes that compare against the current time, built per run"""
+    return [
+        ("claimable notifications", "assignment_subscriptions",
+         {"scheduled_time": {"$lte": now}, "sent": False,
+          "$or": [{"status": "pending"},
+                  {"status": "claimed", "lease_expires_at": {"$lte": now}}]},
+         [("scheduled_time", 1)]),
+    ]
+
+
+def dedupe_team_data(db):
+    """Move all but the first entry for each robot in each scouting team's
+    match to `team_data_duplicates`, so the unique index can be built.
+    Drops team_stats and match_slots, which ScoutingManager rebuilds from
+    the remaining entries. Does nothing once the index exists. Returns how
+    many entries were moved."""
+    if any(
+        index.get("unique") and index["key"] == TEAM_DATA_UNIQUE_KEYS
+        for index in db.team_data.index_information().values()
+    ):
+        return 0
+
+    duplicates = db.team_data.aggregate([
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {
+            "_id": {
+                "scouting_team_number": "$scouting_team_number",
+                "event_code": "$event_code",
+                "match_number": "$match_number",
+                "team_number": "$team_number",
+            },
+            "ids": {"$push": "$_id"},
+        }},
+        {"$match": {"ids.1": {"$exists": True}}},
+    ], allowDiskUse=True)
+
+    moved = 0
+    for group in duplicates:
+        extra = group["ids"][1:]
+        docs = list(db.team_data.find({"_id": {"$in": extra}}))
+        if docs:
+            db.team_data_duplicates.insert_many(docs)
+            moved += db.team_data.delete_many({"_id": {"$in": extra}}).deleted_count
+
+    if moved:
+        db.team_stats.drop()
+        db.match_slots.drop()
+        logger.warning(
+            f"Moved {moved} duplicate scouting entries to team_data_duplicates; "
+            "team_stats and match_slots will be rebuilt"
+        )
+    return moved
+
+
+def ensure_indexes(db):
+    """Create every registered index; existing indexes are left untouched.
+    Raises if a unique index can't be built, since the app relies on them
+    to reject duplicates."""
+    dedupe_team_data(db)
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                db[collection].create_index(keys, **options)
+            except OperationFailure as e:
+                logger.error(f"Could not create index {keys} on {collection}: {str(e)}")
+                if options.get("unique"):
+                    raise
+    logger.info("Database indexes ensured")
+
+
+def _plan_stages(plan):
+    """Flatten a winning plan into (stage, index name) pairs"""
+    stages = [(plan.get("stage"), plan.get("indexName"))]
+    for child in plan.get("inputStages", []) + [plan.get("inputStage")]:
+        if child:
+            stages.extend(_plan_stages(child))
+    return stages
+
+
+def explain_query_shapes(db):
+    """Winning plan stages for every registered query shape"""
+    results = []
+    for description, collection, query, sort in QUERY_SHAPES + _timed_query_shapes(datetime.now()):
+        command = {"find": collection, "filter": query}
+        if sort:
+            command["sort"] = dict(sort)
+        explain = db.command("explain", command, verbosity="queryPlanner")
+        stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+        results.append((description, collection, stages))
+    return results
+
+
+def main():
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv()
+    client = MongoClient(
+        os.getenv("MONGO_URI", "mongodb://localhost:27017/scouting_app"),
+        serverSelectionTimeoutMS=5000
+    )
+    db = client.get_default_database()
+    ensure_indexes(db)
+
+    regressions = 0
+    for description, collection, stages in explain_query_shapes(db):
+        collscan = any(stage == "COLLSCAN" for stage, _ in stages)
+        regressions += collscan
+        plan = " -> ".join(f"{stage}({index})" if index else stage for stage, index in stages)
+        print(f"{'COLLSCAN' if collscan else 'ok':8} {collection}: {description}: {plan}")
+
+    client.close()
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
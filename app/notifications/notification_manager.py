@@ -1,8 +1,16 @@
+import asyncio
 import logging
+import os
+import socket
 import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
 from bson import ObjectId
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
 from typing import Dict, List, Optional, Tuple, Any
 
 from app.models import AssignmentSubscription
@@ -11,6 +19,250 @@ from pywebpush import webpush, WebPushException
 
 logger = logging.getLogger(__name__)
 
+# Web push requests are sent concurrently from one pool shared by every
+# NotificationManager in the process
+PUSH_WORKERS = int(os.getenv("PUSH_WORKERS", 16))
+
+# Due notifications claimed and sent per batch. No more than the pool can
+# send at once, so a claimed notification never waits behind other sends.
+CLAIM_BATCH_SIZE = PUSH_WORKERS
+
+# How long a claimed notification belongs to the worker that claimed it. If
+# the worker dies before recording a result, another worker reclaims it once
+# the lease runs out.
+CLAIM_LEASE = timedelta(seconds=int(os.getenv("NOTIFICATION_LEASE_SECONDS", 120)))
+
+# Timeout for each web push request. Kept well under CLAIM_LEASE so a send
+# finishes before its claim can be taken over and sent again.
+PUSH_TIMEOUT = 10
+
+# Push outcomes
+SENT = "sent"
+FAILED = "failed"
+EXPIRED = "expired"  # the browser closed the subscription
+
+# Longest the worker sleeps when nothing is due. Bounds how late it notices
+# work scheduled by other processes, which can't wake it directly.
+MAX_IDLE_SECONDS = int(os.getenv("NOTIFICATION_MAX_IDLE_SECONDS", 300))
+
+# Shortest sleep between passes, so a notification that stays due (e.g. one
+# claimed elsewhere) can't spin the worker
+MIN_IDLE_SECONDS = 1
+
+# Document in `migrations` recording that assignments written before the
+# reminder outbox existed have been flagged for rescheduling
+REMINDER_OUTBOX_MIGRATION_ID = "assignment_reminders_outbox"
+
+# Every NotificationManager in this process, so wake_notification_workers can
+# reach each one's worker
+_managers = weakref.WeakSet()
+_managers_lock = threading.Lock()
+
+_push_pool = None
+_push_pool_lock = threading.Lock()
+_push_stats_lock = threading.Lock()
+
+# Pushes waiting for or running on the pool, outcome counts, and web push
+# request latency in seconds
+push_stats = {
+    "queue_depth": 0,
+    SENT: 0,
+    FAILED: 0,
+    EXPIRED: 0,
+    "latency_total": 0.0,
+    "latency_max": 0.0,
+}
+
+
+def _get_push_pool():
+    global _push_pool
+    if _push_pool is None:
+        with _push_pool_lock:
+            if _push_pool is None:
+                _push_pool = ThreadPoolExecutor(
+                    max_workers=PUSH_WORKERS, thread_name_prefix="webpush"
+                )
+    return _push_pool
+
+
+def _record_push(outcome: str, latency: float):
+    with _push_stats_lock:
+        push_stats["queue_depth"] -= 1
+        push_stats[outcome] += 1
+        push_stats["latency_total"] += latency
+        push_stats["latency_max"] = max(push_stats["latency_max"], latency)
+
+
+def get_push_stats() -> Dict[str, float]:
+    """Snapshot of push_stats including the average send latency"""
+    with _push_stats_lock:
+        stats = dict(push_stats)
+    completed = stats[SENT] + stats[FAILED] + stats[EXPIRED]
+    stats["latency_avg"] = stats["latency_total"] / completed if completed else 0.0
+    return stats
+
+def wake_notification_workers():
+    """Wake the notification workers in this process to check for new work,
+    e.g. when a reminder is scheduled"""
+    with _managers_lock:
+        managers = list(_managers)
+    for manager in managers:
+        manager._wake_event.set()
+
+
+def _parse_due_date(due_date) -> Optional[datetime]:
+    """Due dates are stored as ISO strings from the assignment form or as
+    datetimes; reminders are scheduled in naive local time"""
+    if isinstance(due_date, str):
+        try:
+            due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            return None
+    if isinstance(due_date, datetime) and due_date.tzinfo:
+        due_date = due_date.astimezone().replace(tzinfo=None)
+    return due_date or None
+
+
+def _reminder_content(assignment_id: str, assignment: Dict, due_date: datetime) -> Dict:
+    return {
+        "title": f"Assignment Reminder: {assignment.get('title')}",
+        "body": f"Your assignment '{assignment.get('title')}' is due soon",
+        "url": "/team/manage",
+        "data": {
+            "assignment_id": assignment_id,
+            "title": assignment.get("title"),
+            "due_date": due_date.isoformat(),
+            "type": "assignment_reminder",
+        },
+    }
+
+
+def schedule_assignment_reminders(db, assignment: Dict) -> int:
+    """Create reminders for an assignment's assigned users from their team
+    subscriptions, skipping users who already have an unsent one
+
+    Returns:
+        int: Number of reminders created
+    """
+    assignment_id = str(assignment["_id"])
+    team_number = assignment.get("team_number")
+    assigned_to = assignment.get("assigned_to", [])
+
+    if not assignment.get("due_date") or not assigned_to:
+        return 0
+
+    due_date = _parse_due_date(assignment["due_date"])
+    if not due_date:
+        logger.error(f"Invalid due date format for assignment {assignment_id}")
+        return 0
+
+    # Users who already have an unsent reminder for this assignment
+    existing_user_ids = db.assignment_subscriptions.distinct("user_id", {
+        "assignment_id": assignment_id,
+        "sent": False
+    })
+
+    # Team subscriptions of the assigned users
+    team_subscriptions = db.assignment_subscriptions.find({
+        "team_number": team_number,
+        "assignment_id": None,
+        "user_id": {"$in": assigned_to, "$nin": existing_user_ids},
+        "subscription_json": {"$exists": True, "$ne": {}}
+    })
+
+    now = datetime.now()
+    reminders = []
+    for sub in team_subscriptions:
+        # Calculate scheduled time based on reminder_time
+        reminder_time = sub.get("reminder_time", 1440)  # Default: 1 day in minutes
+        scheduled_time = due_date - timedelta(minutes=reminder_time)
+
+        # Only schedule if it's in the future
+        if scheduled_time <= now:
+            continue
+
+        reminders.append({
+            "user_id": sub.get("user_id"),
+            "team_number": team_number,
+            "subscription_json": sub.get("subscription_json", {}),
+            "assignment_id": assignment_id,
+            "reminder_time": reminder_time,
+            "scheduled_time": scheduled_time,
+            "sent": False,
+            "status": "pending",
+            **_reminder_content(assignment_id, assignment, due_date),
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    if reminders:
+        db.assignment_subscriptions.insert_many(reminders)
+    return len(reminders)
+
+
+def reschedule_assignment_reminders(db, assignment: Dict) -> int:
+    """Bring an assignment's unsent reminders in line with its current due
+    date, title and assignees, then create any that are missing
+
+    Returns:
+        int: Number of reminders created
+    """
+    assignment_id = str(assignment["_id"])
+    unsent = {"assignment_id": assignment_id, "sent": False, "status": "pending"}
+    due_date = _parse_due_date(assignment.get("due_date"))
+
+    if not due_date or assignment.get("status") == "completed":
+        db.assignment_subscriptions.delete_many(unsent)
+        return 0
+
+    # Drop reminders for users who are no longer assigned
+    db.assignment_subscriptions.delete_many({
+        **unsent,
+        "user_id": {"$nin": assignment.get("assigned_to", [])}
+    })
+
+    # Move the rest to the current due date in one update
+    now = datetime.now()
+    content = _reminder_content(assignment_id, assignment, due_date)
+    db.assignment_subscriptions.update_many(unsent, [{"$set": {
+        "scheduled_time": {"$subtract": [due_date, {"$multiply": ["$reminder_time", 60 * 1000]}]},
+        **{field: {"$literal": value} for field, value in content.items()},
+        "updated_at": now,
+    }}])
+
+    # An earlier due date can move reminders into the past; like the ones
+    # schedule_assignment_reminders skips, they are no longer sent
+    db.assignment_subscriptions.delete_many({**unsent, "scheduled_time": {"$lte": now}})
+
+    return schedule_assignment_reminders(db, assignment)
+
+
+def flush_reminder_outbox(db, query: Optional[Dict] = None) -> int:
+    """Reschedule reminders for assignments flagged `reminders_pending`
+
+    Writes that affect reminders set the flag to a fresh ObjectId in the same
+    update, then flush right away. Anything a failed or interrupted flush
+    left behind is picked up by the notification worker. A flag is only
+    cleared if it wasn't set again while the assignment was being handled.
+
+    Returns:
+        int: Number of assignments rescheduled
+    """
+    count = 0
+    for assignment in db.assignments.find({"reminders_pending": {"$exists": True}, **(query or {})}):
+        reschedule_assignment_reminders(db, assignment)
+        db.assignments.update_one(
+            {"_id": assignment["_id"], "reminders_pending": assignment["reminders_pending"]},
+            {"$unset": {"reminders_pending": ""}}
+        )
+        count += 1
+
+    if count:
+        # Reminder times may now be earlier than what the worker sleeps until
+        wake_notification_workers()
+    return count
+
+
 class NotificationManager(DatabaseManager):
     """Manages push notifications and subscriptions"""
     
@@ -26,14 +278,48 @@ class NotificationManager(DatabaseManager):
         self.vapid_private_key = vapid_private_key
         self.vapid_claims = vapid_claims
         self._shutdown_event = threading.Event()
+        # Set to wake this manager's worker early
+        self._wake_event = threading.Event()
         self._notification_thread = None
+        # Identifies this worker's claims across processes and hosts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
         self._ensure_collections()
+        with _managers_lock:
+            _managers.add(self)
         
     def _ensure_collections(self) -> None:
         """Ensure required collections exist"""
         if "assignment_subscriptions" not in self.db.list_collection_names():
             self.db.create_collection("assignment_subscriptions")
             logger.info("Created assignment_subscriptions collection")
+        self._migrate_reminder_outbox()
+
+    def _migrate_reminder_outbox(self):
+        """Flag every open assignment once for rescheduling, so reminders that
+        were missed before writes went through the outbox are picked up by
+        the worker's next pass"""
+        try:
+            if self.db.migrations.find_one({"_id": REMINDER_OUTBOX_MIGRATION_ID}):
+                return
+
+            result = self.db.assignments.update_many(
+                {
+                    "status": {"$ne": "completed"},
+                    "due_date": {"$nin": [None, ""]},
+                    "reminders_pending": {"$exists": False},
+                },
+                {"$set": {"reminders_pending": ObjectId()}}
+            )
+            # Recorded after flagging: if this process dies in between, the
+            # next one flags again, which only reschedules the same reminders
+            self.db.migrations.update_one(
+                {"_id": REMINDER_OUTBOX_MIGRATION_ID},
+                {"$set": {"completed_at": datetime.now(), "assignments": result.modified_count}},
+                upsert=True
+            )
+            logger.info(f"Flagged {result.modified_count} open assignments for reminder rescheduling")
+        except Exception as e:
+            logger.error(f"Error during reminder outbox migration: {str(e)}")
             
     def start_notification_service(self):
         """Start the background thread that processes notifications"""
@@ -50,6 +336,7 @@ class NotificationManager(DatabaseManager):
         """Stop the notification background thread"""
         if self._notification_thread and self._notification_thread.is_alive():
             self._shutdown_event.set()
+            self._wake_event.set()
             self._notification_thread.join(timeout=5)
             logger.info("Notification service stopped")
     
@@ -58,180 +345,174 @@ class NotificationManager(DatabaseManager):
         logger.info("Notification worker started")
         
         while not self._shutdown_event.is_set():
+            # Cleared before the pass so a wake-up during it isn't lost
+            self._wake_event.clear()
             try:
+                # Schedule reminders left in the outbox
+                self._schedule_assignment_notifications()
+
                 # Check for notifications that need to be sent
                 self._process_pending_notifications()
                 
-                # Schedule notifications for upcoming assignments
-                self._schedule_assignment_notifications()
-                
-                # Sleep for a 15s before checking again
-                self._shutdown_event.wait(15)
+                # Sleep until the next notification is due or a wake-up
+                timeout = self._seconds_until_next_notification()
             except Exception as e:
                 logger.error(f"Error in notification worker: {str(e)}")
                 # Sleep for 5 seconds before retrying after an error
-                self._shutdown_event.wait(5)
+                timeout = 5
+            self._wake_event.wait(timeout)
+
+    @with_mongodb_retry()
+    def _seconds_until_next_notification(self) -> float:
+        """Time until the earliest pending notification is due or a claimed
+        one's lease runs out, clamped to [MIN_IDLE_SECONDS, MAX_IDLE_SECONDS]"""
+        self.ensure_connected()
+
+        next_times = []
+        if pending := self.db.assignment_subscriptions.find_one(
+            {"sent": False, "status": "pending", "scheduled_time": {"$type": "date"}},
+            {"scheduled_time": 1},
+            sort=[("scheduled_time", 1)]
+        ):
+            next_times.append(pending["scheduled_time"])
+        if claimed := self.db.assignment_subscriptions.find_one(
+            {"sent": False, "status": "claimed"},
+            {"lease_expires_at": 1},
+            sort=[("lease_expires_at", 1)]
+        ):
+            next_times.append(claimed["lease_expires_at"])
+
+        if not next_times:
+            return MAX_IDLE_SECONDS
+        seconds = (min(next_times) - datetime.now()).total_seconds()
+        return min(max(seconds, MIN_IDLE_SECONDS), MAX_IDLE_SECONDS)
     
     @with_mongodb_retry()
     def _process_pending_notifications(self):
         """Process all pending notifications that are due to be sent"""
         self.ensure_connected()
 
-        # Find notifications scheduled for now or earlier that haven't been sent
-        now = datetime.now()
-        pending_notifications = self.db.assignment_subscriptions.find({
-            "scheduled_time": {"$lte": now},
-            "sent": False,
-            "status": "pending"
-        })
-
+        # Claim due notifications a batch at a time; every worker process
+        # runs this loop, and the claim guarantees each one is sent once
         count = 0
-        for notification in pending_notifications:
-            subscription_obj = AssignmentSubscription.create_from_db(notification)
+        while not self._shutdown_event.is_set():
+            batch = []
+            while len(batch) < CLAIM_BATCH_SIZE:
+                if not (notification := self._claim_next()):
+                    break
+                batch.append(AssignmentSubscription.create_from_db(notification))
+            if not batch:
+                break
+            count += self._deliver(batch)
+            if len(batch) < CLAIM_BATCH_SIZE:
+                break
 
-            try:
-                if success := self._send_push_notification(subscription_obj):
-                    subscription_obj.mark_as_sent()
-                    self.db.assignment_subscriptions.update_one(
-                        {"_id": subscription_obj._id},
-                        {"$set": {
-                            "sent": True,
-                            "sent_at": datetime.now(),
-                            "status": "sent",
-                            "updated_at": datetime.now()
-                        }}
-                    )
-                    count += 1
-                else:
-                    # Mark as error if sending failed
-                    self.db.assignment_subscriptions.update_one(
-                        {"_id": subscription_obj._id},
-                        {"$set": {
-                            "status": "error",
-                            "error": "Failed to send push notification",
-                            "updated_at": datetime.now()
-                        }}
-                    )
-            except Exception as e:
-                logger.error(f"Error processing notification {subscription_obj.id}: {str(e)}")
-                self.db.assignment_subscriptions.update_one(
-                    {"_id": subscription_obj._id},
+        if count > 0:
+            stats = get_push_stats()
+            logger.info(
+                f"Sent {count} notifications "
+                f"(avg latency {stats['latency_avg']:.2f}s, queue depth {stats['queue_depth']})"
+            )
+
+    def _claim_next(self) -> Optional[Dict]:
+        """Atomically claim the earliest due notification for this worker.
+        Pending notifications are claimable, as are claimed ones whose lease
+        has expired."""
+        now = datetime.now()
+        return self.db.assignment_subscriptions.find_one_and_update(
+            {
+                "scheduled_time": {"$lte": now},
+                "sent": False,
+                "$or": [
+                    {"status": "pending"},
+                    {"status": "claimed", "lease_expires_at": {"$lte": now}},
+                ],
+            },
+            {"$set": {
+                "status": "claimed",
+                "claimed_by": self.worker_id,
+                "lease_expires_at": now + CLAIM_LEASE,
+                "updated_at": now
+            }},
+            sort=[("scheduled_time", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _deliver(self, subscriptions: List[AssignmentSubscription]) -> int:
+        """Send a batch of due notifications and record every result with one
+        bulk write. Returns how many were sent."""
+        operations = []
+        count = 0
+        for subscription, outcome, error in self._dispatch(subscriptions):
+            now = datetime.now()
+            # Only record results for notifications this worker still holds
+            claim = {"_id": subscription._id, "claimed_by": self.worker_id}
+            if outcome == SENT:
+                count += 1
+                operations.append(UpdateOne(
+                    claim,
+                    {"$set": {
+                        "sent": True,
+                        "sent_at": now,
+                        "status": "sent",
+                        "updated_at": now
+                    }}
+                ))
+            elif outcome == EXPIRED:
+                # Remove the subscription since it's no longer valid
+                operations.append(DeleteOne(claim))
+                logger.info(f"Removed invalid subscription {subscription.id}")
+            else:
+                operations.append(UpdateOne(
+                    claim,
                     {"$set": {
                         "status": "error",
-                        "error": str(e),
-                        "updated_at": datetime.now()
+                        "error": error,
+                        "updated_at": now
                     }}
-                )
+                ))
 
-        if count > 0:
-            logger.info(f"Sent {count} notifications")
-    
-    @with_mongodb_retry()
-    def _schedule_assignment_notifications(self):
-        """Schedule notifications for assignments with due dates"""
-        self.ensure_connected()
-        
-        # Get assignments with due dates
-        assignments = self.db.assignments.find({
-            "due_date": {"$exists": True, "$ne": None}
-        })
-        
-        for assignment in assignments:
-            # Get the subscriptions for this assignment
-            self._schedule_assignment_reminder(assignment)
-    
-    def _schedule_assignment_reminder(self, assignment: Dict):
-        """Schedule reminders for a specific assignment
-        
-        Args:
-            assignment: The assignment document from MongoDB
-        """
-        assignment_id = str(assignment["_id"])
-        due_date = assignment.get("due_date")
-        team_number = assignment.get("team_number")
-
-        if not due_date:
-            return
-
-        # Ensure due_date is a datetime object
-        if isinstance(due_date, str):
-            try:
-                due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-            except (ValueError, AttributeError):
-                logger.error(f"Invalid due date format for assignment {assignment_id}")
-                return
-
-        # Find existing subscriptions for this assignment
-        existing = self.db.assignment_subscriptions.find({
-            "assignment_id": assignment_id,
-            "sent": False
-        })
-        existing_user_ids = [sub.get("user_id") for sub in existing]
-
-        # Get all subscriptions for the team that don't have specific assignment subscriptions
-        team_subscriptions = self.db.assignment_subscriptions.find({
-            "team_number": team_number,
-            "assignment_id": None,
-            "user_id": {"$nin": existing_user_ids},
-            "subscription_json": {"$exists": True, "$ne": {}}
-        })
+        if operations:
+            self.db.assignment_subscriptions.bulk_write(operations, ordered=False)
+        return count
 
-        # For each team subscription, create an assignment-specific subscription
-        for sub in team_subscriptions:
-            user_id = sub.get("user_id")
+    def _dispatch(self, subscriptions: List[AssignmentSubscription]) -> List[Tuple[AssignmentSubscription, str, str]]:
+        """Send push notifications concurrently on the shared pool
 
-            # Check if user is assigned to this task
-            if user_id not in assignment.get("assigned_to", []):
-                continue
-
-            # Calculate scheduled time based on reminder_time
-            reminder_time = sub.get("reminder_time", 1440)  # Default: 1 day in minutes
-            scheduled_time = due_date - timedelta(minutes=reminder_time)
-
-            # Only schedule if it's in the future
-            if scheduled_time <= datetime.now():
-                continue
+        Returns:
+            List of (subscription, outcome, error message) in input order
+        """
+        with _push_stats_lock:
+            push_stats["queue_depth"] += len(subscriptions)
+        results = _get_push_pool().map(self._send_push_notification, subscriptions)
+        return [(subscription, *result) for subscription, result in zip(subscriptions, results)]
 
-            # Create the notification
-            new_notification = {
-                "user_id": user_id,
-                "team_number": team_number,
-                "subscription_json": sub.get("subscription_json", {}),
-                "assignment_id": assignment_id,
-                "reminder_time": reminder_time,
-                "scheduled_time": scheduled_time,
-                "sent": False,
-                "status": "pending",
-                "title": f"Assignment Reminder: {assignment.get('title')}",
-                "body": f"Your assignment '{assignment.get('title')}' is due soon",
-                "url": "/team/manage",
-                "data": {
-                    "assignment_id": assignment_id,
-                    "title": assignment.get("title"),
-                    "due_date": due_date.isoformat(),
-                    "type": "assignment_reminder",
-                },
-                "created_at": datetime.now(),
-                "updated_at": datetime.now(),
-            }
+    @with_mongodb_retry()
+    def _schedule_assignment_notifications(self):
+        """Schedule reminders that weren't scheduled when their assignment or
+        subscription was written"""
+        self.ensure_connected()
 
-            # Insert the new notification
-            self.db.assignment_subscriptions.insert_one(new_notification)
+        if count := flush_reminder_outbox(self.db):
+            logger.info(f"Rescheduled reminders for {count} assignments from the outbox")
     
-    def _send_push_notification(self, subscription: AssignmentSubscription) -> bool:
+    def _send_push_notification(self, subscription: AssignmentSubscription) -> Tuple[str, Optional[str]]:
         """Send a push notification using WebPush
         
         Args:
             subscription: The AssignmentSubscription object
             
         Returns:
-            bool: True if the notification was sent successfully
+            Tuple[str, Optional[str]]: SENT, FAILED or EXPIRED, and the error
+            message for anything that wasn't sent
         """
+        started = time.monotonic()
+        outcome, error = FAILED, "Failed to send push notification"
         try:
             subscription_info = subscription.subscription_json
             if not subscription_info:
                 logger.warning(f"Empty subscription info for {subscription.id}")
-                return False
+                return outcome, error
                 
             data = {
                 "title": subscription.title,
@@ -262,23 +543,24 @@ class NotificationManager(DatabaseManager):
                 subscription_info=subscription_info,
                 data=json.dumps(data),
                 vapid_private_key=self.vapid_private_key,
-                vapid_claims=self.vapid_claims
+                vapid_claims=self.vapid_claims,
+                timeout=PUSH_TIMEOUT
             )
             
-            return True
+            outcome, error = SENT, None
         except WebPushException as e:
             logger.error(f"WebPush error for {subscription.id}: {str(e)}")
             
-            # Handle subscription that has been closed
-            if e.response and e.response.status_code in (404, 410):
-                # Remove the subscription since it's no longer valid
-                self.db.assignment_subscriptions.delete_one({"_id": subscription._id})
-                logger.info(f"Removed invalid subscription {subscription.id}")
-                
-            return False
+            # The subscription has been closed by the browser. Responses
+            # are falsy for error statuses, so compare against None.
+            if e.response is not None and e.response.status_code in (404, 410):
+                outcome, error = EXPIRED, str(e)
         except Exception as e:
             logger.error(f"Error sending push notification: {str(e)}")
-            return False
+            error = str(e)
+        finally:
+            _record_push(outcome, time.monotonic() - started)
+        return outcome, error
     
     @with_mongodb_retry()
     async def create_subscription(self, user_id: str, team_number: int, 
@@ -372,6 +654,11 @@ class NotificationManager(DatabaseManager):
                 upsert=True
             )
 
+            if not assignment_id:
+                self._schedule_user_reminders(user_id, team_number, subscription_json)
+            elif scheduled_time:
+                wake_notification_workers()
+
             if result.matched_count > 0:
                 return True, "Subscription updated successfully"
             elif result.upserted_id:
@@ -383,6 +670,31 @@ class NotificationManager(DatabaseManager):
             logger.error(f"Error creating subscription: {str(e)}")
             return False, "An internal error has occurred."
     
+    def _schedule_user_reminders(self, user_id: str, team_number: int, subscription_json: Dict):
+        """After a team subscription changes, point the user's unsent reminders
+        at the new subscription and schedule reminders for their assignments"""
+        try:
+            self.db.assignment_subscriptions.update_many(
+                {
+                    "user_id": user_id,
+                    "team_number": team_number,
+                    "assignment_id": {"$ne": None},
+                    "sent": False
+                },
+                {"$set": {"subscription_json": subscription_json, "updated_at": datetime.now()}}
+            )
+
+            query = {
+                "team_number": team_number,
+                "assigned_to": user_id,
+                "due_date": {"$nin": [None, ""]}
+            }
+            self.db.assignments.update_many(query, {"$set": {"reminders_pending": ObjectId()}})
+            flush_reminder_outbox(self.db, query)
+        except Exception as e:
+            # Flagged assignments are retried by the notification worker
+            logger.error(f"Error scheduling reminders for user {user_id}: {str(e)}")
+
     @with_mongodb_retry()
     async def delete_subscription(self, user_id: str, team_number: int = None, 
                                  assignment_id: Optional[str] = None) -> Tuple[bool, str]:
@@ -453,7 +765,7 @@ class NotificationManager(DatabaseManager):
     #                 "timestamp": datetime.now().isoformat()
     #             }
 
-    #             if _ := self._send_push_notification(subscription):
+    #             if self._send_push_notification(subscription)[0] == SENT:
     #                 return True, "Test notification sent successfully"
 
     #         return False, "Failed to send test notification"
@@ -495,44 +807,32 @@ class NotificationManager(DatabaseManager):
                 if user_id not in user_subscriptions or updated_at > user_subscriptions[user_id].get("updated_at", datetime.min):
                     user_subscriptions[user_id] = sub_data
             
-            expired_subscriptions = []
-            notification_sent = False
-            
             # Send notification using only the most recent subscription for each user
-            for sub_data in user_subscriptions.values():
-                try:
-                    # Create subscription object
-                    subscription = AssignmentSubscription({
-                        **sub_data,
-                        "title": f"New Assignment: {assignment_data.get('title')}",
-                        "body": f"Assignment: {assignment_data.get('title')}",
-                        "url": "/team/manage",
-                        "data": {
-                            "assignment_id": str(assignment_data.get("_id")),
-                            "title": assignment_data.get("title"),
-                            "type": "new_assignment"
-                        },
-                        "sent": False,
-                        "status": "pending"
-                    })
-                    
-                    # Try to send the notification
-                    try:
-                        if self._send_push_notification(subscription):
-                            notification_sent = True
-                            logger.info(f"Successfully sent notification for assignment {assignment_data.get('title')} to user {subscription.user_id}")
-                        else:
-                            logger.warning(f"Failed to send notification for assignment {assignment_data.get('title')} to user {subscription.user_id}")
-                    except WebPushException as e:
-                        if e.response and e.response.status_code in (404, 410):
-                            expired_subscriptions.append(sub_data["_id"])
-                            logger.info(f"Subscription {subscription.id} has expired")
-                        else:
-                            logger.error(f"WebPush error for {subscription.id}: {str(e)}")
-                    
-                except Exception as e:
-                    logger.error(f"Error processing subscription: {str(e)}")
-                    continue
+            subscriptions = [
+                AssignmentSubscription({
+                    **sub_data,
+                    "title": f"New Assignment: {assignment_data.get('title')}",
+                    "body": f"Assignment: {assignment_data.get('title')}",
+                    "url": "/team/manage",
+                    "data": {
+                        "assignment_id": str(assignment_data.get("_id")),
+                        "title": assignment_data.get("title"),
+                        "type": "new_assignment"
+                    },
+                    "sent": False,
+                    "status": "pending"
+                })
+                for sub_data in user_subscriptions.values()
+            ]
+            results = await asyncio.to_thread(self._dispatch, subscriptions) if subscriptions else []
+
+            expired_subscriptions = [
+                subscription._id for subscription, outcome, _ in results if outcome == EXPIRED
+            ]
+            sent_count = sum(outcome == SENT for _, outcome, _ in results)
+            notification_sent = sent_count > 0
+            if notification_sent:
+                logger.info(f"Sent {sent_count} notifications for assignment {assignment_data.get('title')}")
             
             # Clean up expired subscriptions in bulk if any found
             if expired_subscriptions:
@@ -0,0 +1,37 @@
+"""Recompute the running totals kept alongside team_data.
+
+team_stats and match_slots are updated after each team_data write, outside a
+transaction; a failed update is logged and repaired for that team, but an
+interrupted process can still leave them behind. Run this to rebuild them:
+
+    python -m app.rebuild_stats              # team_stats and match_slots
+    python -m app.rebuild_stats 334 1678     # team_stats of these teams only
+"""
+import argparse
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from app.scout.scouting_utils import ScoutingManager
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("teams", nargs="*", type=int, help="team numbers (default: every team)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    load_dotenv()
+    manager = ScoutingManager(os.getenv("MONGO_URI", "mongodb://localhost:27017/scouting_app"))
+
+    if args.teams:
+        results = [manager.rebuild_team_stats(team_number) for team_number in args.teams]
+    else:
+        results = [manager.rebuild_team_stats(), manager.rebuild_match_slots()]
+    return 1 if None in results else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,129 @@
+import asyncio
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from urllib.parse import quote
 
 import requests
 
+from . import tba_client
+
 logger = logging.getLogger(__name__)
 
+# How long a cached response is served without revalidating against TBA
+TEAM_TTL = 24 * 60 * 60
+EVENTS_TTL = 60 * 60
+MATCHES_TTL = 5 * 60
+
+# Failed lookups (404s, TBA errors) are remembered briefly so repeated
+# requests for a missing team don't each wait on TBA
+NEGATIVE_TTL = 60
+
+# Limits for fanning out requests across many events at once
+MAX_CONCURRENT_REQUESTS = tba_client.MAX_CONCURRENCY
+REQUEST_TIMEOUT = 5
+FANOUT_TIMEOUT = 8
+
+
 class TBAInterface:
-    def __init__(self):
+    # Shared TBACache installed by the scouting blueprint; None disables caching
+    cache = None
+
+    # When set, cached entries are revalidated even while fresh. Used by the
+    # warm-up job to extend entries before they expire.
+    revalidate = False
+
+    def __init__(self, cache=None):
         self.base_url = "https://www.thebluealliance.com/api/v3"
         self.api_key = os.getenv('TBA_AUTH_KEY')
         if not self.api_key:
             logger.warning("TBA_AUTH_KEY not found in environment variables")
-        
+
         self.headers = {
             "X-TBA-Auth-Key": self.api_key,
             "accept": "application/json"
         }
+        if cache is not None:
+            self.cache = cache
+
+    def _get(self, path, ttl, timeout=10):
+        """GET a TBA API path through the response cache.
+
+        Fresh entries are returned without a network call, stale entries are
+        revalidated with If-None-Match/If-Modified-Since and served again on a
+        304, and the stale copy is used as a fallback if TBA is unreachable or
+        erroring. Failures are cached as None for NEGATIVE_TTL.
+        Returns the decoded JSON body, or None if TBA did not return 200.
+        """
+        entry = self.cache.get(path) if self.cache else None
+        if entry and entry["expires_at"] > time.time() and not self.revalidate:
+            return entry["data"]
+
+        headers = dict(self.headers)
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
 
-    def get_team(self, team_key):
-        """Get team information from TBA"""
         try:
-            response = requests.get(
-                f"{self.base_url}/team/{team_key}",
-                headers=self.headers,
-                timeout=10
+            response = tba_client.get(
+                f"{self.base_url}{path}",
+                headers=headers,
+                timeout=timeout
+            )
+        except requests.RequestException as e:
+            if entry and entry["data"] is not None:
+                logger.warning(f"TBA unreachable, serving stale {path}: {e}")
+                return entry["data"]
+            if self.cache:
+                self.cache.set(path, None, NEGATIVE_TTL)
+            raise
+
+        if response.status_code == 304 and entry:
+            self.cache.refresh(path, ttl)
+            return entry["data"]
+
+        if response.status_code != 200:
+            if entry and entry["data"] is not None and response.status_code >= 500:
+                logger.warning(f"TBA returned {response.status_code}, serving stale {path}")
+                return entry["data"]
+            if self.cache:
+                self.cache.set(path, None, NEGATIVE_TTL)
+            return None
+
+        data = response.json()
+        if self.cache:
+            self.cache.set(
+                path,
+                data,
+                ttl,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
             )
-            return response.json() if response.status_code == 200 else None
+        return data
+
+    async def _get_async(self, path, ttl, timeout=10):
+        """Coroutine variant of _get for async routes"""
+        return await asyncio.to_thread(self._get, path, ttl, timeout)
+
+    def get_team(self, team_key, timeout=10):
+        """Get team information from TBA"""
+        try:
+            return self._get(f"/team/{team_key}", TEAM_TTL, timeout=timeout)
         except Exception as e:
             logger.error(f"Error fetching team from TBA: {e}")
             return None
 
-    def get_event_matches(self, event_key):
+    def get_event_matches(self, event_key, timeout=10):
         """Get matches for an event and format them by match number"""
         try:
-            response = requests.get(
-                f"{self.base_url}/event/{event_key}/matches",
-                headers=self.headers,
-                timeout=10
-            )
-            if response.status_code != 200:
+            matches = self._get(f"/event/{event_key}/matches", MATCHES_TTL, timeout=timeout)
+            if matches is None:
                 return None
 
-            matches = response.json()
             formatted_matches = {}
 
             for match in matches:
@@ -57,18 +138,99 @@ class TBAInterface:
             logger.error(f"Error fetching event matches from TBA: {e}")
             return None
 
+    def get_event(self, event_key, timeout=REQUEST_TIMEOUT):
+        """Get event details (name, dates, location) from TBA"""
+        try:
+            return self._get(f"/event/{event_key}/simple", EVENTS_TTL, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error fetching event from TBA: {e}")
+            return None
+
+    def get_event_teams(self, event_key, timeout=REQUEST_TIMEOUT):
+        """Get the keys of the teams attending an event"""
+        try:
+            return self._get(f"/event/{event_key}/teams/keys", EVENTS_TTL, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error fetching event teams from TBA: {e}")
+            return None
+
+    def get_teams_page(self, page, timeout=REQUEST_TIMEOUT):
+        """One page (up to 500 teams) of TBA's full team list. Returns [] past
+        the last page and None if the request failed."""
+        try:
+            return self._get(f"/teams/{page}", TEAM_TTL, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error fetching team page {page} from TBA: {e}")
+            return None
+
+    async def get_team_async(self, team_key, timeout=REQUEST_TIMEOUT):
+        """Get team information from TBA without blocking the event loop"""
+        try:
+            return await self._get_async(f"/team/{team_key}", TEAM_TTL, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Error fetching team from TBA: {e}")
+            return None
+
+    async def search_teams_async(self, query, timeout=REQUEST_TIMEOUT):
+        """Search TBA teams by name"""
+        try:
+            return await self._get_async(f"/teams/search/{quote(query)}", EVENTS_TTL, timeout=timeout) or []
+        except Exception as e:
+            logger.error(f"Error searching teams on TBA: {e}")
+            return []
+
+    @staticmethod
+    def _fan_out(fetch, keys, max_workers, request_timeout, total_timeout):
+        """Run fetch(key, request_timeout) for every key in parallel and
+        return {key: result} for whatever finished within total_timeout"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(keys)))
+        futures = {executor.submit(fetch, key, request_timeout): key for key in keys}
+        done, pending = wait(futures, timeout=total_timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        if pending:
+            logger.warning(f"Timed out fetching {len(pending)} of {len(keys)} TBA requests")
+
+        return {futures[future]: future.result() for future in done}
+
+    def get_teams(self, team_keys,
+                  max_workers=MAX_CONCURRENT_REQUESTS,
+                  request_timeout=REQUEST_TIMEOUT,
+                  total_timeout=FANOUT_TIMEOUT):
+        """Fetch several teams in parallel. Teams that failed or did not
+        finish in time map to None."""
+        teams = self._fan_out(
+            self.get_team, team_keys, max_workers, request_timeout, total_timeout
+        )
+        return {key: teams.get(key) for key in team_keys}
+
+    def get_matches_for_events(self, event_keys,
+                               max_workers=MAX_CONCURRENT_REQUESTS,
+                               request_timeout=REQUEST_TIMEOUT,
+                               total_timeout=FANOUT_TIMEOUT):
+        """Fetch match schedules for several events in parallel.
+
+        At most `max_workers` requests are in flight at once and each one is
+        bounded by `request_timeout`. Whatever has finished when
+        `total_timeout` runs out is returned; slower events are left out
+        rather than holding up the caller.
+        """
+        event_matches = self._fan_out(
+            self.get_event_matches, event_keys, max_workers, request_timeout, total_timeout
+        )
+        return {key: matches for key, matches in event_matches.items() if matches}
+
     def get_current_events(self, year):
         """Get events for the current week"""
         try:
-            response = requests.get(
-                f"{self.base_url}/events/{year}/simple",
-                headers=self.headers,
-                timeout=10
-            )
-            if response.status_code != 200:
+            events = self._get(f"/events/{year}/simple", EVENTS_TTL)
+            if events is None:
                 return None
 
-            events = response.json()
             current_date = datetime.now()
             week_start = current_date - timedelta(days=current_date.weekday())
             week_end = current_date
@@ -85,4 +247,4 @@ class TBAInterface:
             return current_events
         except Exception as e:
             logger.error(f"Error fetching events from TBA: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -1,5 +1,6 @@
 from .routes import *
 from .scouting_utils import *
 from .TBA import TBAInterface
+from .tba_cache import TBACache
 
-__all__ = ['TBAInterface']
+__all__ = ['TBAInterface', 'TBACache']
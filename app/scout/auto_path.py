@@ -0,0 +1,158 @@
+"""Compact storage format for auto_path drawings.
+
+Canvas.js hands us its drawing history as JSON: a list of strokes, where a
+freehand stroke is a list of points ({x, y, color, thickness, pressure}) and
+anything else (shapes, history operations) is kept as-is. Stored verbatim that
+repeats the color and thickness on every point and spells every coordinate
+out as a float.
+
+Encoded paths are a zlib-compressed bson Binary laid out as
+
+    <uint32 header length> <JSON header> <point data>
+
+The header lists the strokes in order. Freehand strokes become
+{"n": points, "c": color, "t": thickness}; their points are appended to the
+point data as zigzag varint deltas of the coordinates, quantized to
+1/COORD_SCALE of a canvas unit, followed by one pressure byte. Any other
+stroke is kept in the header as {"raw": stroke}.
+"""
+import json
+import logging
+import struct
+import zlib
+
+from bson import Binary
+
+logger = logging.getLogger(__name__)
+
+COORD_SCALE = 10
+
+# Pressure is stored as one byte; NO_PRESSURE marks points without one
+PRESSURE_LEVELS = 254
+NO_PRESSURE = 255
+
+FREEHAND_KEYS = {"x", "y", "color", "thickness", "pressure"}
+
+
+def parse_auto_path(value):
+    """Drawing history as a list from any stored or submitted representation"""
+    if not value:
+        return []
+    if isinstance(value, bytes):
+        return decode_auto_path(value)
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            logger.warning("Discarding auto_path that is not valid JSON")
+            return []
+    return value if isinstance(value, list) else []
+
+
+def _is_freehand(stroke):
+    if not isinstance(stroke, list) or not stroke:
+        return False
+    first = stroke[0]
+    return all(
+        isinstance(point, dict)
+        and FREEHAND_KEYS - {"pressure"} <= point.keys() <= FREEHAND_KEYS
+        and isinstance(point.get("x"), (int, float))
+        and isinstance(point.get("y"), (int, float))
+        and point.get("color") == first.get("color")
+        and point.get("thickness") == first.get("thickness")
+        for point in stroke
+    )
+
+
+def _write_varint(buffer, value):
+    # zigzag so small negative deltas stay small
+    value = (value << 1) ^ (value >> 63)
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            break
+        shift += 7
+    return (value >> 1) ^ -(value & 1), offset
+
+
+def encode_auto_path(value):
+    """Encode a drawing for storage; empty drawings are stored as ''"""
+    path = parse_auto_path(value)
+    if not path:
+        return ""
+
+    strokes = []
+    points = bytearray()
+    for stroke in path:
+        if not _is_freehand(stroke):
+            strokes.append({"raw": stroke})
+            continue
+
+        strokes.append({
+            "n": len(stroke),
+            "c": stroke[0].get("color"),
+            "t": stroke[0].get("thickness"),
+        })
+        last_x = last_y = 0
+        for point in stroke:
+            x = round(point["x"] * COORD_SCALE)
+            y = round(point["y"] * COORD_SCALE)
+            _write_varint(points, x - last_x)
+            _write_varint(points, y - last_y)
+            last_x, last_y = x, y
+
+            pressure = point.get("pressure")
+            if pressure is None:
+                points.append(NO_PRESSURE)
+            else:
+                points.append(round(min(max(pressure, 0), 1) * PRESSURE_LEVELS))
+
+    header = json.dumps({"strokes": strokes}, separators=(",", ":")).encode()
+    return Binary(zlib.compress(struct.pack("<I", len(header)) + header + bytes(points)))
+
+
+def decode_auto_path(data):
+    """Drawing history list for an encoded path"""
+    if not data:
+        return []
+
+    raw = zlib.decompress(data)
+    (header_length,) = struct.unpack_from("<I", raw)
+    header = json.loads(raw[4:4 + header_length])
+    offset = 4 + header_length
+
+    path = []
+    for stroke in header["strokes"]:
+        if "raw" in stroke:
+            path.append(stroke["raw"])
+            continue
+
+        points = []
+        x = y = 0
+        for _ in range(stroke["n"]):
+            dx, offset = _read_varint(raw, offset)
+            dy, offset = _read_varint(raw, offset)
+            x, y = x + dx, y + dy
+            point = {
+                "x": x / COORD_SCALE,
+                "y": y / COORD_SCALE,
+                "color": stroke["c"],
+                "thickness": stroke["t"],
+            }
+            if raw[offset] != NO_PRESSURE:
+                point["pressure"] = raw[offset] / PRESSURE_LEVELS
+            offset += 1
+            points.append(point)
+        path.append(points)
+
+    return path
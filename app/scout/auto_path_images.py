@@ -0,0 +1,203 @@
+"""Server-side rendering of auto_path drawings onto the field image.
+
+Renders are cached in GridFS, one file per subject (a scouting entry's
+thumbnail, or a team's heatmap as one viewer sees it). Each file records a
+hash of everything that went into the image, so it is only redrawn when one of
+its paths changes, and the new render replaces the old one.
+"""
+import hashlib
+import logging
+import math
+import threading
+from io import BytesIO
+
+from gridfs import GridFS
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageOps
+
+from app.scout.auto_path import parse_auto_path
+
+logger = logging.getLogger(__name__)
+
+# Canvas.js draws the field centered on the origin at this size
+FIELD_WIDTH = 800
+FIELD_HEIGHT = 400
+
+HEATMAP_SIZE = (800, 400)
+THUMBNAIL_SIZE = (320, 160)
+
+# Bump when the drawing code changes so cached images are re-rendered
+RENDER_VERSION = 1
+
+
+class AutoPathRenderer:
+    """Draws auto paths as PNGs and caches the results in GridFS"""
+
+    def __init__(self, db, field_image_path):
+        self.fs = GridFS(db, collection="auto_path_images")
+        self.field_image_path = field_image_path
+        self._fields = {}
+        self._lock = threading.Lock()
+        self._remove_legacy_renders()
+
+    def _remove_legacy_renders(self):
+        """Delete renders cached under content-hash filenames, which were
+        never replaced or removed"""
+        try:
+            for legacy in self.fs.find({"metadata.key": {"$exists": False}}):
+                self.fs.delete(legacy._id)
+        except Exception as e:
+            logger.error(f"Error removing legacy auto path images: {str(e)}")
+
+    def _field(self, size):
+        """Field background scaled to `size`, loaded once per size"""
+        with self._lock:
+            if size not in self._fields:
+                with Image.open(self.field_image_path) as image:
+                    self._fields[size] = image.convert("RGBA").resize(size, Image.LANCZOS)
+            return self._fields[size].copy()
+
+    @staticmethod
+    def cache_key(kind, size, paths):
+        """Content hash of a render: its kind, size and stored path bytes"""
+        digest = hashlib.sha256(f"{RENDER_VERSION}:{kind}:{size[0]}x{size[1]}".encode())
+        for path in paths:
+            digest.update(b"\0")
+            digest.update(path if isinstance(path, bytes) else repr(path).encode())
+        return digest.hexdigest()
+
+    def get_or_render(self, kind, subject, size, paths):
+        """(PNG bytes, cache key) for a heatmap or thumbnail of `paths`.
+        `subject` names what is drawn, e.g. an entry id; it owns one cached
+        file at a time."""
+        key = self.cache_key(kind, size, paths)
+        filename = f"{kind}-{subject}.png"
+
+        try:
+            if cached := self.fs.find_one({"filename": filename, "metadata.key": key}):
+                return cached.read(), key
+        except Exception as e:
+            logger.error(f"Error reading cached auto path image {filename}: {str(e)}")
+
+        if kind == "heatmap":
+            image = self.render_heatmap(paths, size)
+        else:
+            image = self.render_thumbnail(paths[0] if paths else None, size)
+
+        buffer = BytesIO()
+        image.convert("RGB").save(buffer, format="PNG", optimize=True)
+        png = buffer.getvalue()
+
+        try:
+            file_id = self.fs.put(
+                png, filename=filename, content_type="image/png", metadata={"key": key}
+            )
+            # Drop the renders this one replaces
+            for old in self.fs.find({"filename": filename, "_id": {"$ne": file_id}}):
+                self.fs.delete(old._id)
+        except Exception as e:
+            logger.error(f"Error caching auto path image {filename}: {str(e)}")
+        return png, key
+
+    def invalidate(self, kind, subject):
+        """Delete the cached render of a subject, e.g. a deleted entry"""
+        filename = f"{kind}-{subject}.png"
+        try:
+            for cached in self.fs.find({"filename": filename}):
+                self.fs.delete(cached._id)
+        except Exception as e:
+            logger.error(f"Error deleting cached auto path image {filename}: {str(e)}")
+
+    @staticmethod
+    def _to_pixels(size):
+        scale_x = size[0] / FIELD_WIDTH
+        scale_y = size[1] / FIELD_HEIGHT
+
+        def transform(x, y):
+            return ((x + FIELD_WIDTH / 2) * scale_x, (y + FIELD_HEIGHT / 2) * scale_y)
+        return transform, min(scale_x, scale_y)
+
+    def _draw_path(self, draw, path, size, fill=None):
+        """Draw every stroke and shape of a path. `fill` overrides the
+        drawing's colors, e.g. for heatmap masks."""
+        transform, scale = self._to_pixels(size)
+
+        for stroke in parse_auto_path(path):
+            if not isinstance(stroke, list) or not stroke or not isinstance(stroke[0], dict):
+                continue
+
+            first = stroke[0]
+            color = fill if fill is not None else first.get("color") or "#000000"
+            width = max(1, round((first.get("thickness") or 3) * scale))
+
+            if first.get("type"):
+                self._draw_shape(draw, first, transform, color, width, fill is None)
+                continue
+
+            points = [
+                transform(point["x"], point["y"])
+                for point in stroke
+                if isinstance(point, dict) and "x" in point and "y" in point
+            ]
+            if len(points) > 1:
+                draw.line(points, fill=color, width=width, joint="curve")
+
+    @staticmethod
+    def _draw_shape(draw, shape, transform, color, width, allow_fill):
+        x, y = shape.get("x", 0), shape.get("y", 0)
+        w, h = shape.get("width", 0), shape.get("height", 0)
+        start, end = transform(x, y), transform(x + w, y + h)
+        fill = color if allow_fill and shape.get("isFilled") else None
+        kind = shape["type"]
+
+        if kind == "rectangle":
+            box = [min(start[0], end[0]), min(start[1], end[1]),
+                   max(start[0], end[0]), max(start[1], end[1])]
+            draw.rectangle(box, outline=color, fill=fill, width=width)
+        elif kind in ("line", "arrow"):
+            draw.line([start, end], fill=color, width=width)
+            if kind == "arrow":
+                angle = math.atan2(end[1] - start[1], end[0] - start[0])
+                length = min(20, math.dist(start, end) / 3)
+                for side in (-1, 1):
+                    head_angle = angle + side * math.pi / 6
+                    draw.line([end, (end[0] - length * math.cos(head_angle),
+                                     end[1] - length * math.sin(head_angle))],
+                              fill=color, width=width)
+        elif kind in ("circle", "hexagon", "star"):
+            center = transform(x + w / 2, y + h / 2)
+            radius = math.dist(start, end) / 2
+            if kind == "circle":
+                box = [center[0] - radius, center[1] - radius,
+                       center[0] + radius, center[1] + radius]
+                draw.ellipse(box, outline=color, fill=fill, width=width)
+            else:
+                sides, rotation = (6, math.pi / 6) if kind == "hexagon" else (5, -math.pi / 2)
+                draw.regular_polygon((center, radius), sides, rotation=math.degrees(rotation),
+                                     outline=color, fill=fill)
+
+    def render_thumbnail(self, path, size=THUMBNAIL_SIZE):
+        """One match's path drawn over the field"""
+        image = self._field(size)
+        if path:
+            self._draw_path(ImageDraw.Draw(image), path, size)
+        return image
+
+    def render_heatmap(self, paths, size=HEATMAP_SIZE):
+        """Density of a team's paths over the field: each path adds one layer
+        to a grayscale accumulator, which is blurred and colorized"""
+        image = self._field(size)
+        if not paths:
+            return image
+
+        step = max(1, 255 // len(paths))
+        heat = Image.new("L", size, 0)
+        for path in paths:
+            layer = Image.new("L", size, 0)
+            self._draw_path(ImageDraw.Draw(layer), path, size, fill=step)
+            heat = ImageChops.add(heat, layer)
+
+        heat = heat.filter(ImageFilter.GaussianBlur(radius=max(2, size[0] // 200)))
+        heat = ImageOps.autocontrast(heat)
+        overlay = ImageOps.colorize(heat, black="blue", mid="yellow", white="red").convert("RGBA")
+        overlay.putalpha(heat.point(lambda value: min(200, value * 2)))
+        return Image.alpha_composite(image, overlay)
@@ -1,22 +1,34 @@
 from __future__ import annotations
 
+import csv
+import io
 import json
+import os
 from datetime import datetime, timezone
 
-import aiohttp
 from bson import ObjectId, json_util
-from flask import (Blueprint, current_app, flash, jsonify, redirect,
-                   render_template, request, url_for)
+from flask import (Blueprint, Response, current_app, flash, jsonify, redirect,
+                   render_template, request, send_file, url_for)
 from flask_login import current_user, login_required
+from werkzeug.utils import secure_filename
 
 import logging
-from app.scout.scouting_utils import ScoutingManager
-from app.utils import async_route, handle_route_errors, limiter
-
-from .TBA import TBAInterface
+from app.scout.scouting_utils import (ACCEPTED, ALL_SCOPE, EXPORT_FIELDS,
+                                      HAS_AUTO_PATH, REJECTED, STATS_FIELDS,
+                                      ScoutingManager, stats_scope,
+                                      team_access_filter)
+from app.utils import (async_route, cached_json_response, handle_route_errors,
+                       limiter)
+
+from .auto_path_images import HEATMAP_SIZE, THUMBNAIL_SIZE, AutoPathRenderer
+from .TBA import MATCHES_TTL, TBAInterface
+from .tba_cache import TBACache
+from .team_directory import SEARCH_LIMIT, TeamDirectory
 
 scouting_bp = Blueprint("scouting", __name__)
 scouting_manager = None
+auto_path_renderer = None
+team_directory = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,9 +36,16 @@ logger = logging.getLogger(__name__)
 
 @scouting_bp.record
 def on_blueprint_init(state):
-    global scouting_manager, limiter
+    global scouting_manager, auto_path_renderer, team_directory, limiter
     app = state.app
     scouting_manager = ScoutingManager(app.config["MONGO_URI"])
+    auto_path_renderer = AutoPathRenderer(
+        scouting_manager.db,
+        os.path.join(app.static_folder, "images", "field-2025.png")
+    )
+    TBAInterface.cache = TBACache(app.config["MONGO_URI"])
+    team_directory = TeamDirectory(app.config["MONGO_URI"])
+    team_directory.start_sync_service()
 
 
 @scouting_bp.route("/scouting/add", methods=["GET", "POST"])
@@ -35,21 +54,12 @@ def on_blueprint_init(state):
 @handle_route_errors
 def add():
     if request.method != "POST":
-        # Get current events and their matches
+        # Match schedules are loaded on demand from /api/tba/matches/<event_key>
         tba = TBAInterface()
         year = datetime.now().year
         events = tba.get_current_events(year) or {}
-        
-        # Pre-fetch matches for all current events to avoid client-side API calls
-        event_matches = {}
-        for event_name, event_data in events.items():
-            matches = tba.get_event_matches(event_data['key'])
-            if matches:
-                event_matches[event_data['key']] = matches
 
-        return render_template("scouting/add.html", 
-                            events=events,
-                            event_matches=event_matches)
+        return render_template("scouting/add.html", events=events)
 
     data = request.get_json() if request.is_json else request.form.to_dict()
 
@@ -64,7 +74,9 @@ def add():
             flash("Invalid path coordinates format", "error")
             return redirect(url_for("scouting.home"))
 
-    success, message = scouting_manager.add_scouting_data(data, current_user.get_id())
+    success, message = scouting_manager.add_scouting_data(
+        data, current_user.get_id(), current_user.teamNumber
+    )
 
     if success:
         flash("Team data added successfully", "success")
@@ -74,21 +86,262 @@ def add():
     return redirect(url_for("scouting.home"))
 
 
+# Largest offline queue accepted by a single bulk submission
+MAX_BULK_ENTRIES = 200
+
+
+@scouting_bp.route("/api/scouting/bulk", methods=["POST"])
+@login_required
+@limiter.limit("10 per minute")
+def add_bulk():
+    """Submit a batch of queued scouting entries, e.g. when syncing offline
+    data. Results are keyed by the client's id for each entry so it can clear
+    exactly the ones that were accepted, or rejected for good; "failed"
+    entries should be sent again later. Repeated client ids are ignored."""
+    payload = request.get_json(silent=True) or {}
+    entries = payload.get("entries")
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"error": "No entries provided"}), 400
+    if len(entries) > MAX_BULK_ENTRIES:
+        return jsonify({"error": f"At most {MAX_BULK_ENTRIES} entries per request"}), 400
+
+    results = {}
+    batch = []
+    seen = set()
+    for entry in entries:
+        if not isinstance(entry, dict) or entry.get("client_id") is None:
+            return jsonify({"error": "Every entry needs a client_id"}), 400
+
+        client_id = str(entry["client_id"])
+        if client_id in seen:
+            continue
+        seen.add(client_id)
+
+        data = entry.get("data")
+        if not isinstance(data, dict):
+            results[client_id] = {"status": REJECTED, "success": False, "message": "Invalid scouting data"}
+            continue
+
+        if isinstance(data.get("auto_path"), str):
+            try:
+                path = data["auto_path"].strip()
+                data["auto_path"] = json.loads(path) if path else []
+            except json.JSONDecodeError:
+                results[client_id] = {
+                    "status": REJECTED, "success": False, "message": "Invalid path coordinates format"
+                }
+                continue
+
+        batch.append((client_id, data))
+
+    if batch:
+        added = scouting_manager.add_scouting_data_bulk(
+            batch, current_user.get_id(), current_user.teamNumber
+        )
+        for client_id, (outcome, message) in added.items():
+            if outcome == ACCEPTED:
+                results[client_id] = {"status": outcome, "success": True, "id": message}
+            else:
+                results[client_id] = {"status": outcome, "success": False, "message": message}
+
+    return jsonify({
+        "results": results,
+        "accepted": sum(result["success"] for result in results.values()),
+    })
+
+
+def _list_filters():
+    """Server-side filters for the scouting list from the query string"""
+    return {
+        "event_code": request.args.get("event") or None,
+        "team_number": request.args.get("team", type=int),
+        "match_number": request.args.get("match", type=int),
+    }
+
+
+def _list_cursor():
+    after = request.args.get("after")
+    return after if after and ObjectId.is_valid(after) else None
+
+
 @scouting_bp.route("/scouting/list")
 @scouting_bp.route("/scouting")
 @limiter.limit("30 per minute")
 @login_required
 def home():
+    filters = _list_filters()
     try:
-        team_data = scouting_manager.get_all_scouting_data(
-            current_user.teamNumber, 
-            current_user.get_id()
+        team_data, next_cursor = scouting_manager.get_scouting_page(
+            current_user.teamNumber,
+            current_user.get_id(),
+            filters=filters,
+            after=_list_cursor(),
+        )
+        return render_template(
+            "scouting/list.html",
+            team_data=team_data,
+            next_cursor=next_cursor,
+            filters=filters,
         )
-        return render_template("scouting/list.html", team_data=team_data)
     except Exception as e:
         current_app.logger.error(f"Error fetching scouting data: {str(e)}", exc_info=True)
         flash("Unable to fetch scouting data. Please try again later.", "error")
-        return render_template("scouting/list.html", team_data=[])
+        return render_template("scouting/list.html", team_data=[], next_cursor=None, filters=filters)
+
+
+@scouting_bp.route("/api/scouting/list")
+@limiter.limit("60 per minute")
+@login_required
+def list_api():
+    """JSON variant of the scouting list, used to load further pages"""
+    team_data, next_cursor = scouting_manager.get_scouting_page(
+        current_user.teamNumber,
+        current_user.get_id(),
+        filters=_list_filters(),
+        after=_list_cursor(),
+    )
+    for row in team_data:
+        row["_id"] = str(row["_id"])
+        row["scouter_id"] = str(row["scouter_id"])
+    return jsonify({"team_data": team_data, "next_cursor": next_cursor})
+
+
+@scouting_bp.route("/api/scouting/<string:id>/auto_path")
+@limiter.limit("60 per minute")
+@login_required
+def auto_path(id):
+    if not ObjectId.is_valid(id):
+        return jsonify({"error": "Invalid id"}), 400
+
+    path = scouting_manager.get_auto_path(id, current_user.teamNumber, current_user.get_id())
+    if path is None:
+        return jsonify({"error": "Scouting entry not found"}), 404
+    return jsonify(path)
+
+
+def _png_response(png, key):
+    # Keyed by content hash, so clients can revalidate with the ETag
+    return send_file(io.BytesIO(png), mimetype="image/png", etag=key, max_age=300)
+
+
+@scouting_bp.route("/api/scouting/<string:id>/auto_path.png")
+@limiter.limit("120 per minute")
+@login_required
+def auto_path_thumbnail(id):
+    if not ObjectId.is_valid(id):
+        return jsonify({"error": "Invalid id"}), 400
+
+    doc = scouting_manager.db.team_data.find_one(
+        {"_id": ObjectId(id), **team_access_filter(current_user.teamNumber, current_user.get_id())},
+        {"auto_path": 1}
+    )
+    if doc is None:
+        return jsonify({"error": "Scouting entry not found"}), 404
+
+    png, key = auto_path_renderer.get_or_render(
+        "thumbnail", id, THUMBNAIL_SIZE, [doc.get("auto_path") or ""]
+    )
+    return _png_response(png, key)
+
+
+@scouting_bp.route("/api/team/<int:team_number>/auto_paths.png")
+@limiter.limit("30 per minute")
+@login_required
+def auto_path_heatmap(team_number):
+    """Heatmap of every auto path the user can see for a team"""
+    paths = scouting_manager.get_auto_paths(
+        team_number, current_user.teamNumber, current_user.get_id()
+    )
+    # Cache one heatmap per set of paths: the team's entries, plus the
+    # viewer's own when some of theirs were scouted outside that team
+    scope = stats_scope(current_user.teamNumber, current_user.get_id())
+    if current_user.teamNumber and any(
+        path.get("scouting_team_number") != current_user.teamNumber for path in paths
+    ):
+        scope += f"-user:{current_user.get_id()}"
+    png, key = auto_path_renderer.get_or_render(
+        "heatmap", f"{team_number}-{scope}", HEATMAP_SIZE, [path["auto_path"] for path in paths]
+    )
+    return _png_response(png, key)
+
+
+# Rows written per chunk of a streamed export
+EXPORT_CHUNK_ROWS = 200
+
+# Spreadsheets run text cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_safe(value):
+    """Quote free-text cells that a spreadsheet would treat as a formula"""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_rows(cursor):
+    """Encode export rows as CSV, yielding a chunk every EXPORT_CHUNK_ROWS"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    try:
+        for count, row in enumerate(cursor, 1):
+            writer.writerow({key: _csv_safe(value) for key, value in row.items()})
+            if count % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+    finally:
+        cursor.close()
+
+
+def _ndjson_rows(cursor):
+    """Encode export rows as newline-delimited JSON"""
+    chunk = []
+    try:
+        for row in cursor:
+            chunk.append(json.dumps(row))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+    finally:
+        cursor.close()
+
+
+@scouting_bp.route("/api/scouting/export")
+@login_required
+@limiter.limit("5 per minute")
+def export():
+    """Stream the user's accessible scouting data as CSV or NDJSON"""
+    export_format = request.args.get("format", "csv").lower()
+    if export_format not in ("csv", "ndjson"):
+        return jsonify({"error": "Format must be csv or ndjson"}), 400
+
+    event_code = request.args.get("event") or None
+    try:
+        cursor = scouting_manager.export_scouting_data(
+            current_user.teamNumber, current_user.get_id(), event_code
+        )
+    except Exception as e:
+        logger.error(f"Error exporting scouting data: {str(e)}")
+        return jsonify({"error": "Unable to export scouting data"}), 500
+
+    filename = secure_filename(
+        f"scouting-{event_code or 'all'}-{datetime.now():%Y%m%d}.{export_format}"
+    )
+    if export_format == "csv":
+        body, mimetype = _csv_rows(cursor), "text/csv"
+    else:
+        body, mimetype = _ndjson_rows(cursor), "application/x-ndjson"
+
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 @scouting_bp.route("/scouting/edit/<string:id>", methods=["GET", "POST"])
@@ -135,6 +388,7 @@ def edit(id):
 def delete(id):
     try:
         if scouting_manager.delete_team_data(id, current_user.get_id()):
+            auto_path_renderer.invalidate("thumbnail", id)
             flash("Record deleted successfully", "success")
         else:
             flash("Error deleting record or permission denied", "error")
@@ -190,76 +444,38 @@ def compare_teams():
         if len(teams) < 2:
             return jsonify({"error": "At least 2 teams are required"}), 400
 
+        compare_data = scouting_manager.get_compare_data(
+            teams, current_user.teamNumber, current_user.get_id()
+        )
+
+        # Team metadata for every compared team in parallel
+        team_infos = TBAInterface().get_teams([f"frc{team_num}" for team_num in teams])
+
         teams_data = {}
         for team_num in teams:
             try:
-                pipeline = [
-                    {"$match": {"team_number": team_num}},
-                    {"$lookup": {
-                        "from": "users",
-                        "localField": "scouter_id",
-                        "foreignField": "_id",
-                        "as": "scouter"
-                    }},
-                    {"$unwind": "$scouter"},
-                     {"$match": {
-                        "$or": [
-                                {"scouter.teamNumber": current_user.teamNumber} if current_user.teamNumber else {"scouter._id": ObjectId(current_user.get_id())},
-                                {"scouter._id": ObjectId(current_user.get_id())}
-                            ]
-                        }
-                    },
-                    {"$group": {
-                        "_id": "$team_number",
-                        "matches_played": {"$sum": 1},
-                        "avg_auto_coral_level1": {"$avg": "$auto_coral_level1"},
-                        "avg_auto_coral_level2": {"$avg": "$auto_coral_level2"},
-                        "avg_auto_coral_level3": {"$avg": "$auto_coral_level3"},
-                        "avg_auto_coral_level4": {"$avg": "$auto_coral_level4"},
-                        "avg_auto_algae_net": {"$avg": "$auto_algae_net"},
-                        "avg_auto_algae_processor": {"$avg": "$auto_algae_processor"},
-                        "avg_teleop_coral_level1": {"$avg": "$teleop_coral_level1"},
-                        "avg_teleop_coral_level2": {"$avg": "$teleop_coral_level2"},
-                        "avg_teleop_coral_level3": {"$avg": "$teleop_coral_level3"},
-                        "avg_teleop_coral_level4": {"$avg": "$teleop_coral_level4"},
-                        "avg_teleop_algae_net": {"$avg": "$teleop_algae_net"},
-                        "avg_teleop_algae_processor": {"$avg": "$teleop_algae_processor"},
-                        "climb_success_rate": {"$avg": {"$cond": ["$climb_success", 1, 0]}},
-                        "defense_notes": {"$push": "$defense_notes"},
-                        "auto_paths": {"$push": {
-                            "path": "$auto_path",
-                            "notes": "$auto_notes",
-                            "match_number": "$match_number"
-                        }},
-                        "defense_rating": {"$avg": "$defense_rating"},
-                        "preferred_climb_type": {"$last": "$climb_type"},
-                        "matches": {"$push": "$$ROOT"}
-                    }}
-                ]
-
-                stats = list(scouting_manager.db.team_data.aggregate(pipeline))
-
-                if stats and stats[0].get("matches_played", 0) > 0:
-                    matches_played = stats[0]["matches_played"]
+                stats = compare_data[team_num]["stats"]
+
+                if stats:
                     normalized_stats = {
                         "auto_scoring": (
-                            stats[0]["avg_auto_coral_level1"] + 
-                            stats[0]["avg_auto_coral_level2"] * 2 +
-                            stats[0]["avg_auto_coral_level3"] * 3 +
-                            stats[0]["avg_auto_coral_level4"] * 4 +
-                            stats[0]["avg_auto_algae_net"] * 2 +
-                            stats[0]["avg_auto_algae_processor"] * 3
+                            stats["avg_auto_coral_level1"] + 
+                            stats["avg_auto_coral_level2"] * 2 +
+                            stats["avg_auto_coral_level3"] * 3 +
+                            stats["avg_auto_coral_level4"] * 4 +
+                            stats["avg_auto_algae_net"] * 2 +
+                            stats["avg_auto_algae_processor"] * 3
                         ) / 20,
                         "teleop_scoring": (
-                            stats[0]["avg_teleop_coral_level1"] + 
-                            stats[0]["avg_teleop_coral_level2"] * 2 +
-                            stats[0]["avg_teleop_coral_level3"] * 3 +
-                            stats[0]["avg_teleop_coral_level4"] * 4 +
-                            stats[0]["avg_teleop_algae_net"] * 2 +
-                            stats[0]["avg_teleop_algae_processor"] * 3
+                            stats["avg_teleop_coral_level1"] + 
+                            stats["avg_teleop_coral_level2"] * 2 +
+                            stats["avg_teleop_coral_level3"] * 3 +
+                            stats["avg_teleop_coral_level4"] * 4 +
+                            stats["avg_teleop_algae_net"] * 2 +
+                            stats["avg_teleop_algae_processor"] * 3
                         ) / 20,
-                        "climb_rating": stats[0]["climb_success_rate"],
-                        "defense_rating": stats[0]["defense_rating"] / 5 if stats[0].get("defense_rating") else 0
+                        "climb_rating": stats["climb_success_rate"],
+                        "defense_rating": stats["defense_rating"] / 5 if stats.get("defense_rating") else 0
                     }
                 else:
                     normalized_stats = {
@@ -269,56 +485,7 @@ def compare_teams():
                         "defense_rating": 0
                     }
 
-                # Get team info from TBA
-                team_key = f"frc{team_num}"
-                team_info = TBAInterface().get_team(team_key)
-
-                # Get the 5 most recent matches
-                matches_pipeline = [
-                    {"$match": {"team_number": team_num}},
-                    {"$lookup": {
-                        "from": "users",
-                        "localField": "scouter_id",
-                        "foreignField": "_id",
-                        "as": "scouter"
-                    }},
-
-                     {"$match": {
-                        "$or": [
-                            {"scouter.teamNumber": current_user.teamNumber} if current_user.teamNumber else {"scouter._id": ObjectId(current_user.get_id())},
-                            {"scouter._id": ObjectId(current_user.get_id())}
-                        ]
-                    }},
-                    {"$unwind": "$scouter"},
-                    {"$sort": {"match_number": -1}},
-                    {"$limit": 5},
-                    {"$project": {
-                        "match_number": 1,
-                        "alliance": 1,
-                        "auto_coral_level1": 1,
-                        "auto_coral_level2": 1,
-                        "auto_coral_level3": 1,
-                        "auto_coral_level4": 1,
-                        "auto_algae_net": 1,
-                        "auto_algae_processor": 1,
-                        "teleop_coral_level1": 1,
-                        "teleop_coral_level2": 1,
-                        "teleop_coral_level3": 1,
-                        "teleop_coral_level4": 1,
-                        "teleop_algae_net": 1,
-                        "teleop_algae_processor": 1,
-                        "climb_success": 1,
-                        "climb_type": 1,
-                        "auto_path": 1,
-                        "auto_notes": 1,
-                        "defense_rating": 1,
-                        "notes": 1,
-                        "scouter_name": "$scouter.username",
-                        "profile_picture": "$scouter.profile_picture"
-                    }}
-                ]
-
-                matches = list(scouting_manager.db.team_data.aggregate(matches_pipeline))
+                team_info = team_infos.get(f"frc{team_num}") or {}
 
                 teams_data[str(team_num)] = {
                     "team_number": team_num,
@@ -326,9 +493,9 @@ def compare_teams():
                     "city": team_info.get("city"),
                     "state_prov": team_info.get("state_prov"),
                     "country": team_info.get("country"),
-                    "stats": stats[0] if stats else {},
+                    "stats": stats or {},
                     "normalized_stats": normalized_stats,
-                    "matches": matches
+                    "matches": compare_data[team_num]["matches"]
                 }
 
             except Exception as team_error:
@@ -354,37 +521,30 @@ async def search_teams():
         return jsonify([])
 
     try:
-        # Initialize TBA interface
-        tba = TBAInterface()
-        
-        # Handle both numeric and text searches
-        if query.isdigit():
-            team_key = f"frc{query}"
-            url = f"{tba.base_url}/team/{team_key}"
-            
-            async with aiohttp.ClientSession(headers=tba.headers) as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return jsonify([])
-                    team = await response.json()
+        if not team_directory.is_empty():
+            # Ranked matches from the local copy of TBA's team list
+            teams = team_directory.search(query)
         else:
-            # Search by team name/nickname
-            url = f"{tba.base_url}/teams/search/{query}"
-            async with aiohttp.ClientSession(headers=tba.headers) as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        return jsonify([])
-                    teams = await response.json()
-                    if not teams:
-                        return jsonify([])
-                    team = teams[0]  # Take the first match
-
-        # Get team number from the response
-        team_number = team.get("team_number")
+            # The directory hasn't been synced yet, so ask TBA directly
+            tba = TBAInterface()
+            if query.isdigit():
+                team = await tba.get_team_async(f"frc{query}")
+                teams = [team] if team else []
+            else:
+                teams = (await tba.search_teams_async(query))[:SEARCH_LIMIT]
+
+        if not teams:
+            return jsonify([])
+
+        team_numbers = [team.get("team_number") for team in teams]
         
-        # Fetch scouting data from our database
+        # Fetch scouting data for every result from our database at once
         pipeline = [
-            {"$match": {"team_number": team_number}},
+            {"$match": {
+                "team_number": {"$in": team_numbers},
+                **team_access_filter(current_user.teamNumber, current_user.get_id())
+            }},
+            {"$sort": {"event_code": 1, "match_number": 1}},
             {"$lookup": {
                 "from": "users",
                 "localField": "scouter_id",
@@ -392,17 +552,10 @@ async def search_teams():
                 "as": "scouter"
             }},
             {"$unwind": {"path": "$scouter"}},
-            # Add team access filter
-            {"$match": {
-                "$or": [
-                    {"scouter.teamNumber": current_user.teamNumber} if current_user.teamNumber else {"scouter._id": ObjectId(current_user.get_id())},
-                    {"scouter._id": ObjectId(current_user.get_id())}
-                ]
-            }},
-            {"$sort": {"event_code": 1, "match_number": 1}},
             {
                 "$project": {
                     "_id": {"$toString": "$_id"},  # Convert ObjectId to string
+                    "team_number": 1,
                     "event_code": 1,
                     "match_number": 1,
                     "auto_coral_level1": {"$ifNull": ["$auto_coral_level1", 0]},
@@ -419,7 +572,7 @@ async def search_teams():
                     "teleop_algae_processor": {"$ifNull": ["$teleop_algae_processor", 0]},
                     "climb_type": 1,
                     "climb_success": 1,
-                    "auto_path": 1,
+                    "has_auto_path": HAS_AUTO_PATH,
                     "auto_notes": 1,
                     "defense_rating": {"$ifNull": ["$defense_rating", 0]},
                     "notes": 1,
@@ -429,19 +582,21 @@ async def search_teams():
             }
         ]
 
-        scouting_data = list(scouting_manager.db.team_data.aggregate(pipeline))
+        scouting_data = {}
+        for entry in scouting_manager.db.team_data.aggregate(pipeline):
+            scouting_data.setdefault(entry.pop("team_number"), []).append(entry)
 
-        # Format response
+        # Format response, best match first
         response_data = [{
-            "team_number": team_number,
+            "team_number": team.get("team_number"),
             "nickname": team.get("nickname"),
             "school_name": team.get("school_name"),
             "city": team.get("city"),
             "state_prov": team.get("state_prov"),
             "country": team.get("country"),
-            "scouting_data": scouting_data,
-            "has_team_page": bool(scouting_data)  # True if we have any scouting data
-        }]
+            "scouting_data": scouting_data.get(team.get("team_number"), []),
+            "has_team_page": team.get("team_number") in scouting_data  # True if we have any scouting data
+        } for team in teams]
 
         # Use json_util.dumps to handle MongoDB types
         return json_util.dumps(response_data), 200, {'Content-Type': 'application/json'}
@@ -457,54 +612,20 @@ def leaderboard():
         MIN_MATCHES = 1
         sort_type = request.args.get('sort', 'coral')
         
+        # Running totals are maintained in team_stats on every write, so this
+        # only touches one document per FRC team
         pipeline = [
-            {"$group": {
-                "_id": "$team_number",
-                "matches_played": {"$sum": 1},
-                # Auto Coral
-                "auto_coral_level1": {"$avg": {"$ifNull": ["$auto_coral_level1", 0]}},
-                "auto_coral_level2": {"$avg": {"$ifNull": ["$auto_coral_level2", 0]}},
-                "auto_coral_level3": {"$avg": {"$ifNull": ["$auto_coral_level3", 0]}},
-                "auto_coral_level4": {"$avg": {"$ifNull": ["$auto_coral_level4", 0]}},
-                # Teleop Coral
-                "teleop_coral_level1": {"$avg": {"$ifNull": ["$teleop_coral_level1", 0]}},
-                "teleop_coral_level2": {"$avg": {"$ifNull": ["$teleop_coral_level2", 0]}},
-                "teleop_coral_level3": {"$avg": {"$ifNull": ["$teleop_coral_level3", 0]}},
-                "teleop_coral_level4": {"$avg": {"$ifNull": ["$teleop_coral_level4", 0]}},
-                # Auto Algae
-                "auto_algae_net": {"$avg": {"$ifNull": ["$auto_algae_net", 0]}},
-                "auto_algae_processor": {"$avg": {"$ifNull": ["$auto_algae_processor", 0]}},
-                # Teleop Algae
-                "teleop_algae_net": {"$avg": {"$ifNull": ["$teleop_algae_net", 0]}},
-                "teleop_algae_processor": {"$avg": {"$ifNull": ["$teleop_algae_processor", 0]}},
-                
-                # Defense Rating
-                "defense_rating": {"$avg": {"$ifNull": ["$defense_rating", 0]}},
-
-                # Climb stats
-                "climb_attempts": {"$sum": 1},
-                "climb_successes": {
-                    "$sum": {"$cond": [{"$eq": ["$climb_success", True]}, 1, 0]}
-                },
-                "deep_climb_attempts": {
-                    "$sum": {"$cond": [{"$eq": ["$climb_type", "deep"]}, 1, 0]}
-                },
-                "deep_climb_successes": {
-                    "$sum": {
-                        "$cond": [
-                            {"$and": [
-                                {"$eq": ["$climb_type", "deep"]},
-                                {"$eq": ["$climb_success", True]}
-                            ]},
-                            1,
-                            0
-                        ]
-                    }
-                }
+            {"$match": {
+                "scope": ALL_SCOPE,
+                "matches_played": {"$gte": MIN_MATCHES}
+            }},
+            {"$addFields": {
+                field: {"$divide": [f"$sums.{field}", "$matches_played"]}
+                for field in STATS_FIELDS
             }},
-            {"$match": {"matches_played": {"$gte": MIN_MATCHES}}},
             {"$project": {
-                "team_number": "$_id",
+                "_id": 0,
+                "team_number": 1,
                 "matches_played": 1,
                 "auto_coral_stats": {
                     "level1": "$auto_coral_level1",
@@ -562,8 +683,8 @@ def leaderboard():
                 "climb_success_rate": {
                     "$multiply": [
                         {"$cond": [
-                            {"$gt": ["$climb_attempts", 0]},
-                            {"$divide": ["$climb_successes", "$climb_attempts"]},
+                            {"$gt": ["$matches_played", 0]},
+                            {"$divide": ["$climb_successes", "$matches_played"]},
                             0
                         ]},
                         100
@@ -604,7 +725,7 @@ def leaderboard():
 
         pipeline.append({"$sort": {sort_field: -1}})
 
-        teams = list(scouting_manager.db.team_data.aggregate(pipeline))
+        teams = list(scouting_manager.db.team_stats.aggregate(pipeline))
         return render_template("scouting/leaderboard.html", teams=teams, current_sort=sort_type)
     except Exception as e:
         # print(f"Error in leaderboard: {str(e)}")
@@ -617,22 +738,8 @@ def leaderboard():
 def matches():
     try:
         pipeline = [
-            {
-                "$lookup": {
-                    "from": "users",
-                    "localField": "scouter_id",
-                    "foreignField": "_id",
-                    "as": "scouter"
-                }
-            },
-            {"$unwind": "$scouter"},
-            # Add team access filter
-            {"$match": {
-                "$or": [
-                    {"scouter.teamNumber": current_user.teamNumber} if current_user.teamNumber else {"scouter._id": ObjectId(current_user.get_id())},
-                    {"scouter._id": ObjectId(current_user.get_id())}
-                ]
-            }},
+            # Team access filter
+            {"$match": team_access_filter(current_user.teamNumber, current_user.get_id())},
             {"$group": {
                 "_id": {
                     "event": "$event_code",
@@ -750,34 +857,19 @@ def check_team():
         # Get current user's team number
         current_user_team = current_user.teamNumber
 
-        pipeline = [
-            {
-                "$match": {
-                    "team_number": int(team_number),
-                    "event_code": event_code,
-                    "match_number": int(match_number)
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "users",
-                    "localField": "scouter_id",
-                    "foreignField": "_id",
-                    "as": "scouter"
-                }
-            },
-            {"$unwind": "$scouter"},
-        ]
-        
-        if current_id:
-            pipeline[0]["$match"]["_id"] = {"$ne": ObjectId(current_id)}
-            
-        existing = list(scouting_manager.db.team_data.aggregate(pipeline))
-        
         # Check if any existing entry is from the same team
-        exists = any(entry.get("scouter", {}).get("teamNumber") == current_user_team 
-                    for entry in existing)
-        
+        query = {
+            "scouting_team_number": current_user_team,
+            "event_code": event_code,
+            "match_number": int(match_number),
+            "team_number": int(team_number)
+        }
+
+        if current_id:
+            query["_id"] = {"$ne": ObjectId(current_id)}
+
+        exists = scouting_manager.db.team_data.find_one(query, {"_id": 1}) is not None
+
         return jsonify({"exists": exists})
     except Exception as e:
         current_app.logger.error(f"Error checking team data: {str(e)}", exc_info=True)
@@ -995,7 +1087,9 @@ def get_tba_matches(event_key):
     try:
         tba = TBAInterface()
         matches = tba.get_event_matches(event_key)
-        return jsonify(matches)
+        if matches is None:
+            return jsonify({"error": "Failed to fetch matches"}), 502
+        return cached_json_response(matches, max_age=MATCHES_TTL)
     except Exception as e:
         logger.error(f"Error getting TBA matches: {e}")
         return jsonify({"error": "Failed to fetch matches"}), 500
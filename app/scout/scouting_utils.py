@@ -4,13 +4,146 @@ import logging
 from datetime import datetime, timezone
 
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from app.models import TeamData
+from app.scout.auto_path import encode_auto_path, parse_auto_path
 from app.utils import DatabaseManager, with_mongodb_retry
 
 logger = logging.getLogger(__name__)
 
+# Per-match counters summed into team_stats; averages are sum / matches_played
+STATS_FIELDS = [
+    "auto_coral_level1",
+    "auto_coral_level2",
+    "auto_coral_level3",
+    "auto_coral_level4",
+    "teleop_coral_level1",
+    "teleop_coral_level2",
+    "teleop_coral_level3",
+    "teleop_coral_level4",
+    "auto_algae_net",
+    "auto_algae_processor",
+    "teleop_algae_net",
+    "teleop_algae_processor",
+    "defense_rating",
+]
+
+# Sentinel for "not passed", since None is a valid scouting team number
+MISSING = object()
+
+# Scope holding every scouted match regardless of who scouted it
+ALL_SCOPE = "all"
+
+# Number of recent defense notes kept on each team_stats document
+DEFENSE_NOTES_LIMIT = 10
+
+# Outcomes of each entry in a bulk submission
+ACCEPTED = "accepted"
+REJECTED = "rejected"  # invalid or conflicts with saved data; resending can't help
+FAILED = "failed"  # server error; the client should try again later
+
+# Robots per alliance. Each scouting team's places are counted in match_slots.
+MAX_ALLIANCE_TEAMS = 3
+
+# Whether a team_data document has a drawing, without loading it
+HAS_AUTO_PATH = {"$not": [
+    {"$in": [{"$ifNull": ["$auto_path", ""]}, ["", [], "[]"]]}
+]}
+
+# Rows per page of the scouting list
+LIST_PAGE_SIZE = 50
+
+# Fields shown on the scouting list. The auto_path drawing is fetched on
+# demand, so rows only say whether one exists.
+LIST_PROJECTION = {
+    "_id": 1,
+    "team_number": 1,
+    "match_number": 1,
+    "event_code": 1,
+    **{field: 1 for field in STATS_FIELDS},
+    "climb_type": 1,
+    "climb_success": 1,
+    "defense_notes": 1,
+    "auto_notes": 1,
+    "notes": 1,
+    "alliance": 1,
+    "scouter_id": 1,
+    "scouter_name": "$scouter.username",
+    "scouter_team": "$scouting_team_number",
+    "device_type": 1,
+    "has_auto_path": HAS_AUTO_PATH,
+}
+
+# Recent matches returned per team when comparing teams
+COMPARE_RECENT_MATCHES = 5
+
+# Per-match fields shown on the compare view (scouter details are added after
+# the per-team limit)
+COMPARE_MATCH_PROJECTION = {
+    "_id": {"$toString": "$_id"},
+    "team_number": 1,
+    "scouter_id": 1,
+    "match_number": 1,
+    "alliance": 1,
+    **{field: 1 for field in STATS_FIELDS},
+    "climb_success": 1,
+    "climb_type": 1,
+    "has_auto_path": HAS_AUTO_PATH,
+    "auto_notes": 1,
+    "device_type": 1,
+    "notes": 1,
+}
+
+# Columns of a scouting data export, in order. auto_path drawings are left out.
+EXPORT_FIELDS = [
+    "id",
+    "event_code",
+    "match_number",
+    "team_number",
+    "alliance",
+    *(field for field in STATS_FIELDS if field != "defense_rating"),
+    "climb_type",
+    "climb_success",
+    "defense_rating",
+    "defense_notes",
+    "auto_notes",
+    "notes",
+    "scouter_name",
+    "scouting_team_number",
+    "created_at",
+]
+
+
+def team_access_filter(user_team_number=None, user_id=None):
+    """Filter for scouting documents a user may see: everything scouted by
+    their team plus their own entries"""
+    if user_team_number:
+        return {
+            "$or": [
+                {"scouting_team_number": user_team_number},
+                {"scouter_id": ObjectId(user_id)},
+            ]
+        }
+    return {"scouter_id": ObjectId(user_id)}
+
+
+def stats_scope(scouting_team_number=None, scouter_id=None):
+    """team_stats scope for data visible to a scouting team, or to a
+    scouter without a team"""
+    if scouting_team_number:
+        return f"team:{scouting_team_number}"
+    return f"user:{scouter_id}"
+
+
+def stats_scope_filter(scouting_team_number=None, scouter_id=None):
+    """Filter for the scouting documents counted in the stats_scope of the
+    same arguments"""
+    if scouting_team_number:
+        return {"scouting_team_number": scouting_team_number}
+    return {"scouting_team_number": None, "scouter_id": ObjectId(scouter_id)}
+
 
 class ScoutingManager(DatabaseManager):
     def __init__(self, mongo_uri):
@@ -18,18 +151,32 @@ class ScoutingManager(DatabaseManager):
         self._ensure_collections()
 
     def _ensure_collections(self):
-        """Ensure required collections exist"""
+        """Ensure required collections exist (indexes live in app.indexes)"""
         collections = self.db.list_collection_names()
         if "team_data" not in collections:
             self._create_team_data_collection()
         if "pit_scouting" not in collections:
             self.db.create_collection("pit_scouting")
-            self.db.pit_scouting.create_index([("team_number", 1)])
-            self.db.pit_scouting.create_index([("scouter_id", 1)])
-            logger.info("Created pit_scouting collection and indexes")
+            logger.info("Created pit_scouting collection")
         
         # Fix any string scouter_ids in pit_scouting collection
         self._migrate_pit_scouting_scouter_ids()
+        self._migrate_scouting_team_numbers()
+        self._migrate_auto_paths()
+
+        if "team_stats" not in collections:
+            self.db.create_collection("team_stats")
+            logger.info("Created team_stats collection")
+        if "match_slots" not in collections:
+            self.rebuild_match_slots()
+        if (
+            self.db.team_stats.estimated_document_count() == 0
+            and self.db.team_data.estimated_document_count() > 0
+        ) or self.db.team_stats.find_one(
+            # Defense notes stored as bare strings can't be removed per entry
+            {"defense_notes": {"$type": "string"}}, {"_id": 1}
+        ):
+            self.rebuild_team_stats()
 
     def _migrate_pit_scouting_scouter_ids(self):
         """Migrate string scouter_ids to ObjectId in pit_scouting collection"""
@@ -48,49 +195,378 @@ class ScoutingManager(DatabaseManager):
         except Exception as e:
             logger.error(f"Error during pit scouting migration: {str(e)}")
 
-    def connect(self):
-        """Establish connection to MongoDB with basic error handling"""
+    def _migrate_scouting_team_numbers(self):
+        """Backfill scouting_team_number on documents written before it was
+        stored at insert time"""
+        try:
+            missing = {"scouting_team_number": {"$exists": False}}
+            for collection in ("team_data", "pit_scouting"):
+                if not self.db[collection].find_one(missing, {"_id": 1}):
+                    continue
+
+                migrated = 0
+                for user in self.db.users.find(
+                    {"teamNumber": {"$nin": [None, ""]}}, {"teamNumber": 1}
+                ):
+                    result = self.db[collection].update_many(
+                        {"scouter_id": user["_id"], **missing},
+                        {"$set": {"scouting_team_number": user["teamNumber"]}}
+                    )
+                    migrated += result.modified_count
+
+                # Whatever is left was scouted by users without a team
+                result = self.db[collection].update_many(
+                    missing, {"$set": {"scouting_team_number": None}}
+                )
+                migrated += result.modified_count
+                logger.info(f"Backfilled scouting_team_number on {migrated} {collection} documents")
+        except Exception as e:
+            logger.error(f"Error during scouting team number migration: {str(e)}")
+
+    def _migrate_auto_paths(self, batch_size=500):
+        """Re-encode auto_path drawings stored as raw Canvas.js JSON"""
         try:
-            if self.client is None:
-                self.client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=5000)
-                # Test the connection
-                self.client.server_info()
-                self.db = self.client.get_default_database()
-                logger.info("Successfully connected to MongoDB")
-
-                # Ensure collections exist
-                collections = self.db.list_collection_names()
-                if "team_data" not in collections:
-                    self._create_team_data_collection()
-                if "pit_scouting" not in collections:
-                    self.db.create_collection("pit_scouting")
-                    self.db.pit_scouting.create_index([("team_number", 1)])
-                    self.db.pit_scouting.create_index([("scouter_id", 1)])
-                    logger.info("Created pit_scouting collection and indexes")
+            legacy = {"auto_path": {"$type": ["array", "string"], "$nin": [""]}}
+            if not self.db.team_data.find_one(legacy, {"_id": 1}):
+                return
+
+            migrated = 0
+            batch = []
+            for doc in self.db.team_data.find(legacy, {"auto_path": 1}):
+                batch.append(UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {"auto_path": encode_auto_path(doc["auto_path"])}}
+                ))
+                if len(batch) >= batch_size:
+                    migrated += self.db.team_data.bulk_write(batch, ordered=False).modified_count
+                    batch = []
+            if batch:
+                migrated += self.db.team_data.bulk_write(batch, ordered=False).modified_count
+            logger.info(f"Re-encoded {migrated} auto_path drawings")
         except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {str(e)}")
-            raise
+            logger.error(f"Error during auto path migration: {str(e)}")
+
+    def connect(self):
+        """Connect and make sure the scouting collections exist"""
+        first_connect = self.client is None
+        super().connect()
+        if first_connect:
+            collections = self.db.list_collection_names()
+            if "team_data" not in collections:
+                self._create_team_data_collection()
+            if "pit_scouting" not in collections:
+                self.db.create_collection("pit_scouting")
+                logger.info("Created pit_scouting collection")
 
     def _create_team_data_collection(self):
         self.db.create_collection("team_data")
-        self.db.team_data.create_index([("team_number", 1)])
-        self.db.team_data.create_index([("scouter_id", 1)])
-        logger.info("Created team_data collection and indexes")
+        logger.info("Created team_data collection")
+
+    def _get_scouter_team_number(self, scouter_id):
+        """Team number of the user who scouted a document, if any"""
+        user = self.db.users.find_one({"_id": ObjectId(scouter_id)}, {"teamNumber": 1})
+        return user.get("teamNumber") if user else None
+
+    @staticmethod
+    def _stats_increments(doc, sign=1):
+        """$inc document adding (sign=1) or removing (sign=-1) one match"""
+        climb_success = bool(doc.get("climb_success"))
+        deep_climb = doc.get("climb_type") == "deep"
+        increments = {
+            f"sums.{field}": sign * (doc.get(field) or 0) for field in STATS_FIELDS
+        }
+        increments.update({
+            "matches_played": sign,
+            "climb_successes": sign * int(climb_success),
+            "deep_climb_attempts": sign * int(deep_climb),
+            "deep_climb_successes": sign * int(deep_climb and climb_success),
+        })
+        return increments
+
+    def _apply_team_stats(self, doc, scope, sign=1, newest=True):
+        """Add or remove one team_data document from the running totals of
+        both its scouting scope and the global scope. An added document is
+        taken to be the team's newest entry unless `newest` is False, e.g.
+        for an edit. If the update fails, the team's stats are recomputed."""
+        team_number = doc.get("team_number")
+        try:
+            self._update_team_stats(
+                team_number,
+                self._stats_increments(doc, sign),
+                doc.get("_id"),
+                doc.get("defense_notes"),
+                doc.get("climb_type", "") if sign > 0 and newest else None,
+                scope,
+                sign,
+            )
+            if sign < 0 or not newest:
+                self._refresh_last_climb_type(doc, scope)
+        except Exception as e:
+            logger.error(f"Error updating team stats for team {team_number}: {str(e)}")
+            self.rebuild_team_stats(team_number)
+
+    def _update_team_stats(self, team_number, increments, entry_id, defense_note,
+                           climb_type, scope, sign):
+        for target_scope in (scope, ALL_SCOPE):
+            update = {
+                "$inc": increments,
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+            }
+            if climb_type is not None:
+                update["$set"]["last_climb_type"] = climb_type
+            if sign > 0 and defense_note:
+                update["$push"] = {"defense_notes": {
+                    "$each": [{"entry_id": entry_id, "note": defense_note}],
+                    "$slice": -DEFENSE_NOTES_LIMIT,
+                }}
+            elif sign < 0 and defense_note:
+                update["$pull"] = {"defense_notes": {"entry_id": entry_id}}
+
+            self.db.team_stats.update_one(
+                {"scope": target_scope, "team_number": team_number},
+                update,
+                upsert=sign > 0,
+            )
 
-    def ensure_connected(self):
-        """Ensure we have a valid connection, reconnect if necessary"""
+        if sign < 0:
+            self.db.team_stats.delete_many({
+                "scope": {"$in": [scope, ALL_SCOPE]},
+                "team_number": team_number,
+                "matches_played": {"$lte": 0},
+            })
+
+    def _refresh_last_climb_type(self, doc, scope):
+        """Reset last_climb_type from the newest remaining entry, after the
+        one that set it may have been deleted or edited"""
+        team_number = doc.get("team_number")
+        scope_filter = stats_scope_filter(doc.get("scouting_team_number"), doc.get("scouter_id"))
+        for target_scope, query in ((scope, scope_filter), (ALL_SCOPE, {})):
+            latest = self.db.team_data.find_one(
+                {**query, "team_number": team_number},
+                {"climb_type": 1},
+                sort=[("created_at", -1)],
+            )
+            if latest:
+                self.db.team_stats.update_one(
+                    {"scope": target_scope, "team_number": team_number},
+                    {"$set": {"last_climb_type": latest.get("climb_type", "")}},
+                )
+
+    def rebuild_team_stats(self, team_number=None):
+        """Recompute team_stats out of team_data, for every team or just one.
+        Repairs any drift from stats updates that failed after their
+        team_data write."""
         try:
-            if self.client is None:
-                self.connect()
-            else:
-                # Test if connection is still alive
-                self.client.server_info()
-        except Exception:
-            logger.warning("Lost connection to MongoDB, attempting to reconnect.")
-            self.connect()
+            group = {
+                "_id": {"scope": "$scope", "team_number": "$team_number"},
+                "matches_played": {"$sum": 1},
+                "climb_successes": {
+                    "$sum": {"$cond": [{"$eq": ["$climb_success", True]}, 1, 0]}
+                },
+                "deep_climb_attempts": {
+                    "$sum": {"$cond": [{"$eq": ["$climb_type", "deep"]}, 1, 0]}
+                },
+                "deep_climb_successes": {
+                    "$sum": {"$cond": [
+                        {"$and": [
+                            {"$eq": ["$climb_type", "deep"]},
+                            {"$eq": ["$climb_success", True]}
+                        ]},
+                        1,
+                        0
+                    ]}
+                },
+                "last_climb_type": {"$last": "$climb_type"},
+                "defense_notes": {"$push": {"entry_id": "$_id", "note": "$defense_notes"}},
+                **{field: {"$sum": {"$ifNull": [f"${field}", 0]}} for field in STATS_FIELDS},
+            }
+            only_team = {} if team_number is None else {"team_number": team_number}
+            pipeline = [
+                {"$match": only_team},
+                {"$sort": {"created_at": 1}},
+                {"$addFields": {"scope": {"$cond": [
+                    {"$ifNull": ["$scouting_team_number", False]},
+                    {"$concat": ["team:", {"$toString": "$scouting_team_number"}]},
+                    {"$concat": ["user:", {"$toString": "$scouter_id"}]},
+                ]}}},
+                {"$facet": {
+                    "scoped": [{"$group": group}],
+                    "all": [
+                        {"$set": {"scope": ALL_SCOPE}},
+                        {"$group": group},
+                    ],
+                }},
+            ]
+
+            result = next(self.db.team_data.aggregate(pipeline, allowDiskUse=True), {})
+            self.db.team_stats.delete_many(only_team)
+            now = datetime.now(timezone.utc)
+            docs = [
+                {
+                    "scope": row["_id"]["scope"],
+                    "team_number": row["_id"]["team_number"],
+                    "matches_played": row["matches_played"],
+                    "climb_successes": row["climb_successes"],
+                    "deep_climb_attempts": row["deep_climb_attempts"],
+                    "deep_climb_successes": row["deep_climb_successes"],
+                    "last_climb_type": row.get("last_climb_type") or "",
+                    "defense_notes": [
+                        n for n in row["defense_notes"] if n.get("note")
+                    ][-DEFENSE_NOTES_LIMIT:],
+                    "sums": {field: row[field] for field in STATS_FIELDS},
+                    "updated_at": now,
+                }
+                for row in result.get("scoped", []) + result.get("all", [])
+            ]
+            if docs:
+                self.db.team_stats.insert_many(docs)
+            logger.info(f"Rebuilt team_stats with {len(docs)} documents")
+            return len(docs)
+        except Exception as e:
+            logger.error(f"Error rebuilding team stats: {str(e)}")
+            return None
+
+    def rebuild_match_slots(self):
+        """Recount every alliance's places in match_slots out of team_data"""
+        try:
+            self.db.team_data.aggregate([
+                {"$group": {
+                    "_id": {
+                        "scouting_team_number": "$scouting_team_number",
+                        "event_code": "$event_code",
+                        "match_number": "$match_number",
+                        "alliance": "$alliance",
+                    },
+                    "count": {"$sum": 1},
+                }},
+                {"$out": "match_slots"},
+            ], allowDiskUse=True)
+            logger.info("Rebuilt match_slots")
+            return True
+        except Exception as e:
+            logger.error(f"Error rebuilding match slots: {str(e)}")
+            return None
+
+    @staticmethod
+    def _slot_id(scouting_team_number, event_code, match_number, alliance):
+        """match_slots _id; keys are in the order rebuild_match_slots groups by"""
+        return {
+            "scouting_team_number": scouting_team_number,
+            "event_code": event_code,
+            "match_number": match_number,
+            "alliance": alliance,
+        }
+
+    def _reserve_alliance_slot(self, scouting_team_number, event_code, match_number, alliance):
+        """Atomically take one of an alliance's places before its entry is
+        written. Returns an error message if the alliance is full."""
+        slot_id = self._slot_id(scouting_team_number, event_code, match_number, alliance)
+        try:
+            # Create the counter with an equality-only upsert, which the
+            # server retries if concurrent first submissions collide
+            self.db.match_slots.update_one(
+                {"_id": slot_id}, {"$setOnInsert": {"count": 0}}, upsert=True
+            )
+        except DuplicateKeyError:
+            pass  # created by a concurrent submission
+
+        result = self.db.match_slots.update_one(
+            {"_id": slot_id, "count": {"$lt": MAX_ALLIANCE_TEAMS}},
+            {"$inc": {"count": 1}},
+        )
+        if result.modified_count == 0:
+            return f"Cannot add more teams to {alliance} alliance (maximum {MAX_ALLIANCE_TEAMS})"
+        return None
+
+    def _release_alliance_slot(self, scouting_team_number, event_code, match_number, alliance):
+        """Give back a place taken by _reserve_alliance_slot"""
+        try:
+            self.db.match_slots.update_one(
+                {
+                    "_id": self._slot_id(scouting_team_number, event_code, match_number, alliance),
+                    "count": {"$gt": 0},
+                },
+                {"$inc": {"count": -1}},
+            )
+        except Exception as e:
+            logger.error(f"Error releasing alliance slot: {str(e)}")
+
+    def _check_match_slot(self, scouting_team_number, event_code, match_number,
+                          team_number, alliance, exclude_id=None, check_capacity=True):
+        """Validate a robot against what the scouting team already recorded for
+        this match, using a single indexed query. Returns an error message, or
+        None if the entry may be saved. Alliance capacity is only enforced
+        atomically by _reserve_alliance_slot; this check just fails early."""
+        query = {
+            "scouting_team_number": scouting_team_number,
+            "event_code": event_code,
+            "match_number": match_number,
+        }
+        if exclude_id:
+            query["_id"] = {"$ne": ObjectId(exclude_id)}
+
+        entries = list(self.db.team_data.find(query, {"team_number": 1, "alliance": 1}))
+
+        if any(entry.get("team_number") == team_number for entry in entries):
+            return f"Team {team_number} has already been scouted by your team in match {match_number}"
+
+        if check_capacity and sum(entry.get("alliance") == alliance for entry in entries) >= MAX_ALLIANCE_TEAMS:
+            return f"Cannot add more teams to {alliance} alliance (maximum {MAX_ALLIANCE_TEAMS})"
+
+        return None
+
+    @staticmethod
+    def _build_team_data(data, team_number, alliance, scouter_id, scouting_team_number):
+        """team_data document for a validated submission"""
+        return {
+            "team_number": team_number,
+            "event_code": data["event_code"],
+            "match_number": int(data["match_number"]),
+            "alliance": alliance,
+
+            # Auto Coral scoring
+            "auto_coral_level1": int(data.get("auto_coral_level1", 0)),
+            "auto_coral_level2": int(data.get("auto_coral_level2", 0)),
+            "auto_coral_level3": int(data.get("auto_coral_level3", 0)),
+            "auto_coral_level4": int(data.get("auto_coral_level4", 0)),
+
+            # Teleop Coral scoring
+            "teleop_coral_level1": int(data.get("teleop_coral_level1", 0)),
+            "teleop_coral_level2": int(data.get("teleop_coral_level2", 0)),
+            "teleop_coral_level3": int(data.get("teleop_coral_level3", 0)),
+            "teleop_coral_level4": int(data.get("teleop_coral_level4", 0)),
+
+            # Auto Algae scoring
+            "auto_algae_net": int(data.get("auto_algae_net", 0)),
+            "auto_algae_processor": int(data.get("auto_algae_processor", 0)),
+
+            # Teleop Algae scoring
+            "teleop_algae_net": int(data.get("teleop_algae_net", 0)),
+            "teleop_algae_processor": int(data.get("teleop_algae_processor", 0)),
+
+            # Climb
+            "climb_type": data.get("climb_type", ""),
+            "climb_success": bool(data.get("climb_success", False)),
+
+            # Defense
+            "defense_rating": int(data.get("defense_rating", 1)),
+            "defense_notes": data.get("defense_notes", ""),
+
+            # Auto
+            "auto_path": encode_auto_path(data.get("auto_path", "")),
+            "auto_notes": data.get("auto_notes", ""),
+
+            # Notes
+            "notes": data.get("notes", ""),
+
+            # Metadata
+            "scouter_id": ObjectId(scouter_id),
+            "scouting_team_number": scouting_team_number,
+            "created_at": datetime.now(timezone.utc),
+        }
 
     @with_mongodb_retry(retries=3, delay=2)
-    def add_scouting_data(self, data, scouter_id):
+    def add_scouting_data(self, data, scouter_id, scouting_team_number=MISSING):
         """Add new scouting data with retry mechanism"""
         self.ensure_connected()
         try:
@@ -99,15 +575,228 @@ class ScoutingManager(DatabaseManager):
             if team_number <= 0:
                 return False, "Invalid team number"
 
-            # Lookup to check if this team is already scouted in this match by someone from the same team
-            pipeline = [
+            if scouting_team_number is MISSING:
+                scouting_team_number = self._get_scouter_team_number(scouter_id)
+
+            alliance = data.get("alliance", "red")
+            if error := self._check_match_slot(
+                scouting_team_number,
+                data["event_code"],
+                int(data["match_number"]),
+                team_number,
+                alliance,
+            ):
+                return False, error
+
+            team_data = self._build_team_data(
+                data, team_number, alliance, scouter_id, scouting_team_number
+            )
+            slot = (
+                scouting_team_number,
+                team_data["event_code"],
+                team_data["match_number"],
+                alliance,
+            )
+            if error := self._reserve_alliance_slot(*slot):
+                return False, error
+
+            try:
+                result = self.db.team_data.insert_one(team_data)
+            except DuplicateKeyError:
+                # Another scouter from the same team submitted this robot first
+                self._release_alliance_slot(*slot)
+                return False, f"Team {team_number} has already been scouted by your team in match {data['match_number']}"
+            except Exception:
+                self._release_alliance_slot(*slot)
+                raise
+
+            self._apply_team_stats(
+                team_data,
+                stats_scope(team_data["scouting_team_number"], scouter_id),
+            )
+            return True, str(result.inserted_id)
+
+        except Exception as e:
+            logger.error(f"Error adding team data: {str(e)}")
+            return False, "An internal error has occurred."
+
+    @with_mongodb_retry(retries=3, delay=2)
+    def add_scouting_data_bulk(self, entries, scouter_id, scouting_team_number=MISSING):
+        """Add a batch of scouting submissions, e.g. a scouter's offline queue.
+
+        `entries` is a list of (client_id, data) pairs. The batch is checked
+        against the scouting team's existing entries with one query and
+        against itself, then written with a single unordered insert_many.
+        Entries repeating an earlier client_id are ignored.
+        Returns {client_id: (outcome, id or error message)} for every entry,
+        where outcome is ACCEPTED, REJECTED or FAILED.
+        """
+        self.ensure_connected()
+        results = {}
+        try:
+            if scouting_team_number is MISSING:
+                scouting_team_number = self._get_scouter_team_number(scouter_id)
+
+            # Validate each entry on its own first
+            candidates = []
+            seen = set()
+            for client_id, data in entries:
+                if client_id in seen:
+                    continue
+                seen.add(client_id)
+                try:
+                    team_number = int(data["team_number"])
+                    if team_number <= 0:
+                        results[client_id] = (REJECTED, "Invalid team number")
+                        continue
+                    alliance = data.get("alliance", "red")
+                    team_data = self._build_team_data(
+                        data, team_number, alliance, scouter_id, scouting_team_number
+                    )
+                except (KeyError, TypeError, ValueError):
+                    results[client_id] = (REJECTED, "Invalid scouting data")
+                    continue
+                candidates.append((client_id, team_data))
+
+            if not candidates:
+                return results
+
+            # Everything the team already recorded for the matches in this batch
+            matches = {(doc["event_code"], doc["match_number"]) for _, doc in candidates}
+            existing = {}
+            for entry in self.db.team_data.find(
                 {
-                    "$match": {
-                        "event_code": data["event_code"],
-                        "match_number": int(data["match_number"]),
-                        "team_number": team_number
-                    }
+                    "scouting_team_number": scouting_team_number,
+                    "$or": [
+                        {"event_code": event_code, "match_number": match_number}
+                        for event_code, match_number in matches
+                    ],
                 },
+                {"event_code": 1, "match_number": 1, "team_number": 1, "alliance": 1}
+            ):
+                existing.setdefault(
+                    (entry["event_code"], entry["match_number"]), []
+                ).append(entry)
+
+            # Check duplicates and alliance capacity against the database and
+            # the entries already accepted from this batch
+            accepted = []
+            for client_id, doc in candidates:
+                match_number = doc["match_number"]
+                slot = existing.setdefault((doc["event_code"], match_number), [])
+                if any(entry.get("team_number") == doc["team_number"] for entry in slot):
+                    results[client_id] = (
+                        REJECTED,
+                        f"Team {doc['team_number']} has already been scouted by your team in match {match_number}"
+                    )
+                elif sum(entry.get("alliance") == doc["alliance"] for entry in slot) >= MAX_ALLIANCE_TEAMS:
+                    results[client_id] = (
+                        REJECTED,
+                        f"Cannot add more teams to {doc['alliance']} alliance (maximum {MAX_ALLIANCE_TEAMS})"
+                    )
+                else:
+                    slot.append(doc)
+                    accepted.append((client_id, doc))
+
+            if not accepted:
+                return results
+
+            # Take the alliance places in one round trip. A conditional upsert
+            # fails with a duplicate key both when the alliance is full and
+            # when it raced another submission creating the counter, so those
+            # entries go through _reserve_alliance_slot to tell them apart.
+            def slot_of(doc):
+                return (scouting_team_number, doc["event_code"], doc["match_number"], doc["alliance"])
+
+            unreserved = {}
+            try:
+                self.db.match_slots.bulk_write(
+                    [
+                        UpdateOne(
+                            {
+                                "_id": self._slot_id(*slot_of(doc)),
+                                "count": {"$lt": MAX_ALLIANCE_TEAMS},
+                            },
+                            {"$inc": {"count": 1}},
+                            upsert=True,
+                        )
+                        for _, doc in accepted
+                    ],
+                    ordered=False,
+                )
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    unreserved[error["index"]] = error.get("code")
+
+            reserved = []
+            for index, (client_id, doc) in enumerate(accepted):
+                if index not in unreserved:
+                    reserved.append((client_id, doc))
+                elif unreserved[index] == 11000:
+                    if error := self._reserve_alliance_slot(*slot_of(doc)):
+                        results[client_id] = (REJECTED, error)
+                    else:
+                        reserved.append((client_id, doc))
+                else:
+                    results[client_id] = (FAILED, "An internal error has occurred.")
+            accepted = reserved
+            if not accepted:
+                return results
+
+            failed = {}
+            try:
+                self.db.team_data.insert_many([doc for _, doc in accepted], ordered=False)
+            except BulkWriteError as e:
+                # Entries that raced with another scouter's submission
+                for error in e.details.get("writeErrors", []):
+                    failed[error["index"]] = error.get("code")
+
+            scope = stats_scope(scouting_team_number, scouter_id)
+            for index, (client_id, doc) in enumerate(accepted):
+                if index in failed:
+                    self._release_alliance_slot(*slot_of(doc))
+                    if failed[index] == 11000:
+                        results[client_id] = (
+                            REJECTED,
+                            f"Team {doc['team_number']} has already been scouted by your team in match {doc['match_number']}"
+                        )
+                    else:
+                        results[client_id] = (FAILED, "An internal error has occurred.")
+                    continue
+                # insert_many sets _id on each document it was given
+                self._apply_team_stats(doc, scope)
+                results[client_id] = (ACCEPTED, str(doc["_id"]))
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error adding bulk team data: {str(e)}")
+            for client_id, _ in entries:
+                results.setdefault(client_id, (FAILED, "An internal error has occurred."))
+            return results
+
+    def export_scouting_data(self, user_team_number=None, user_id=None, event_code=None,
+                             batch_size=500):
+        """Cursor over the scouting data a user may see, flattened to
+        EXPORT_FIELDS. Rows are fetched from the server in batches as the
+        cursor is consumed, so exports don't hold the dataset in memory."""
+        self.ensure_connected()
+        query = team_access_filter(user_team_number, user_id)
+        if event_code:
+            query = {"$and": [query, {"event_code": event_code}]}
+
+        projection = {field: 1 for field in EXPORT_FIELDS}
+        projection.update({
+            "_id": 0,
+            "id": {"$toString": "$_id"},
+            "scouter_name": {"$arrayElemAt": ["$scouter.username", 0]},
+            "created_at": {"$dateToString": {"date": "$created_at"}},
+        })
+
+        return self.db.team_data.aggregate(
+            [
+                {"$match": query},
+                {"$sort": {"event_code": 1, "match_number": 1, "team_number": 1}},
                 {
                     "$lookup": {
                         "from": "users",
@@ -116,97 +805,35 @@ class ScoutingManager(DatabaseManager):
                         "as": "scouter"
                     }
                 },
-                {"$unwind": "$scouter"},
-                {
-                    "$lookup": {
-                        "from": "users",
-                        "localField": "scouter.teamNumber",
-                        "foreignField": "teamNumber",
-                        "as": "team_scouters"
-                    }
-                }
-            ]
-
-            if existing_entries := list(self.db.team_data.aggregate(pipeline)):
-                current_user = self.db.users.find_one({"_id": ObjectId(scouter_id)})
-                for entry in existing_entries:
-                    if entry.get("scouter", {}).get("teamNumber") == current_user.get("teamNumber"):
-                        return False, f"Team {team_number} has already been scouted by your team in match {data['match_number']}"
-
-            # Get existing match data to validate alliance sizes and calculate scores
-            match_data = list(self.db.team_data.find({
-                "event_code": data["event_code"],
-                "match_number": int(data["match_number"])
-            }))
-
-            # Count teams per alliance
-            alliance = data.get("alliance", "red")
-            red_teams = [m for m in match_data if m["alliance"] == "red"]
-            blue_teams = [m for m in match_data if m["alliance"] == "blue"]
-
-            if (alliance == "red" and len(red_teams) >= 3) or (alliance == "blue" and len(blue_teams) >= 3):
-                return False, f"Cannot add more teams to {alliance} alliance (maximum 3)"
-
-            # Process form data
-            team_data = {
-                "team_number": team_number,
-                "event_code": data["event_code"],
-                "match_number": int(data["match_number"]),
-                "alliance": alliance,
-
-                # Auto Coral scoring
-                "auto_coral_level1": int(data.get("auto_coral_level1", 0)),
-                "auto_coral_level2": int(data.get("auto_coral_level2", 0)),
-                "auto_coral_level3": int(data.get("auto_coral_level3", 0)),
-                "auto_coral_level4": int(data.get("auto_coral_level4", 0)),
-
-                # Teleop Coral scoring
-                "teleop_coral_level1": int(data.get("teleop_coral_level1", 0)),
-                "teleop_coral_level2": int(data.get("teleop_coral_level2", 0)),
-                "teleop_coral_level3": int(data.get("teleop_coral_level3", 0)),
-                "teleop_coral_level4": int(data.get("teleop_coral_level4", 0)),
-
-                # Auto Algae scoring
-                "auto_algae_net": int(data.get("auto_algae_net", 0)),
-                "auto_algae_processor": int(data.get("auto_algae_processor", 0)),
-
-                # Teleop Algae scoring
-                "teleop_algae_net": int(data.get("teleop_algae_net", 0)),
-                "teleop_algae_processor": int(data.get("teleop_algae_processor", 0)),
-
-                # Climb
-                "climb_type": data.get("climb_type", ""),
-                "climb_success": bool(data.get("climb_success", False)),
-
-                # Defense
-                "defense_rating": int(data.get("defense_rating", 1)),
-                "defense_notes": data.get("defense_notes", ""),
-
-                # Auto
-                "auto_path": data.get("auto_path", ""),
-                "auto_notes": data.get("auto_notes", ""),
-
-                # Notes
-                "notes": data.get("notes", ""),
-
-                # Metadata
-                "scouter_id": ObjectId(scouter_id),
-                "created_at": datetime.now(timezone.utc),
-            }
-
-            result = self.db.team_data.insert_one(team_data)
-            return True, str(result.inserted_id)
-
-        except Exception as e:
-            logger.error(f"Error adding team data: {str(e)}")
-            return False, "An internal error has occurred."
+                {"$project": projection},
+            ],
+            batchSize=batch_size,
+            allowDiskUse=True,
+        )
 
     @with_mongodb_retry(retries=3, delay=2)
-    def get_all_scouting_data(self, user_team_number=None, user_id=None):
-        """Get all scouting data with user information, filtered by team access"""
+    def get_scouting_page(self, user_team_number=None, user_id=None, filters=None,
+                          after=None, limit=LIST_PAGE_SIZE):
+        """One page of the scouting data a user may see, newest first.
+
+        Pages are keyed on _id: `after` is the cursor returned with the
+        previous page. `filters` may hold event_code, team_number and
+        match_number. Returns (rows, next_cursor); next_cursor is None on the
+        last page.
+        """
         try:
-            # Base pipeline for user lookup
+            query = [team_access_filter(user_team_number, user_id)]
+            for field in ("event_code", "team_number", "match_number"):
+                if filters and filters.get(field) is not None:
+                    query.append({field: filters[field]})
+            if after:
+                query.append({"_id": {"$lt": ObjectId(after)}})
+
+            # Page first so the scouter lookup only runs on the rows returned
             pipeline = [
+                {"$match": {"$and": query}},
+                {"$sort": {"_id": -1}},
+                {"$limit": limit + 1},
                 {
                     "$lookup": {
                         "from": "users",
@@ -215,67 +842,44 @@ class ScoutingManager(DatabaseManager):
                         "as": "scouter"
                     }
                 },
-                {"$unwind": "$scouter"},
-            ]
-
-            # Add match stage for filtering based on team number or user ID
-            if user_team_number:
-                # If user has a team number, show data from their team and their own data
-                pipeline.append({
-                    "$match": {
-                        "$or": [
-                            {"scouter.teamNumber": user_team_number},
-                            {"scouter._id": ObjectId(user_id)}
-                        ]
-                    }
-                })
-            else:
-                # If user has no team, only show their own data
-                pipeline.append({
-                    "$match": {
-                        "scouter._id": ObjectId(user_id)
+                # Keep entries whose scouter was deleted so the page stays
+                # limit + 1 rows long and next_cursor is still right
+                {
+                    "$unwind": {
+                        "path": "$scouter",
+                        "preserveNullAndEmptyArrays": True
                     }
-                })
+                },
+                {"$project": LIST_PROJECTION},
+            ]
 
-            # Project the needed fields
-            pipeline.append({
-                "$project": {
-                    "_id": 1,
-                    "team_number": 1,
-                    "match_number": 1,
-                    "event_code": 1,
-                    "auto_coral_level1": 1,
-                    "auto_coral_level2": 1,
-                    "auto_coral_level3": 1,
-                    "auto_coral_level4": 1,
-                    "teleop_coral_level1": 1,
-                    "teleop_coral_level2": 1,
-                    "teleop_coral_level3": 1,
-                    "teleop_coral_level4": 1,
-                    "auto_algae_net": 1,
-                    "auto_algae_processor": 1,
-                    "teleop_algae_net": 1,
-                    "teleop_algae_processor": 1,
-                    "climb_type": 1,
-                    "climb_success": 1,
-                    "defense_rating": 1,
-                    "defense_notes": 1,
-                    "auto_path": 1,
-                    "auto_notes": 1,
-                    "notes": 1,
-                    "alliance": 1,
-                    "scouter_id": 1,
-                    "scouter_name": "$scouter.username",
-                    "scouter_team": "$scouter.teamNumber",
-                    "device_type": 1
-                }
-            })
-            
-            team_data = list(self.db.team_data.aggregate(pipeline))
-            return team_data
+            rows = list(self.db.team_data.aggregate(pipeline))
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = str(rows[-1]["_id"])
+            return rows, next_cursor
         except Exception as e:
             logger.error(f"Error fetching team data: {str(e)}")
-            return []
+            return [], None
+
+    @with_mongodb_retry(retries=3, delay=2)
+    def get_auto_path(self, team_id, user_team_number=None, user_id=None):
+        """auto_path drawing and notes for one accessible scouting entry"""
+        try:
+            doc = self.db.team_data.find_one(
+                {
+                    "_id": ObjectId(team_id),
+                    **team_access_filter(user_team_number, user_id),
+                },
+                {"_id": 0, "auto_path": 1, "auto_notes": 1, "device_type": 1}
+            )
+            if doc:
+                doc["auto_path"] = parse_auto_path(doc.get("auto_path"))
+            return doc
+        except Exception as e:
+            logger.error(f"Error fetching auto path: {str(e)}")
+            return None
 
     @with_mongodb_retry(retries=3, delay=2)
     def get_team_data(self, team_id, scouter_id=None):
@@ -294,6 +898,8 @@ class ScoutingManager(DatabaseManager):
             else:
                 data["scouter_team"] = None
 
+            data["auto_path"] = parse_auto_path(data.get("auto_path"))
+
             # Then check ownership if scouter_id is provided
             if scouter_id:
                 data["is_owner"] = str(data["scouter_id"]) == str(scouter_id)
@@ -319,51 +925,35 @@ class ScoutingManager(DatabaseManager):
                 logger.warning(f"Data not found for team_id: {team_id}")
                 return False
 
-            # Check if the team is already scouted by someone else from the same team
-            pipeline = [
-                {
-                    "$match": {
-                        "event_code": data["event_code"],
-                        "match_number": int(data["match_number"]),
-                        "team_number": int(data["team_number"]),
-                        "_id": {"$ne": ObjectId(team_id)}  # Exclude current entry
-                    }
-                },
-                {
-                    "$lookup": {
-                        "from": "users",
-                        "localField": "scouter_id",
-                        "foreignField": "_id",
-                        "as": "scouter"
-                    }
-                },
-                {"$unwind": "$scouter"}
-            ]
-            
-            existing_entries = list(self.db.team_data.aggregate(pipeline))
-            current_user = self.db.users.find_one({"_id": ObjectId(scouter_id)})
-            
-            for entry in existing_entries:
-                if entry.get("scouter", {}).get("teamNumber") == current_user.get("teamNumber"):
-                    logger.warning(
-                        f"Update attempted for team {data['team_number']} in match {data['match_number']} "
-                        f"which is already scouted by team {current_user.get('teamNumber')}"
-                    )
-                    return False
-
-            # Get match data to validate alliance sizes
-            match_data = list(self.db.team_data.find({
-                "event_code": data["event_code"],
-                "match_number": int(data["match_number"]),
-                "_id": {"$ne": ObjectId(team_id)}  # Exclude current entry
-            }))
-
-            # Count teams per alliance
+            # Check if the team is already scouted by someone else from the same
+            # team, and that the alliance has room if the entry is moving to it
             alliance = data.get("alliance", "red")
-            red_teams = [m for m in match_data if m["alliance"] == "red"]
-            blue_teams = [m for m in match_data if m["alliance"] == "blue"]
-
-            if ((alliance == "red" and len(red_teams) >= 3) or (alliance == "blue" and len(blue_teams) >= 3)) and existing_data.get("alliance") != alliance:
+            old_slot = (
+                existing_data.get("scouting_team_number"),
+                existing_data.get("event_code"),
+                existing_data.get("match_number"),
+                existing_data.get("alliance"),
+            )
+            new_slot = (
+                existing_data.get("scouting_team_number"),
+                data["event_code"],
+                int(data["match_number"]),
+                alliance,
+            )
+            moved = new_slot != old_slot
+            if error := self._check_match_slot(
+                existing_data.get("scouting_team_number"),
+                data["event_code"],
+                int(data["match_number"]),
+                int(data["team_number"]),
+                alliance,
+                exclude_id=team_id,
+                check_capacity=moved,
+            ):
+                logger.warning(f"Update rejected for entry {team_id}: {error}")
+                return False
+            if moved and (error := self._reserve_alliance_slot(*new_slot)):
+                logger.warning(f"Update rejected for entry {team_id}: {error}")
                 return False
 
             updated_data = {
@@ -392,7 +982,7 @@ class ScoutingManager(DatabaseManager):
 
                 
                 # Auto
-                "auto_path": data.get("auto_path", ""),
+                "auto_path": encode_auto_path(data.get("auto_path", "")),
                 "auto_notes": data.get("auto_notes", ""),
                 
                 # Notes
@@ -419,10 +1009,32 @@ class ScoutingManager(DatabaseManager):
                 "teleop_algae_processor": int(data.get("teleop_algae_processor", 0)),
             }
 
-            result = self.db.team_data.update_one(
-                {"_id": ObjectId(team_id)},
-                {"$set": updated_data},
-            )
+            try:
+                result = self.db.team_data.update_one(
+                    {"_id": ObjectId(team_id)},
+                    {"$set": updated_data},
+                )
+            except DuplicateKeyError:
+                if moved:
+                    self._release_alliance_slot(*new_slot)
+                logger.warning(f"Update rejected for entry {team_id}: duplicate match entry")
+                return False
+            except Exception:
+                if moved:
+                    self._release_alliance_slot(*new_slot)
+                raise
+            if moved:
+                # The entry left its old place, or never took the new one
+                self._release_alliance_slot(
+                    *(old_slot if result.modified_count > 0 else new_slot)
+                )
+            if result.modified_count > 0:
+                scope = stats_scope(
+                    existing_data.get("scouting_team_number"),
+                    existing_data["scouter_id"],
+                )
+                self._apply_team_stats(existing_data, scope, sign=-1)
+                self._apply_team_stats({**existing_data, **updated_data}, scope, newest=False)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating team data: {str(e)}")
@@ -433,10 +1045,24 @@ class ScoutingManager(DatabaseManager):
         """Delete team data if scouter has permission"""
         self.ensure_connected()
         try:
-            result = self.db.team_data.delete_one(
+            deleted = self.db.team_data.find_one_and_delete(
                 {"_id": ObjectId(team_id), "scouter_id": ObjectId(scouter_id)}
             )
-            return result.deleted_count > 0
+            if not deleted:
+                return False
+
+            self._release_alliance_slot(
+                deleted.get("scouting_team_number"),
+                deleted.get("event_code"),
+                deleted.get("match_number"),
+                deleted.get("alliance"),
+            )
+            self._apply_team_stats(
+                deleted,
+                stats_scope(deleted.get("scouting_team_number"), scouter_id),
+                sign=-1,
+            )
+            return True
         except Exception as e:
             logger.error(f"Error deleting team data: {str(e)}")
             return False
@@ -503,6 +1129,91 @@ class ScoutingManager(DatabaseManager):
             logger.error(f"Error getting team stats: {str(e)}")
             return None
 
+    @staticmethod
+    def _format_team_stats(doc):
+        """Per-match averages in the shape the compare view expects"""
+        matches_played = doc.get("matches_played", 0)
+        sums = doc.get("sums", {})
+
+        def avg(field):
+            return sums.get(field, 0) / matches_played if matches_played else 0
+
+        return {
+            "_id": doc["team_number"],
+            "matches_played": matches_played,
+            **{
+                f"avg_{field}": avg(field)
+                for field in STATS_FIELDS if field != "defense_rating"
+            },
+            "climb_success_rate": (
+                doc.get("climb_successes", 0) / matches_played if matches_played else 0
+            ),
+            "defense_rating": avg("defense_rating"),
+            "defense_notes": [
+                note["note"] for note in reversed(doc.get("defense_notes", []))
+            ],
+            "preferred_climb_type": doc.get("last_climb_type", ""),
+        }
+
+    @with_mongodb_retry(retries=3, delay=2)
+    def get_compare_data(self, team_numbers, user_team_number=None, user_id=None,
+                         recent_limit=COMPARE_RECENT_MATCHES):
+        """Stats and most recent matches for several teams at once.
+
+        Stats are read from team_stats with one $in query; recent matches come
+        from a single team_data aggregation with one $facet branch per team,
+        each limited to `recent_limit` narrowly projected matches. Both cover
+        the same entries: the user's stats scope.
+        Returns {team_number: {"stats": ... or None, "matches": [...]}}.
+        """
+        self.ensure_connected()
+        team_numbers = [int(team_number) for team_number in team_numbers]
+        result = {team_number: {"stats": None, "matches": []} for team_number in team_numbers}
+        try:
+            scope = stats_scope(user_team_number, user_id)
+            for doc in self.db.team_stats.find(
+                {"scope": scope, "team_number": {"$in": team_numbers}}
+            ):
+                if doc.get("matches_played", 0) > 0:
+                    result[doc["team_number"]]["stats"] = self._format_team_stats(doc)
+
+            facets = {
+                f"team_{team_number}": [
+                    {"$match": {"team_number": team_number}},
+                    {"$sort": {"match_number": -1}},
+                    {"$limit": recent_limit},
+                    {"$lookup": {
+                        "from": "users",
+                        "localField": "scouter_id",
+                        "foreignField": "_id",
+                        "as": "scouter"
+                    }},
+                    {"$unwind": "$scouter"},
+                    {"$set": {
+                        "scouter_name": "$scouter.username",
+                        "profile_picture": "$scouter.profile_picture",
+                    }},
+                    {"$project": {"scouter": 0, "scouter_id": 0, "team_number": 0}},
+                ]
+                for team_number in team_numbers
+            }
+            # Narrow the documents before they enter the facet so drawings and
+            # unused fields aren't carried through it
+            pipeline = [
+                {"$match": {
+                    "team_number": {"$in": team_numbers},
+                    **stats_scope_filter(user_team_number, user_id),
+                }},
+                {"$project": COMPARE_MATCH_PROJECTION},
+                {"$facet": facets},
+            ]
+            matches = next(self.db.team_data.aggregate(pipeline), {})
+            for team_number in team_numbers:
+                result[team_number]["matches"] = matches.get(f"team_{team_number}", [])
+        except Exception as e:
+            logger.error(f"Error getting compare data for teams {team_numbers}: {str(e)}")
+        return result
+
     @with_mongodb_retry(retries=3, delay=2)
     def get_team_matches(self, team_number):
         """Get all match data for a specific team"""
@@ -528,31 +1239,24 @@ class ScoutingManager(DatabaseManager):
             return []
 
     @with_mongodb_retry(retries=3, delay=2)
-    def get_auto_paths(self, team_number):
-        """Get all auto paths for a specific team"""
+    def get_auto_paths(self, team_number, user_team_number=None, user_id=None):
+        """Stored (encoded) auto paths for a team's matches the user may see,
+        oldest first"""
         self.ensure_connected()
         try:
-            paths = list(self.db.team_data.find(
+            return list(self.db.team_data.find(
                 {
                     "team_number": int(team_number),
-                    "auto_path": {"$exists": True, "$ne": ""}
+                    "auto_path": {"$nin": ["", [], "[]", None]},
+                    **team_access_filter(user_team_number, user_id),
                 },
                 {
                     "match_number": 1,
                     "event_code": 1,
-                    "auto_path": 1
-                }
-            ).sort("match_number", 1))
-
-            return [
-                {
-                    "match_number": path.get("match_number", "Unknown"),
-                    "event_code": path.get("event_code", "Unknown"),
-                    "image_data": path["auto_path"],
+                    "auto_path": 1,
+                    "scouting_team_number": 1
                 }
-                for path in paths
-                if path.get("auto_path")
-            ]
+            ).sort("_id", 1))
         except Exception as e:
             logger.error(f"Error fetching auto paths for team {team_number}: {str(e)}")
             return []
@@ -566,33 +1270,17 @@ class ScoutingManager(DatabaseManager):
             scouter_id = ObjectId(data["scouter_id"])  # Convert to ObjectId
 
             # Check if this team is already scouted by someone from the same team
-            pipeline = [
-                {
-                    "$match": {
-                        "team_number": team_number
-                    }
-                },
-                {
-                    "$lookup": {
-                        "from": "users",
-                        "localField": "scouter_id",
-                        "foreignField": "_id",
-                        "as": "scouter"
-                    }
-                },
-                {"$unwind": "$scouter"}
-            ]
-            
-            existing_entries = list(self.db.pit_scouting.aggregate(pipeline))
-            current_user = self.db.users.find_one({"_id": scouter_id})
-            
-            for entry in existing_entries:
-                if entry.get("scouter", {}).get("teamNumber") == current_user.get("teamNumber"):
-                    logger.warning(f"Team {team_number} has already been pit scouted by team {current_user.get('teamNumber')}")
-                    return False
+            scouting_team_number = self._get_scouter_team_number(scouter_id)
+            if self.db.pit_scouting.find_one(
+                {"team_number": team_number, "scouting_team_number": scouting_team_number},
+                {"_id": 1}
+            ):
+                logger.warning(f"Team {team_number} has already been pit scouted by team {scouting_team_number}")
+                return False
 
             # Ensure scouter_id is ObjectId in the data
             data["scouter_id"] = scouter_id
+            data["scouting_team_number"] = scouting_team_number
             
             result = self.db.pit_scouting.insert_one(data)
             return bool(result.inserted_id)
@@ -660,44 +1348,10 @@ class ScoutingManager(DatabaseManager):
         try:
             logger.info(f"Fetching pit scouting data for user_id: {user_id}, team_number: {user_team_number}")
 
-            # First check if we have any data at all in the collection
-            total_count = self.db.pit_scouting.count_documents({})
-            logger.info(f"Total documents in pit_scouting collection: {total_count}")
-
-            # Log the raw documents for debugging
-            raw_docs = list(self.db.pit_scouting.find())
-            for doc in raw_docs:
-                logger.info(f"Raw pit scouting document: {doc}")
-                if 'scouter_id' in doc:
-                    scouter = self.db.users.find_one({"_id": doc['scouter_id']})
-                    logger.info(f"Associated scouter: {scouter}")
-
-            # Log the user's info
-            user_info = self.db.users.find_one({"_id": ObjectId(user_id)})
-            logger.info(f"User info: {user_info}")
-
-            # Add match stage for filtering based on team number or user ID
-            if user_team_number:
-                # If user has a team number, show data from their team and their own data
-                match_stage = {
-                    "$match": {
-                        "$or": [
-                            {"scouter.teamNumber": user_team_number},
-                            {"scouter._id": ObjectId(user_id)}
-                        ]
-                    }
-                }
-                logger.info(f"Using team filter with team number: {user_team_number}")
-            else:
-                # If user has no team, only show their own data
-                match_stage = {
-                    "$match": {
-                        "scouter._id": ObjectId(user_id)
-                    }
-                }
-                logger.info("Using individual user filter")
-
+            # Filter by team access first so the scouter lookup only runs on
+            # the user's own data
             pipeline = [
+                {"$match": team_access_filter(user_team_number, user_id)},
                 {
                     "$lookup": {
                         "from": "users",
@@ -707,30 +1361,27 @@ class ScoutingManager(DatabaseManager):
                     }
                 },
                 {"$unwind": "$scouter"},
-                *(
-                    match_stage,
-                    {
-                        "$project": {
-                            "_id": 1,
-                            "team_number": 1,
-                            "drive_type": 1,
-                            "swerve_modules": 1,
-                            "motor_details": 1,
-                            "motor_count": 1,
-                            "dimensions": 1,
-                            "mechanisms": 1,
-                            "programming_language": 1,
-                            "autonomous_capabilities": 1,
-                            "driver_experience": 1,
-                            "notes": 1,
-                            "created_at": 1,
-                            "updated_at": 1,
-                            "scouter_id": "$scouter._id",
-                            "scouter_name": "$scouter.username",
-                            "scouter_team": "$scouter.teamNumber",
-                        }
-                    },
-                ),
+                {
+                    "$project": {
+                        "_id": 1,
+                        "team_number": 1,
+                        "drive_type": 1,
+                        "swerve_modules": 1,
+                        "motor_details": 1,
+                        "motor_count": 1,
+                        "dimensions": 1,
+                        "mechanisms": 1,
+                        "programming_language": 1,
+                        "autonomous_capabilities": 1,
+                        "driver_experience": 1,
+                        "notes": 1,
+                        "created_at": 1,
+                        "updated_at": 1,
+                        "scouter_id": "$scouter._id",
+                        "scouter_name": "$scouter.username",
+                        "scouter_team": "$scouting_team_number",
+                    }
+                },
             ]
             # Log the full pipeline for debugging
             logger.info(f"MongoDB pipeline: {pipeline}")
@@ -767,33 +1418,19 @@ class ScoutingManager(DatabaseManager):
                 return False
 
             # Check if this team is already scouted by someone else from the same team
-            pipeline = [
+            scouting_team_number = self._get_scouter_team_number(scouter_id)
+            if self.db.pit_scouting.find_one(
                 {
-                    "$match": {
-                        "team_number": team_number,
-                        "_id": {"$ne": existing_data["_id"]}  # Exclude current entry
-                    }
+                    "team_number": team_number,
+                    "scouting_team_number": scouting_team_number,
+                    "_id": {"$ne": existing_data["_id"]}  # Exclude current entry
                 },
-                {
-                    "$lookup": {
-                        "from": "users",
-                        "localField": "scouter_id",
-                        "foreignField": "_id",
-                        "as": "scouter"
-                    }
-                },
-                {"$unwind": "$scouter"}
-            ]
-            
-            existing_entries = list(self.db.pit_scouting.aggregate(pipeline))
-            current_user = self.db.users.find_one({"_id": ObjectId(scouter_id)})
-            
-            for entry in existing_entries:
-                if entry.get("scouter", {}).get("teamNumber") == current_user.get("teamNumber"):
-                    logger.warning(
-                        f"Update attempted for team {team_number} which is already pit scouted by team {current_user.get('teamNumber')}"
-                    )
-                    return False
+                {"_id": 1}
+            ):
+                logger.warning(
+                    f"Update attempted for team {team_number} which is already pit scouted by team {scouting_team_number}"
+                )
+                return False
 
             result = self.db.pit_scouting.update_one(
                 {"team_number": team_number},
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+
+from app.utils import DatabaseManager, LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class TBACache(DatabaseManager):
+    """Two-level cache for TBA responses: an in-process LRU in front of the
+    `tba_cache` collection. Entries keep the ETag/Last-Modified validators so
+    stale entries can be revalidated with a conditional request."""
+
+    def __init__(self, mongo_uri, max_entries=512):
+        super().__init__(mongo_uri)
+        self.memory = LRUCache(max_entries)
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "revalidated": 0}
+        self._ensure_collections()
+
+    def _ensure_collections(self):
+        """Ensure the cache collection exists (its TTL index lives in app.indexes)"""
+        if "tba_cache" not in self.db.list_collection_names():
+            self.db.create_collection("tba_cache")
+            logger.info("Created tba_cache collection")
+
+    def get(self, key):
+        """Return the cached entry for a TBA path (fresh or stale), or None.
+
+        A stale memory entry is re-read from Mongo first: another process
+        (e.g. the warm-up job) may have revalidated it there since.
+        """
+        entry = self.memory.get(key)
+        if entry and entry["expires_at"] > time.time():
+            self.stats["memory_hits"] += 1
+            return entry
+
+        try:
+            doc = self.db.tba_cache.find_one({"_id": key})
+        except Exception as e:
+            logger.error(f"Error reading TBA cache for {key}: {str(e)}")
+            return entry
+
+        if not doc:
+            if entry:
+                return entry
+            self.stats["misses"] += 1
+            return None
+
+        entry = {
+            "data": json.loads(doc["body"]),
+            "etag": doc.get("etag"),
+            "last_modified": doc.get("last_modified"),
+            "expires_at": doc.get("expires_at", 0),
+        }
+        self.memory.set(key, entry)
+        self.stats["db_hits"] += 1
+        return entry
+
+    def set(self, key, data, ttl, etag=None, last_modified=None):
+        """Store a fresh TBA response"""
+        entry = {
+            "data": data,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": time.time() + ttl,
+        }
+        self.memory.set(key, entry)
+        try:
+            self.db.tba_cache.update_one(
+                {"_id": key},
+                {"$set": {
+                    "body": json.dumps(data),
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "expires_at": entry["expires_at"],
+                    "updated_at": datetime.now(timezone.utc),
+                }},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.error(f"Error writing TBA cache for {key}: {str(e)}")
+        return entry
+
+    def refresh(self, key, ttl):
+        """Extend a revalidated (304 Not Modified) entry for another TTL"""
+        self.stats["revalidated"] += 1
+        expires_at = time.time() + ttl
+        if entry := self.memory.get(key):
+            entry["expires_at"] = expires_at
+        try:
+            self.db.tba_cache.update_one(
+                {"_id": key},
+                {"$set": {
+                    "expires_at": expires_at,
+                    "updated_at": datetime.now(timezone.utc),
+                }},
+            )
+        except Exception as e:
+            logger.error(f"Error refreshing TBA cache for {key}: {str(e)}")
+
+    def invalidate(self, key):
+        """Drop a cached TBA path from both levels"""
+        self.memory.pop(key)
+        try:
+            self.db.tba_cache.delete_one({"_id": key})
+        except Exception as e:
+            logger.error(f"Error invalidating TBA cache for {key}: {str(e)}")
@@ -0,0 +1,86 @@
+"""Process-wide HTTP client for The Blue Alliance.
+
+Every TBA request in app/scout goes through one pooled keep-alive
+requests.Session. 429 and 5xx responses are retried with capped exponential
+backoff (honouring Retry-After up to the same cap), and a global semaphore
+caps how many requests are in flight at once across all threads. A request
+only holds its slot while it is on the wire, not while it waits to retry.
+The limit and pool size are read from TBA_MAX_CONCURRENCY (default 8).
+
+Async routes use TBAInterface's coroutine methods, which run the same pooled
+request on a worker thread, so they share the connection pool, concurrency
+limit and response cache instead of opening their own client session.
+"""
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+MAX_CONCURRENCY = int(os.getenv("TBA_MAX_CONCURRENCY", 8))
+
+# Dropped keep-alive connections are retried at once by urllib3. Error
+# statuses are retried by get() so the backoff doesn't hold a request slot.
+RETRY = Retry(total=2, read=0, status=0, backoff_factor=0)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 4
+BACKOFF_FACTOR = 0.5
+
+# Longest wait between attempts, including one asked for by Retry-After
+BACKOFF_MAX = 5
+
+_session = None
+_session_lock = threading.Lock()
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+
+
+def get_session():
+    """The shared session, created on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=MAX_CONCURRENCY,
+                    max_retries=RETRY,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _backoff(response, attempt):
+    """Seconds to wait before retrying a failed attempt"""
+    delay = BACKOFF_FACTOR * 2 ** attempt
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        delay = max(delay, int(retry_after))
+    return min(delay, BACKOFF_MAX)
+
+
+def get(url, **kwargs):
+    """GET through the shared session, waiting for a free request slot.
+    The last response is returned if every attempt gets an error status."""
+    for attempt in range(MAX_ATTEMPTS):
+        with _request_slots:
+            response = get_session().get(url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_ATTEMPTS - 1:
+            return response
+        delay = _backoff(response, attempt)
+        response.close()
+        time.sleep(delay)
+
+
+def close():
+    """Close pooled connections, e.g. on shutdown"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
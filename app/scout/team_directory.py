@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.utils import DatabaseManager
+
+from .TBA import TBAInterface
+
+logger = logging.getLogger(__name__)
+
+# How often the full team list is re-synced from TBA, and how often the
+# worker checks whether that is due
+SYNC_INTERVAL = timedelta(hours=24)
+SYNC_CHECK_INTERVAL = 60 * 60
+
+# Every app process runs a sync worker; only the one holding the lock syncs.
+# The lock expires after this long in case its holder dies mid-sync.
+SYNC_LOCK_LEASE = timedelta(minutes=30)
+
+# Safety stop for the page loop; TBA has ~25 pages of 500 teams
+MAX_PAGES = 100
+
+SEARCH_LIMIT = 10
+
+TEAM_FIELDS = (
+    "team_number", "key", "nickname", "name", "school_name", "city", "state_prov", "country",
+)
+
+# Document in sync_status recording the last complete sync
+SYNC_STATUS_ID = "tba_teams"
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text):
+    return _WORD.findall((text or "").lower())
+
+
+def _trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+def search_terms(team):
+    """Index terms for a team: prefixes of its number ("n:"), the first one
+    and two letters of every word of its nickname and city ("p:"), and the
+    trigrams of those words ("t:")"""
+    number = str(team.get("team_number", ""))
+    terms = {f"n:{number[:i]}" for i in range(1, len(number) + 1)}
+    for word in _words(team.get("nickname")) + _words(team.get("city")):
+        terms.update({f"p:{word[:1]}", f"p:{word[:2]}"})
+        terms.update(f"t:{trigram}" for trigram in _trigrams(word))
+    return sorted(terms)
+
+
+def query_terms(query):
+    """Groups of terms to search for; a team matches if it has indexed every
+    term of any one group. Each number in the query is its own group (a team
+    number prefix) and the remaining words form another, so "team 334" finds
+    team 334 as well as teams with "team" in their name"""
+    groups = []
+    terms = set()
+    for word in _words(query):
+        if word.isdigit():
+            groups.append([f"n:{word}"])
+        elif len(word) < 3:
+            terms.add(f"p:{word}")
+        else:
+            terms.update(f"t:{trigram}" for trigram in _trigrams(word))
+    if terms:
+        groups.append(sorted(terms))
+    return groups
+
+
+def _rank(query):
+    """Aggregation expression scoring a team, higher is better: number
+    matches, then nickname prefix, word prefix, substring, and finally
+    city-only matches. A query mixing numbers and words scores both, so a
+    team matching both ranks first."""
+    words = _words(query)
+    numbers = [int(word) for word in words if word.isdigit()]
+    text = " ".join(word for word in words if not word.isdigit())
+
+    score = []
+    if numbers:
+        number = {"$toString": "$team_number"}
+        score.append({"$switch": {
+            "branches": [
+                {"case": {"$in": ["$team_number", numbers]}, "then": 100},
+                {"case": {"$or": [
+                    {"$eq": [{"$indexOfCP": [number, str(prefix)]}, 0]}
+                    for prefix in numbers
+                ]}, "then": 80},
+            ],
+            "default": 0,
+        }})
+    if text:
+        nickname = {"$toLower": {"$ifNull": ["$nickname", ""]}}
+        score.append({"$switch": {
+            "branches": [
+                {"case": {"$eq": [nickname, text]}, "then": 70},
+                {"case": {"$eq": [{"$indexOfCP": [nickname, text]}, 0]}, "then": 60},
+                {"case": {"$and": [
+                    # Tokens are [a-z0-9]+, so they need no regex escaping
+                    {"$regexMatch": {"input": nickname, "regex": f"(^|[^a-z0-9]){token}"}}
+                    for token in text.split()
+                ]}, "then": 40},
+                {"case": {"$gte": [{"$indexOfCP": [nickname, text]}, 0]}, "then": 20},
+            ],
+            "default": 10,
+        }})
+    return {"$add": score}
+
+
+class TeamDirectory(DatabaseManager):
+    """Local copy of TBA's team list in the `tba_teams` collection, synced in
+    the background and indexed for instant search"""
+
+    def __init__(self, mongo_uri, tba=None):
+        super().__init__(mongo_uri)
+        self.tba = tba or TBAInterface()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._shutdown_event = threading.Event()
+        self._sync_thread = None
+        self._ensure_collections()
+
+    def _ensure_collections(self):
+        """Ensure the directory collection exists (its indexes live in app.indexes)"""
+        if "tba_teams" not in self.db.list_collection_names():
+            self.db.create_collection("tba_teams")
+            logger.info("Created tba_teams collection")
+
+    def start_sync_service(self):
+        """Start the background thread that keeps the directory in sync"""
+        if self._sync_thread is None or not self._sync_thread.is_alive():
+            self._shutdown_event.clear()
+            self._sync_thread = threading.Thread(target=self._sync_worker, daemon=True)
+            self._sync_thread.start()
+            logger.info("Team directory sync started")
+
+    def stop_sync_service(self):
+        """Stop the background sync thread"""
+        if self._sync_thread and self._sync_thread.is_alive():
+            self._shutdown_event.set()
+            self._sync_thread.join(timeout=5)
+            logger.info("Team directory sync stopped")
+
+    def _sync_worker(self):
+        while not self._shutdown_event.is_set():
+            try:
+                if self._sync_due() and self._acquire_sync_lock():
+                    try:
+                        # Another process may have finished a sync between
+                        # the check and taking the lock
+                        if self._sync_due():
+                            self.sync()
+                    finally:
+                        self._release_sync_lock()
+            except Exception as e:
+                logger.error(f"Error syncing team directory: {str(e)}")
+            self._shutdown_event.wait(SYNC_CHECK_INTERVAL)
+
+    def _sync_due(self):
+        """True if no sync has completed within SYNC_INTERVAL; other processes
+        sharing the database count as having synced it"""
+        status = self.db.sync_status.find_one({"_id": SYNC_STATUS_ID})
+        if not status or "completed_at" not in status:
+            return True
+        completed_at = status["completed_at"]
+        if completed_at.tzinfo is None:
+            completed_at = completed_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - completed_at > SYNC_INTERVAL
+
+    def _acquire_sync_lock(self):
+        """Take the sync lock unless another process holds an unexpired one"""
+        now = datetime.now(timezone.utc)
+        try:
+            self.db.sync_status.update_one(
+                {"_id": SYNC_STATUS_ID, "$or": [
+                    {"locked_until": {"$exists": False}},
+                    {"locked_until": {"$lte": now}},
+                ]},
+                {"$set": {"locked_by": self.worker_id, "locked_until": now + SYNC_LOCK_LEASE}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # The status document exists and its lock is held
+            return False
+        return True
+
+    def _release_sync_lock(self):
+        self.db.sync_status.update_one(
+            {"_id": SYNC_STATUS_ID, "locked_by": self.worker_id},
+            {"$unset": {"locked_by": "", "locked_until": ""}},
+        )
+
+    def sync(self):
+        """Copy every team from TBA's paged /teams/{page} list. The sync only
+        counts as complete once an empty page marks the end of the list; if
+        a page fails it is retried on the next check."""
+        synced = 0
+        complete = False
+        for page in range(MAX_PAGES):
+            if self._shutdown_event.is_set():
+                break
+            teams = self.tba.get_teams_page(page)
+            if teams is None:
+                logger.warning(f"Team directory sync stopped at page {page}: TBA request failed")
+                break
+            if not teams:
+                complete = True
+                break
+
+            now = datetime.now(timezone.utc)
+            self.db.tba_teams.bulk_write([
+                UpdateOne(
+                    {"_id": team["team_number"]},
+                    {"$set": {
+                        **{field: team.get(field) for field in TEAM_FIELDS},
+                        "search_terms": search_terms(team),
+                        "updated_at": now,
+                    }},
+                    upsert=True,
+                )
+                for team in teams
+                if team.get("team_number")
+            ], ordered=False)
+            synced += len(teams)
+
+        if complete:
+            self.db.sync_status.update_one(
+                {"_id": SYNC_STATUS_ID},
+                {"$set": {"completed_at": datetime.now(timezone.utc), "teams": synced}},
+                upsert=True,
+            )
+        logger.info(f"Synced {synced} teams into the team directory")
+        return synced
+
+    def is_empty(self):
+        return self.db.tba_teams.estimated_document_count() == 0
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Teams matching a number or name/city query, best match first"""
+        groups = query_terms(query)
+        if not groups:
+            return []
+
+        try:
+            # Every match is ranked on the server so the best ones are never
+            # cut off before scoring
+            return list(self.db.tba_teams.aggregate([
+                {"$match": {"$or": [
+                    {"search_terms": {"$all": terms}} for terms in groups
+                ]}},
+                {"$project": {
+                    "_id": 0,
+                    **{field: 1 for field in TEAM_FIELDS},
+                    "rank": _rank(query),
+                }},
+                {"$sort": {"rank": -1, "team_number": 1}},
+                {"$limit": limit},
+                {"$unset": "rank"},
+            ]))
+        except Exception as e:
+            logger.error(f"Error searching team directory: {str(e)}")
+            return []
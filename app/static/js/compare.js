@@ -235,8 +235,8 @@ function updateRawDataTable(data) {
                     ${match.climb_success ? `${match.climb_type || 'Yes'}` : 'No'}
                 </td>
                 <td class="px-3 sm:px-6 py-4 whitespace-nowrap text-sm text-gray-500">
-                    ${match.auto_path ? 
-                        `<button onclick='showAutoPath(${JSON.stringify(match.auto_path)}, ${JSON.stringify(match.auto_notes || '')}, "${match.device_type || ''}")' class="text-blue-600 hover:text-blue-800">View</button>` 
+                    ${match.has_auto_path ? 
+                        `<button onclick="loadAutoPath('${match._id}')" class="text-blue-600 hover:text-blue-800">View</button>` 
                         : 'None'}
                 </td>
                 <td class="px-3 sm:px-6 py-4 whitespace-nowrap text-sm text-gray-500">
@@ -260,6 +260,20 @@ function getTeamColor(index) {
     return colors[index] || colors[0];
 }
 
+// Drawings are left out of the compare response and fetched when viewed
+async function loadAutoPath(id) {
+    try {
+        const response = await fetch(`/api/scouting/${id}/auto_path`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const data = await response.json();
+        showAutoPath(data.auto_path, data.auto_notes || '', data.device_type || '');
+    } catch (error) {
+        console.error('Error loading auto path:', error);
+    }
+}
+
 function showAutoPath(pathData, autoNotes, deviceType) {
     const modal = document.getElementById('autoPathModal');
     const container = document.getElementById('autoPathContainer');
@@ -372,12 +386,11 @@ function updateAutoPaths(data) {
         `;
 
         // Get auto paths from matches
-        const autoPaths = teamData.matches?.map(match => ({
+        const autoPaths = teamData.matches?.filter(match => match.has_auto_path).map(match => ({
+            id: match._id,
             match_number: match.match_number,
-            path: match.auto_path,
-            notes: match.auto_notes,
-            device_type: match.device_type
-        })).filter(path => path.path) || [];
+            notes: match.auto_notes
+        })) || [];
         
         // Sort paths by match number and take latest 5
         const sortedPaths = [...autoPaths]
@@ -389,6 +402,14 @@ function updateAutoPaths(data) {
                 <p class="text-gray-500 italic">No auto paths available</p>
             `;
         } else {
+            // Heatmap of all of the team's paths, rendered server-side
+            teamContainer.innerHTML += `
+                <img src="/api/team/${teamNumber}/auto_paths.png" 
+                     alt="Auto path heatmap for team ${teamNumber}" 
+                     loading="lazy" 
+                     class="w-full rounded border border-gray-200 mb-4">
+            `;
+
             // Create a table for the paths
             const table = document.createElement('table');
             table.className = 'min-w-full divide-y divide-gray-200';
@@ -416,9 +437,12 @@ function updateAutoPaths(data) {
                         ${pathData.match_number}
                     </td>
                     <td class="px-3 py-2 whitespace-nowrap text-sm">
-                        <button onclick='showAutoPath(${JSON.stringify(pathData.path)}, ${JSON.stringify(pathData.notes || '')}, "${pathData.device_type || ''}")' 
-                                class="text-blue-600 hover:text-blue-800">
-                            View Path
+                        <button onclick="loadAutoPath('${pathData.id}')" 
+                                class="block" title="View Path">
+                            <img src="/api/scouting/${pathData.id}/auto_path.png" 
+                                 alt="Auto path for match ${pathData.match_number}" 
+                                 loading="lazy" 
+                                 class="w-40 rounded border border-gray-200 hover:border-blue-500">
                         </button>
                     </td>
                     <td class="px-3 py-2 text-sm text-gray-500">
@@ -151,9 +151,26 @@ async function updatePendingCount() {
   return count;
 }
 
+// Maximum entries per request to /api/scouting/bulk (matches the server limit)
+const BULK_SYNC_BATCH_SIZE = 200;
+
+/**
+ * Form fields of a queued entry without the IndexedDB bookkeeping
+ * @private
+ */
+function stripEntryMetadata(entry) {
+  const data = {};
+  for (const [key, value] of Object.entries(entry)) {
+    if (!['id', 'timestamp', 'url', 'synced'].includes(key)) {
+      data[key] = value;
+    }
+  }
+  return data;
+}
+
 /**
  * Attempt to sync offline data
- * @returns {Promise<{success: number, failed: number}>} - Sync results
+ * @returns {Promise<{success: number, failed: number, rejected: number}>} - Sync results
  */
 async function syncOfflineData() {
   if (!navigator.onLine) {
@@ -166,7 +183,7 @@ async function syncOfflineData() {
     return { success: 0, failed: 0 };
   }
   
-  const results = { success: 0, failed: 0 };
+  const results = { success: 0, failed: 0, rejected: 0 };
   
   // Try to use the service worker sync first if available
   if ('serviceWorker' in navigator && navigator.serviceWorker.controller) {
@@ -199,15 +216,62 @@ async function syncOfflineData() {
     }
   }
   
-  // Manual sync logic as fallback
-  for (const entry of entries) {
+  // Manual sync logic as fallback. Match scouting entries are sent in
+  // batches to the bulk endpoint; anything else is replayed one by one.
+  const scoutingEntries = entries.filter(entry => entry.url && entry.url.endsWith('/scouting/add'));
+  const otherEntries = entries.filter(entry => !scoutingEntries.includes(entry));
+
+  for (let i = 0; i < scoutingEntries.length; i += BULK_SYNC_BATCH_SIZE) {
+    const batch = scoutingEntries.slice(i, i + BULK_SYNC_BATCH_SIZE);
+    try {
+      const response = await fetch('/api/scouting/bulk', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          entries: batch.map(entry => ({
+            client_id: entry.id,
+            data: stripEntryMetadata(entry)
+          }))
+        })
+      });
+
+      if (!response.ok) {
+        results.failed += batch.length;
+        continue;
+      }
+
+      // Clear the entries the server accepted, and the ones it rejected for
+      // good (e.g. a robot already scouted) since resending can't help
+      const { results: entryResults = {} } = await response.json();
+      for (const entry of batch) {
+        const result = entryResults[String(entry.id)];
+        if (result && result.success) {
+          await deleteScoutingData(entry.id);
+          results.success++;
+        } else if (result && result.status === 'rejected') {
+          console.warn(`Entry ${entry.id} rejected:`, result.message);
+          await deleteScoutingData(entry.id);
+          results.rejected++;
+        } else {
+          if (result) {
+            console.warn(`Entry ${entry.id} rejected:`, result.message);
+          }
+          await markScoutingDataSynced(entry.id, false);
+          results.failed++;
+        }
+      }
+    } catch (error) {
+      console.error('Error syncing batch:', error);
+      results.failed += batch.length;
+    }
+  }
+
+  for (const entry of otherEntries) {
     try {
       // Create FormData from stored object
       const formData = new FormData();
-      for (const [key, value] of Object.entries(entry)) {
-        if (!['id', 'timestamp', 'url', 'synced'].includes(key)) {
-          formData.append(key, value);
-        }
+      for (const [key, value] of Object.entries(stripEntryMetadata(entry))) {
+        formData.append(key, value);
       }
       
       // Send to server
@@ -230,7 +294,7 @@ async function syncOfflineData() {
   }
   
   // Notify user about sync results
-  if (results.success > 0 || results.failed > 0) {
+  if (results.success > 0 || results.failed > 0 || results.rejected > 0) {
     showSyncNotification(results);
   }
   
@@ -247,7 +311,7 @@ async function syncOfflineData() {
 function showSyncNotification(results) {
   if ('Notification' in window && Notification.permission === 'granted') {
     new Notification('Scouting Data Synced', {
-      body: `Successfully synced ${results.success} entries. ${results.failed > 0 ? `Failed to sync ${results.failed} entries.` : ''}`,
+      body: `Successfully synced ${results.success} entries. ${results.failed > 0 ? `Failed to sync ${results.failed} entries.` : ''} ${results.rejected > 0 ? `${results.rejected} entries were rejected and removed.` : ''}`,
       icon: '/static/images/logo.png'
     });
   } else {
@@ -264,7 +328,7 @@ function showSyncNotification(results) {
           <path fill-rule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clip-rule="evenodd"></path>
         </svg>
         <p class="text-base font-medium">
-          Successfully synced ${results.success} entries. ${results.failed > 0 ? `Failed to sync ${results.failed} entries.` : ''}
+          Successfully synced ${results.success} entries. ${results.failed > 0 ? `Failed to sync ${results.failed} entries.` : ''} ${results.rejected > 0 ? `${results.rejected} entries were rejected and removed.` : ''}
         </p>
         <button class="ml-auto -mx-1.5 -my-1.5 rounded-lg p-1.5 inline-flex h-8 w-8 text-green-500 hover:bg-green-100" onclick="this.parentNode.parentNode.remove()">
           <svg class="w-5 h-5" fill="currentColor" viewBox="0 0 20 20">
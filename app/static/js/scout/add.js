@@ -543,7 +543,30 @@ document.addEventListener('DOMContentLoaded', function() {
     const allianceInput = document.getElementById('alliance_color');
 
     let currentMatches = null;
-    const eventMatches = JSON.parse(document.getElementById('event_matches').textContent);
+    // Match schedules fetched so far, keyed by TBA event key
+    const eventMatches = {};
+
+    async function loadEventMatches(eventKey) {
+        if (eventMatches[eventKey]) {
+            return eventMatches[eventKey];
+        }
+
+        try {
+            const response = await fetch(`/api/tba/matches/${encodeURIComponent(eventKey)}`);
+            if (!response.ok) {
+                return null;
+            }
+            const matches = await response.json();
+            if (!matches || matches.offline || matches.error) {
+                return null;
+            }
+            eventMatches[eventKey] = matches;
+            return matches;
+        } catch (error) {
+            console.error('Error loading matches:', error);
+            return null;
+        }
+    }
 
     // Load events from server-side data
     const events = JSON.parse(document.getElementById('events').textContent);
@@ -559,19 +582,27 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 
     // Load matches when event is selected
-    eventSelect.addEventListener('change', function() {
+    eventSelect.addEventListener('change', async function() {
         const selectedOption = this.options[this.selectedIndex];
         const selectedEventKey = selectedOption?.dataset.key;
         matchSelect.innerHTML = '<option value="">Select Match</option>';
         teamSelect.innerHTML = '<option value="">Select Team</option>';
         allianceInput.value = '';
+        currentMatches = null;
 
         if (!selectedEventKey) {
           return;
         }
 
-        // Use pre-loaded matches data
-        const matches = eventMatches[selectedEventKey];
+        matchSelect.innerHTML = '<option value="">Loading matches...</option>';
+        const matches = await loadEventMatches(selectedEventKey);
+
+        // Ignore the result if another event was selected while loading
+        if (this.options[this.selectedIndex]?.dataset.key !== selectedEventKey) {
+          return;
+        }
+
+        matchSelect.innerHTML = '<option value="">Select Match</option>';
         if (!matches) {
           return;
         }
@@ -87,6 +87,173 @@ function showAutoPath(pathData, autoNotes) {
     CanvasField.setReadonly(true);
 }
 
+async function loadAutoPath(id) {
+    try {
+        const response = await fetch(`/api/scouting/${id}/auto_path`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const data = await response.json();
+        showAutoPath(data.auto_path, data.auto_notes || '');
+    } catch (error) {
+        console.error('Error loading auto path:', error);
+    }
+}
+
+const escapeHtml = (value) => String(value ?? '')
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;')
+    .replace(/'/g, '&#39;');
+
+// Mirrors the row markup in scouting/list.html
+function renderRow(data, currentUserId) {
+    const row = document.createElement('tr');
+    row.className = 'team-row hover:bg-gray-50';
+    row.dataset.id = data._id;
+    row.dataset.teamNumber = String(data.team_number ?? '');
+    row.dataset.eventCode = data.event_code;
+    row.dataset.notes = data.notes || '';
+    row.dataset.scouter = data.scouter_name || '';
+
+    const cell = 'px-3 sm:px-6 py-4 whitespace-nowrap';
+    const allianceClass = data.alliance === 'red' ? 'bg-red-100 text-red-800' : 'bg-blue-100 text-blue-800';
+    const alliance = data.alliance ? data.alliance.charAt(0).toUpperCase() + data.alliance.slice(1) : '';
+    const mobile = data.device_type === 'mobile';
+    const isOwner = String(data.scouter_id) === String(currentUserId);
+
+    row.innerHTML = `
+        <td class="px-3 sm:px-6 py-4">${escapeHtml(data.team_number)}</td>
+        <td class="${cell}">
+            <div class="flex items-center">
+                <span class="px-2 py-1 text-sm rounded-full ${allianceClass}">${escapeHtml(alliance)}</span>
+            </div>
+        </td>
+        <td class="sm:table-cell ${cell}">${escapeHtml(data.match_number)}</td>
+        <td class="md:table-cell ${cell}">
+            ${[1, 2, 3, 4].map(level => escapeHtml(data[`auto_coral_level${level}`])).join('/')}
+        </td>
+        <td class="md:table-cell ${cell}">
+            ${escapeHtml(data.auto_algae_net)}/${escapeHtml(data.auto_algae_processor)}
+        </td>
+        <td class="md:table-cell ${cell}">
+            ${[1, 2, 3, 4].map(level => escapeHtml(data[`teleop_coral_level${level}`])).join('/')}
+        </td>
+        <td class="md:table-cell ${cell}">
+            ${escapeHtml(data.teleop_algae_net)}/${escapeHtml(data.teleop_algae_processor)}
+        </td>
+        <td class="md:table-cell ${cell}">
+            ${data.climb_success
+                ? `<span class="text-green-600">✓ ${escapeHtml(data.climb_type)}</span>`
+                : `<span class="text-red-600">✗ ${escapeHtml(data.climb_type)}</span>`}
+        </td>
+        <td class="${cell}">
+            ${data.has_auto_path
+                ? `<button onclick="loadAutoPath('${escapeHtml(data._id)}')" class="text-blue-600 hover:text-blue-900">
+                       <span class="hidden sm:inline">View Path${mobile ? ' (M)' : ''}</span>
+                       <span class="sm:hidden">🗺️${mobile ? '📱' : ''}</span>
+                   </button>`
+                : '<span class="text-gray-400">No path</span>'}
+        </td>
+        <td class="${cell}">${escapeHtml(data.defense_rating)}/5</td>
+        <td class="lg:table-cell px-3 sm:px-6 py-4 whitespace-normal max-w-xs truncate">${escapeHtml(data.notes)}</td>
+        <td class="${cell}">
+            <div class="flex items-center space-x-2">
+                <img src="/auth/profile/picture/${escapeHtml(data.scouter_id)}" 
+                     alt="Profile Picture" 
+                     class="w-6 h-6 sm:w-8 sm:h-8 rounded-full">
+                <div class="flex flex-col sm:flex-row sm:items-center sm:space-x-1">
+                    <a class="text-blue-600 hover:text-blue-900 text-sm" 
+                       href="/auth/profile/${encodeURIComponent(data.scouter_name || '')}">
+                        ${escapeHtml(data.scouter_name)}
+                    </a>
+                    ${data.scouter_team
+                        ? `<span class="sm:inline">
+                               <a href="/team/view/${escapeHtml(data.scouter_team)}" class="hover:text-blue-500">(${escapeHtml(data.scouter_team)})</a>
+                           </span>`
+                        : ''}
+                </div>
+            </div>
+        </td>
+        <td class="${cell}">
+            <div class="flex space-x-2">
+                ${isOwner
+                    ? `<a href="/scouting/edit/${escapeHtml(data._id)}" class="text-indigo-600 hover:text-indigo-900">
+                           <span class="hidden sm:inline">Edit</span>
+                           <span class="sm:hidden">📝</span>
+                       </a>
+                       <a href="/scouting/delete/${escapeHtml(data._id)}" 
+                          class="text-red-600 hover:text-red-900"
+                          onclick="return confirm('Are you sure you want to delete this?')">
+                           <span class="hidden sm:inline">Delete</span>
+                           <span class="sm:hidden">🗑️</span>
+                       </a>`
+                    : '<span class="text-gray-400 text-sm">No Access</span>'}
+            </div>
+        </td>`;
+    return row;
+}
+
+// Find the table body for an event, creating its section from an existing one if needed
+function getEventBody(container, eventCode) {
+    const existing = Array.from(container.querySelectorAll('.event-section'))
+        .find(section => section.dataset.eventCode === eventCode);
+    if (existing) {
+        return existing.querySelector('tbody');
+    }
+
+    const template = container.querySelector('.event-section');
+    const section = template.cloneNode(true);
+    section.dataset.eventCode = eventCode;
+    section.querySelector('h2').textContent = eventCode;
+    section.querySelector('tbody').innerHTML = '';
+    container.appendChild(section);
+    return section.querySelector('tbody');
+}
+
+async function loadMoreRows(event) {
+    event.preventDefault();
+    const button = event.currentTarget;
+    const container = document.getElementById('teamDataContainer');
+    if (!container || button.dataset.loading) {
+        return;
+    }
+
+    button.dataset.loading = 'true';
+    button.textContent = 'Loading...';
+    try {
+        const query = new URL(button.href, window.location.origin).search;
+        const response = await fetch(`/api/scouting/list${query}`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const { team_data: rows, next_cursor: nextCursor } = await response.json();
+
+        rows.forEach(data => {
+            getEventBody(container, data.event_code)
+                .appendChild(renderRow(data, container.dataset.currentUserId));
+        });
+        eventSections = container.querySelectorAll('.event-section');
+        filterRows();
+
+        if (nextCursor) {
+            const url = new URL(button.href, window.location.origin);
+            url.searchParams.set('after', nextCursor);
+            button.href = url.pathname + url.search;
+            button.dataset.nextCursor = nextCursor;
+            button.textContent = 'Load more';
+        } else {
+            button.parentElement.remove();
+        }
+    } catch (error) {
+        console.error('Error loading more scouting data:', error);
+        button.textContent = 'Load more';
+    } finally {
+        delete button.dataset.loading;
+    }
+}
+
 function closeAutoPathModal() {
     const modal = document.getElementById('autoPathModal');
     if (modal) {
@@ -105,6 +272,11 @@ document.addEventListener('DOMContentLoaded', function() {
         filterType.addEventListener('change', filterRows);
     }
 
+    const loadMoreButton = document.getElementById('loadMoreButton');
+    if (loadMoreButton) {
+        loadMoreButton.addEventListener('click', loadMoreRows);
+    }
+
     const modal = document.getElementById('autoPathModal');
     if (modal) {
         modal.addEventListener('click', function(e) {
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import secrets
 import string
+from copy import deepcopy
 from datetime import datetime, timezone, timedelta
 from io import BytesIO
 from typing import Dict, Optional, Tuple, Union
@@ -12,7 +13,9 @@ from bson.objectid import ObjectId
 from PIL import Image, ImageDraw, ImageFont
 
 from app.models import Assignment, Team, User
-from app.utils import DatabaseManager, with_mongodb_retry
+from app.notifications.notification_manager import flush_reminder_outbox
+from app.utils import (DatabaseManager, run_in_background, team_cache, user_cache,
+                       with_mongodb_retry)
 from flask import current_app
 
 logging.basicConfig(level=logging.INFO)
@@ -102,6 +105,7 @@ class TeamManager(DatabaseManager):
                 {"_id": ObjectId(creator_id)},
                 {"$set": {"teamNumber": team_number}}
             )
+            user_cache.pop(str(creator_id))
 
             return True, Team.create_from_db({"_id": result.inserted_id, **team_data})
 
@@ -132,6 +136,8 @@ class TeamManager(DatabaseManager):
                 {"_id": ObjectId(user_id)},
                 {"$set": {"teamNumber": team_data["team_number"]}},
             )
+            team_cache.pop(team_data["team_number"])
+            user_cache.pop(str(user_id))
 
             if updated_user := self.db.users.find_one({"_id": ObjectId(user_id)}):
                 user = User.create_from_db(updated_user)
@@ -173,6 +179,8 @@ class TeamManager(DatabaseManager):
             self.db.users.update_one(
                 {"_id": ObjectId(user_id)}, {"$unset": {"teamNumber": ""}}
             )
+            team_cache.pop(team_number)
+            user_cache.pop(str(user_id))
 
             logger.info(f"User {user_id} left team {team_number}")
             return True, "Successfully left team"
@@ -190,12 +198,16 @@ class TeamManager(DatabaseManager):
                 logger.warning("get_team_by_number called with None team_number")
                 return None
 
+            if team_data := team_cache.get(team_number):
+                return Team.create_from_db(deepcopy(team_data))
+
             team_data = self.db.teams.find_one({"team_number": team_number})
             if team_data is None:
                 logger.warning(f"No team found with team_number: {team_number}")
                 return None
 
-            return Team.create_from_db(team_data)
+            team_cache.set(team_number, team_data)
+            return Team.create_from_db(deepcopy(team_data))
         except Exception as e:
             logger.error(f"Error getting team: {str(e)}")
             return None
@@ -246,6 +258,7 @@ class TeamManager(DatabaseManager):
             result = self.db.teams.update_one(
                 {"team_number": team_number}, {"$addToSet": {"admins": user_id}}
             )
+            team_cache.pop(team_number)
 
             if result.modified_count > 0:
                 return True, "Admin added successfully"
@@ -283,6 +296,7 @@ class TeamManager(DatabaseManager):
             result = self.db.teams.update_one(
                 {"team_number": team_number}, {"$pull": {"admins": user_id}}
             )
+            team_cache.pop(team_number)
 
             if result.modified_count > 0:
                 return True, "Admin removed successfully"
@@ -322,6 +336,8 @@ class TeamManager(DatabaseManager):
             self.db.users.update_one(
                 {"_id": ObjectId(user_id)}, {"$unset": {"teamNumber": ""}}
             )
+            team_cache.pop(team_number)
+            user_cache.pop(str(user_id))
 
             if updated_user := self.db.users.find_one({"_id": ObjectId(user_id)}):
                 user = User.create_from_db(updated_user)
@@ -354,10 +370,12 @@ class TeamManager(DatabaseManager):
                 "due_date": assignment_data.get("due_date"),
                 "created_by": ObjectId(creator_id),
                 "created_at": datetime.now(timezone.utc),
+                "reminders_pending": ObjectId(),
             }
 
             result = self.db.assignments.insert_one(assignment)
             assignment["_id"] = result.inserted_id
+            self._schedule_reminders(result.inserted_id)
 
             # Add assignment to team
             self.db.teams.update_one(
@@ -366,27 +384,38 @@ class TeamManager(DatabaseManager):
             )
 
             from app.notifications.notification_manager import NotificationManager
-            import asyncio
-            
+
+            # Read the config now; the task runs after the request has ended
+            vapid_private_key = current_app.config.get("VAPID_PRIVATE_KEY")
+            vapid_claims = {"sub": f"mailto:{current_app.config.get('VAPID_CLAIM_EMAIL')}"}
+
             async def send_notifications():
                 try:
                     notification_manager = NotificationManager(
                         self.mongo_uri,
-                        vapid_private_key=current_app.config.get("VAPID_PRIVATE_KEY"),
-                        vapid_claims={"sub": f"mailto:{current_app.config.get('VAPID_CLAIM_EMAIL')}"}
+                        vapid_private_key=vapid_private_key,
+                        vapid_claims=vapid_claims
                     )
                     await notification_manager.send_instant_assignment_notification(assignment, team_number)
                 except Exception as e:
                     logger.error(f"Background notification error: {str(e)}")
 
             # Start notification task in background
-            asyncio.create_task(send_notifications())
+            run_in_background(send_notifications())
 
             return True, "Assignment created successfully"
         except Exception as e:
             logger.error(f"Error creating/updating assignment: {str(e)}")
             return False, "An internal error has occurred."
 
+    def _schedule_reminders(self, assignment_id: ObjectId) -> None:
+        """Reschedule an assignment's reminders right after a write that
+        flagged it; if this fails the notification worker retries it"""
+        try:
+            flush_reminder_outbox(self.db, {"_id": assignment_id})
+        except Exception as e:
+            logger.error(f"Error scheduling reminders for assignment {assignment_id}: {str(e)}")
+
     @with_mongodb_retry(retries=3, delay=2)
     def update_assignment_status(
         self, assignment_id: str, user_id: str, new_status: str
@@ -401,13 +430,14 @@ class TeamManager(DatabaseManager):
             if user_id not in assignment.get("assigned_to", []):
                 return False, "User is not assigned to this task"
 
-            update_data = {"status": new_status}
+            update_data = {"status": new_status, "reminders_pending": ObjectId()}
             if new_status == "completed":
                 update_data["completed_at"] = datetime.now(timezone.utc)
 
             self.db.assignments.update_one(
                 {"_id": ObjectId(assignment_id)}, {"$set": update_data}
             )
+            self._schedule_reminders(ObjectId(assignment_id))
 
             return True, "Assignment status updated successfully"
         except Exception as e:
@@ -442,8 +472,13 @@ class TeamManager(DatabaseManager):
             if not team.is_admin(user_id):
                 return False, "You don't have permission to clear assignments"
 
-            # Delete all assignments for the team
+            # Delete all assignments for the team and their unsent reminders
             result = self.db.assignments.delete_many({"team_number": team_number})
+            self.db.assignment_subscriptions.delete_many({
+                "team_number": team_number,
+                "assignment_id": {"$ne": None},
+                "sent": False
+            })
 
             if result.deleted_count > 0:
                 return True, f"Successfully cleared {result.deleted_count} assignments"
@@ -485,12 +520,15 @@ class TeamManager(DatabaseManager):
             # Delete all team data
             self.db.teams.delete_one({"team_number": team_number})
             self.db.assignments.delete_many({"team_number": team_number})
+            self.db.assignment_subscriptions.delete_many({"team_number": team_number})
 
             # Update all team members to remove team number
             for member_id in team_members:
                 self.db.users.update_one(
                     {"_id": ObjectId(member_id)}, {"$set": {"teamNumber": None}}
                 )
+                user_cache.pop(str(member_id))
+            team_cache.pop(team_number)
 
             return True, "Team deleted successfully"
 
@@ -520,8 +558,12 @@ class TeamManager(DatabaseManager):
             if not team.is_admin(user_id):
                 return False, "You don't have permission to delete assignments"
 
-            # Delete the assignment
+            # Delete the assignment and its unsent reminders
             result = self.db.assignments.delete_one({"_id": ObjectId(assignment_id)})
+            self.db.assignment_subscriptions.delete_many({
+                "assignment_id": assignment_id,
+                "sent": False
+            })
 
             if result.deleted_count > 0:
                 return True, "Assignment deleted successfully"
@@ -559,11 +601,13 @@ class TeamManager(DatabaseManager):
                 "due_date": assignment_data.get("due_date"),
                 "updated_at": datetime.now(timezone.utc),
                 "updated_by": ObjectId(user_id),
+                "reminders_pending": ObjectId(),
             }
 
             result = self.db.assignments.update_one(
                 {"_id": ObjectId(assignment_id)}, {"$set": update_data}
             )
+            self._schedule_reminders(ObjectId(assignment_id))
 
             if result.modified_count > 0:
                 return True, "Assignment updated successfully"
@@ -581,6 +625,7 @@ class TeamManager(DatabaseManager):
             result = self.db.users.update_one(
                 {"_id": ObjectId(user_id)}, {"$unset": {"teamNumber": ""}}
             )
+            user_cache.pop(str(user_id))
             if result.modified_count > 0:
                 logger.info(f"Reset team number for user {user_id}")
                 return True
@@ -629,6 +674,7 @@ class TeamManager(DatabaseManager):
                 {"team_number": team_number},
                 {"$set": {"logo_id": new_logo_id}}
             )
+            team_cache.pop(team_number)
             
             if result.modified_count > 0:
                 # Clean up old logo if it exists
@@ -678,6 +724,7 @@ class TeamManager(DatabaseManager):
                 {"team_number": team_number},
                 {"$set": valid_updates}
             )
+            team_cache.pop(team_number)
             
             if result.modified_count > 0:
                 # Run cleanup after successful update
@@ -751,6 +798,7 @@ class TeamManager(DatabaseManager):
                     "$pull": {"admins": new_owner_id}
                 }
             )
+            team_cache.pop(team_number)
 
             if result.modified_count > 0:
                 return True, "Ownership transferred successfully"
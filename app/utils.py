@@ -1,7 +1,10 @@
 import asyncio
+import gzip
 import logging
 import os
+import threading
 import time
+from collections import OrderedDict
 from functools import wraps
 from io import BytesIO
 from urllib.parse import urljoin, urlparse
@@ -27,6 +30,92 @@ load_dotenv()
 
 # ============ Database Utilities ============
 
+# Connection pool settings for the shared MongoClient
+MONGO_CLIENT_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", 50)),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", 0)),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000)),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 10000)),
+    "heartbeatFrequencyMS": int(os.getenv("MONGO_HEARTBEAT_INTERVAL_MS", 10000)),
+}
+if os.getenv("MONGO_SOCKET_TIMEOUT_MS"):
+    MONGO_CLIENT_OPTIONS["socketTimeoutMS"] = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS"))
+
+# A successful ping vouches for a client for one heartbeat interval; in
+# between, the driver's own server monitoring notices failures and reconnects
+MONGO_HEARTBEAT_INTERVAL = MONGO_CLIENT_OPTIONS["heartbeatFrequencyMS"] / 1000
+
+_mongo_clients = {}
+_mongo_clients_lock = threading.Lock()
+_mongo_alive_at = {}
+
+# Liveness pings sent, and those skipped because a recent one succeeded
+mongo_ping_stats = {"pings": 0, "pings_saved": 0}
+_mongo_ping_stats_lock = threading.Lock()
+
+# How often the ping counts are logged
+MONGO_PING_STATS_LOG_INTERVAL = int(os.getenv("MONGO_PING_STATS_LOG_INTERVAL", 600))
+_mongo_ping_stats_logged_at = time.monotonic()
+
+def get_mongo_client(mongo_uri: str) -> MongoClient:
+    """The process-wide MongoClient for a URI, created on first use. Every
+    DatabaseManager borrows it so a worker holds a single connection pool."""
+    client = _mongo_clients.get(mongo_uri)
+    if client is None:
+        with _mongo_clients_lock:
+            client = _mongo_clients.get(mongo_uri)
+            if client is None:
+                client = MongoClient(mongo_uri, **MONGO_CLIENT_OPTIONS)
+                _mongo_clients[mongo_uri] = client
+    return client
+
+def close_mongo_clients():
+    """Close every shared client, e.g. on shutdown"""
+    with _mongo_clients_lock:
+        for client in _mongo_clients.values():
+            client.close()
+        _mongo_clients.clear()
+
+def get_mongo_ping_stats():
+    """Snapshot of mongo_ping_stats including the share of pings saved"""
+    with _mongo_ping_stats_lock:
+        stats = dict(mongo_ping_stats)
+    checks = stats["pings"] + stats["pings_saved"]
+    stats["saved_ratio"] = stats["pings_saved"] / checks if checks else 0.0
+    return stats
+
+def _log_mongo_ping_stats():
+    global _mongo_ping_stats_logged_at
+    now = time.monotonic()
+    if now - _mongo_ping_stats_logged_at < MONGO_PING_STATS_LOG_INTERVAL:
+        return
+    _mongo_ping_stats_logged_at = now
+    stats = get_mongo_ping_stats()
+    logger.info(
+        f"MongoDB liveness: {stats['pings']} pings sent, "
+        f"{stats['pings_saved']} saved ({stats['saved_ratio']:.0%})"
+    )
+
+def check_mongo_alive(mongo_uri: str, client: MongoClient):
+    """Ping the server unless a ping within the heartbeat interval already
+    succeeded. Raises if it is unreachable."""
+    alive_at = _mongo_alive_at.get(mongo_uri)
+    if alive_at is not None and time.monotonic() - alive_at < MONGO_HEARTBEAT_INTERVAL:
+        with _mongo_ping_stats_lock:
+            mongo_ping_stats["pings_saved"] += 1
+        return
+
+    with _mongo_ping_stats_lock:
+        mongo_ping_stats["pings"] += 1
+    _log_mongo_ping_stats()
+    try:
+        client.admin.command("ping")
+    except Exception:
+        _mongo_alive_at.pop(mongo_uri, None)
+        raise
+    _mongo_alive_at[mongo_uri] = time.monotonic()
+
 def with_mongodb_retry(retries=3, delay=2):
     """Decorator for retrying MongoDB operations"""
     def decorator(f):
@@ -38,6 +127,8 @@ def with_mongodb_retry(retries=3, delay=2):
                     return f(*args, **kwargs)
                 except (ServerSelectionTimeoutError, ConnectionFailure) as e:
                     last_error = e
+                    # Make the next ensure_connected check for real
+                    _mongo_alive_at.clear()
                     if attempt < retries - 1:
                         logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
                         time.sleep(delay)
@@ -59,8 +150,8 @@ class DatabaseManager:
         """Establish connection to MongoDB"""
         try:
             if self.client is None:
-                self.client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=5000)
-                self.client.server_info()
+                self.client = get_mongo_client(self.mongo_uri)
+                check_mongo_alive(self.mongo_uri, self.client)
                 self.db = self.client.get_default_database()
                 logger.info("Successfully connected to MongoDB")
         except Exception as e:
@@ -68,28 +159,142 @@ class DatabaseManager:
             raise
 
     def ensure_connected(self):
-        """Ensure database connection is active"""
+        """Ensure database connection is active. The server is pinged at most
+        once per heartbeat interval rather than before every operation."""
         try:
             if self.client is None:
                 self.connect()
             else:
-                self.client.server_info()
+                check_mongo_alive(self.mongo_uri, self.client)
         except Exception:
             logger.warning("Lost connection to MongoDB, attempting to reconnect...")
             self.connect()
 
-    def __del__(self):
-        """Cleanup MongoDB connection"""
-        if self.client:
-            self.client.close()
+# ============ Cache Utilities ============
+
+class LRUCache:
+    """Small thread-safe least-recently-used map"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class TTLCache(LRUCache):
+    """LRUCache whose entries expire `ttl` seconds after being set"""
+
+    def __init__(self, ttl, max_entries=1024):
+        super().__init__(max_entries)
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key):
+        entry = super().get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                super().pop(key)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def set(self, key, value):
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+    def pop(self, key):
+        entry = super().pop(key)
+        return entry[1] if entry else None
+
+# User and team documents, keyed by user id string and team number. Every
+# write to a user or team must pop its entry; the TTL bounds how long other
+# worker processes can serve a stale copy.
+OBJECT_CACHE_TTL = int(os.getenv("OBJECT_CACHE_TTL", 60))
+user_cache = TTLCache(OBJECT_CACHE_TTL)
+team_cache = TTLCache(OBJECT_CACHE_TTL)
 
 # ============ Route Utilities ============
 
+# Each request thread keeps one event loop for the life of the thread instead
+# of creating and closing a loop per request. Loops are per thread rather than
+# shared because most route coroutines make blocking database calls, which
+# would serialize every request on a single loop.
+_thread_loops = threading.local()
+
+# Fire-and-forget work (e.g. notifications) runs on one long-lived loop in a
+# daemon thread so it survives the request that started it.
+_background_loop = None
+_background_lock = threading.Lock()
+_background_tasks = set()
+
+def _request_loop():
+    loop = getattr(_thread_loops, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_loops.loop = loop
+    return loop
+
+def run_async(coro):
+    """Run a coroutine to completion on this thread's persistent event loop"""
+    loop = _request_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+def get_background_loop():
+    """The shared background event loop, started on first use"""
+    global _background_loop
+    if _background_loop is None:
+        with _background_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="background-loop", daemon=True
+                ).start()
+                _background_loop = loop
+    return _background_loop
+
+def _log_background_result(future):
+    _background_tasks.discard(future)
+    if not future.cancelled() and future.exception():
+        logger.error(f"Background task failed: {str(future.exception())}")
+
+def run_in_background(coro):
+    """Schedule a coroutine on the background loop without waiting for it.
+    Unlike asyncio.create_task in a route, the task outlives the request."""
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    _background_tasks.add(future)
+    future.add_done_callback(_log_background_result)
+    return future
+
 def async_route(f):
     """Decorator to handle async routes"""
     @wraps(f)
     def wrapper(*args, **kwargs):
-        return asyncio.run(f(*args, **kwargs))
+        return run_async(f(*args, **kwargs))
     return wrapper
 
 def handle_route_errors(f):
@@ -107,6 +312,8 @@ def handle_route_errors(f):
 limiter = Limiter(
     key_func=get_remote_address,
     storage_uri=os.getenv("MONGO_URI"),
+    # The limits storage backend creates its own client; give it the same settings
+    storage_options=MONGO_CLIENT_OPTIONS,
     default_limits=["5000 per day", "1000 per hour"],
     strategy="fixed-window-elastic-expiry"
 )
@@ -161,6 +368,26 @@ def success_response(message: str = "Success", data: dict = None, status_code: i
         response["data"] = data
     return jsonify(response), status_code
 
+def cached_json_response(data, max_age: int = 60, min_compress_size: int = 1024):
+    """JSON response with an ETag, honouring If-None-Match and gzip-compressed
+    when the client accepts it"""
+    response = jsonify(data)
+    response.add_etag(weak=True)
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    response.vary.add("Accept-Encoding")
+    response.make_conditional(request)
+
+    if (
+        response.status_code == 200
+        and "gzip" in request.headers.get("Accept-Encoding", "")
+        and response.content_length
+        and response.content_length >= min_compress_size
+    ):
+        response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
 def error_response(message: str = "Error", status_code: int = 400, log_message: str = None):
     """Standard error response"""
     if log_message:
@@ -0,0 +1,159 @@
+"""Pre-populate the TBA cache for an event so scouters never wait on TBA.
+
+Warms the event's details, match schedule, team list and every attending
+team's info, then keeps them fresh on an interval while the event is running:
+
+    python -m app.warmup 2025nyli2            # one event
+    python -m app.warmup current              # every event this week
+    python -m app.warmup current --once       # single pass, e.g. from cron
+
+Refreshes only run on the event's dates between --day-start and --day-end
+(local time); outside those hours the job sleeps until the next window. Each
+refresh revalidates cached entries before they expire, so requests made by
+users during the event are always served from the cache.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from dotenv import load_dotenv
+
+from app.scout.TBA import MATCHES_TTL, TBAInterface
+from app.scout.tba_cache import TBACache
+
+logger = logging.getLogger(__name__)
+
+# Refresh a little before match schedules expire from the cache
+DEFAULT_INTERVAL = MATCHES_TTL - 60
+
+# Nobody is waiting on the job, so give full team lists and match schedules
+# time to finish
+TEAMS_TIMEOUT = 60
+
+
+def _parse_time(value):
+    return datetime.strptime(value, "%H:%M").time()
+
+
+def resolve_event_keys(tba, target):
+    """Event keys for an explicit key or for "current" (this week's events).
+    Either way the list of this week's events is fetched, so the add form's
+    event picker is served from the cache too."""
+    events = tba.get_current_events(datetime.now().year) or {}
+    if target != "current":
+        return [target]
+    return [event["key"] for event in events.values()]
+
+
+def warm_event(tba, event_key, matches):
+    """Fetch the rest of what the scouting pages need for one event, given
+    its already fetched match schedule. Returns the event details, or None if
+    TBA doesn't know the event."""
+    event = tba.get_event(event_key)
+    if not event:
+        logger.warning(f"Event {event_key} not found on TBA")
+        return None
+
+    team_keys = tba.get_event_teams(event_key) or []
+    teams = tba.get_teams(team_keys, total_timeout=TEAMS_TIMEOUT)
+    missing = sum(team is None for team in teams.values())
+
+    logger.info(
+        f"Warmed {event_key}: {len(matches)} matches, "
+        f"{len(team_keys) - missing}/{len(team_keys)} teams"
+    )
+    return event
+
+
+def warm(tba, target):
+    """One warm-up pass. Returns the details of every event that was warmed."""
+    event_keys = resolve_event_keys(tba, target)
+    # Match schedules change the most, so refresh them for every event at once
+    schedules = tba.get_matches_for_events(event_keys, total_timeout=TEAMS_TIMEOUT)
+
+    events = []
+    for event_key in event_keys:
+        if event := warm_event(tba, event_key, schedules.get(event_key, {})):
+            events.append(event)
+    return events
+
+
+def in_event_hours(events, now, day_start, day_end):
+    """True if `now` is during the hours of any event's days"""
+    if not day_start <= now.time() <= day_end:
+        return False
+    return any(
+        date.fromisoformat(event["start_date"]) <= now.date() <= date.fromisoformat(event["end_date"])
+        for event in events
+        if event.get("start_date") and event.get("end_date")
+    )
+
+
+def seconds_until_window(events, now, day_start):
+    """Seconds until the next event day's window opens, or None if all of
+    the events are over"""
+    upcoming = []
+    for event in events:
+        if not event.get("start_date") or not event.get("end_date"):
+            continue
+        end = date.fromisoformat(event["end_date"])
+        day = max(date.fromisoformat(event["start_date"]), now.date())
+        while day <= end:
+            opens = datetime.combine(day, day_start)
+            if opens > now:
+                upcoming.append(opens)
+                break
+            day += timedelta(days=1)
+    if not upcoming:
+        return None
+    return (min(upcoming) - now).total_seconds()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("event", help='TBA event key, or "current" for this week\'s events')
+    parser.add_argument("--once", action="store_true", help="warm once and exit")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL,
+                        help="seconds between refreshes (default: %(default)s)")
+    parser.add_argument("--day-start", type=_parse_time, default="07:00",
+                        help="local time refreshes start on event days (default: %(default)s)")
+    parser.add_argument("--day-end", type=_parse_time, default="21:00",
+                        help="local time refreshes stop on event days (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    load_dotenv()
+    TBAInterface.cache = TBACache(
+        os.getenv("MONGO_URI", "mongodb://localhost:27017/scouting_app")
+    )
+    tba = TBAInterface()
+    tba.revalidate = True
+
+    events = warm(tba, args.event)
+    if not events:
+        logger.error(f"No events to warm for {args.event}")
+        return 1
+    if args.once:
+        return 0
+
+    while True:
+        now = datetime.now()
+        if in_event_hours(events, now, args.day_start, args.day_end):
+            time.sleep(args.interval)
+            events = warm(tba, args.event) or events
+            continue
+
+        wait = seconds_until_window(events, now, args.day_start)
+        if wait is None:
+            logger.info("All events are over, stopping")
+            return 0
+        logger.info(f"Outside event hours, sleeping {wait / 3600:.1f}h")
+        time.sleep(wait)
+        events = warm(tba, args.event) or events
+
+
+if __name__ == "__main__":
+    sys.exit(main())
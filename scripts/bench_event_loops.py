@@ -0,0 +1,60 @@
+"""Per-request cost of the ways async routes have run their coroutines.
+
+    python scripts/bench_event_loops.py [requests]
+
+Compares asyncio.run (the old app.utils.async_route), a new loop per request
+(the old auth routes) and the per-thread persistent loop that
+app.utils.run_async now reuses. The view is a trivial coroutine, so the
+numbers are pure event loop overhead.
+"""
+import asyncio
+import sys
+import threading
+import time
+
+_local = threading.local()
+
+
+async def view():
+    return 1
+
+
+def asyncio_run():
+    return asyncio.run(view())
+
+
+def new_event_loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(view())
+    finally:
+        loop.close()
+
+
+def persistent_loop():
+    # Same as app.utils.run_async, without importing the Flask app
+    loop = getattr(_local, "loop", None)
+    if loop is None:
+        loop = _local.loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(view())
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    requests = int(argv[0]) if argv else 5000
+    for name, run in [
+        ("asyncio.run", asyncio_run),
+        ("new_event_loop", new_event_loop),
+        ("persistent loop", persistent_loop),
+    ]:
+        started = time.perf_counter()
+        for _ in range(requests):
+            run()
+        elapsed = time.perf_counter() - started
+        print(f"{name}: {elapsed / requests * 1e6:.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
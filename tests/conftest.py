@@ -0,0 +1,40 @@
+"""Shared fixtures. Tests run against mongomock by default; set
+TEST_MONGO_URI to run them against a scratch database on a real server
+instead (it is dropped afterwards)."""
+import os
+import uuid
+
+import pytest
+
+pytest.importorskip("flask")
+pymongo = pytest.importorskip("pymongo")
+
+from app import utils  # noqa: E402
+from app.indexes import ensure_indexes  # noqa: E402
+
+TEST_MONGO_URI = os.getenv("TEST_MONGO_URI")
+
+
+@pytest.fixture
+def mongo_uri():
+    """URI of an empty database with every index built"""
+    if TEST_MONGO_URI:
+        uri = TEST_MONGO_URI
+        client = pymongo.MongoClient(uri, serverSelectionTimeoutMS=1000)
+        try:
+            client.admin.command("ping")
+        except pymongo.errors.PyMongoError:
+            pytest.skip(f"no MongoDB server at {uri}")
+    else:
+        mongomock = pytest.importorskip("mongomock")
+        uri = f"mongodb://mongomock/scouting_test_{uuid.uuid4().hex[:8]}"
+        client = mongomock.MongoClient(uri)
+
+    db = client.get_default_database()
+    client.drop_database(db.name)
+    ensure_indexes(db)
+    # Managers borrow the registered client instead of opening their own
+    utils._mongo_clients[uri] = client
+    yield uri
+    utils._mongo_clients.pop(uri, None)
+    client.drop_database(db.name)
@@ -0,0 +1,103 @@
+"""One entry per robot per match, and at most three robots per alliance, for
+each scouting team"""
+import os
+
+import pytest
+
+from app.indexes import dedupe_team_data, ensure_indexes
+from app.scout.scouting_utils import ACCEPTED, REJECTED, ScoutingManager
+
+SCOUTER_ID = "65f000000000000000000001"
+OTHER_SCOUTER_ID = "65f000000000000000000002"
+SCOUTING_TEAM = 1234
+
+
+def entry(team_number, alliance="red", match_number=1):
+    return {
+        "team_number": team_number,
+        "event_code": "2025test",
+        "match_number": match_number,
+        "alliance": alliance,
+    }
+
+
+@pytest.fixture
+def manager(mongo_uri):
+    return ScoutingManager(mongo_uri)
+
+
+def add(manager, data, scouter_id=SCOUTER_ID):
+    return manager.add_scouting_data(data, scouter_id, scouting_team_number=SCOUTING_TEAM)
+
+
+def test_same_robot_twice_is_rejected(manager):
+    assert add(manager, entry(334))[0]
+
+    success, message = add(manager, entry(334), OTHER_SCOUTER_ID)
+
+    assert not success
+    assert "already been scouted" in message
+    assert manager.db.team_data.count_documents({"team_number": 334}) == 1
+
+
+def test_fourth_robot_on_an_alliance_is_rejected(manager):
+    for team_number in (1, 2, 3):
+        assert add(manager, entry(team_number))[0]
+
+    success, message = add(manager, entry(4))
+
+    assert not success
+    assert "maximum 3" in message
+    assert manager.db.team_data.count_documents({"alliance": "red"}) == 3
+    # The other alliance and other matches are unaffected
+    assert add(manager, entry(4, alliance="blue"))[0]
+    assert add(manager, entry(4, match_number=2))[0]
+
+
+def test_deleting_an_entry_frees_its_place(manager):
+    ids = [add(manager, entry(team_number))[1] for team_number in (1, 2, 3)]
+
+    assert manager.delete_team_data(ids[0], SCOUTER_ID)
+
+    assert add(manager, entry(4))[0]
+
+
+def test_reserving_with_an_existing_empty_counter(manager):
+    # A concurrent submission created the counter but hasn't incremented it
+    manager.db.match_slots.insert_one({
+        "_id": manager._slot_id(SCOUTING_TEAM, "2025test", 1, "red"), "count": 0,
+    })
+
+    assert add(manager, entry(334))[0]
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_MONGO_URI"),
+    reason="mongomock's bulk_write doesn't accept current pymongo UpdateOne operations",
+)
+def test_bulk_applies_the_same_limits(manager):
+    assert add(manager, entry(1))[0]
+
+    results = manager.add_scouting_data_bulk(
+        [("a", entry(1)), ("b", entry(2)), ("c", entry(3)), ("d", entry(4))],
+        SCOUTER_ID,
+        scouting_team_number=SCOUTING_TEAM,
+    )
+
+    assert results["a"][0] == REJECTED
+    assert results["b"][0] == ACCEPTED
+    assert results["c"][0] == ACCEPTED
+    assert results["d"][0] == REJECTED
+
+
+def test_legacy_duplicates_are_moved_before_the_unique_index(manager):
+    db = manager.db
+    db.team_data.drop()
+    for _ in range(2):
+        db.team_data.insert_one({**entry(334), "scouting_team_number": SCOUTING_TEAM})
+
+    ensure_indexes(db)
+
+    assert db.team_data.count_documents({}) == 1
+    assert db.team_data_duplicates.count_documents({}) == 1
+    assert dedupe_team_data(db) == 0
@@ -0,0 +1,34 @@
+"""Assignments written before the reminder outbox are flagged once"""
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pywebpush")
+
+from app.notifications.notification_manager import NotificationManager  # noqa: E402
+
+DUE_DATE = (datetime.now() + timedelta(days=1)).isoformat()
+
+
+def manager(mongo_uri):
+    return NotificationManager(mongo_uri, "private-key", {"sub": "mailto:test@example.com"})
+
+
+def test_open_assignments_are_flagged_once(mongo_uri):
+    db = manager(mongo_uri).db
+    db.migrations.drop()
+    db.assignments.insert_many([
+        {"title": "open", "status": "pending", "due_date": DUE_DATE},
+        {"title": "done", "status": "completed", "due_date": DUE_DATE},
+        {"title": "undated", "status": "pending", "due_date": None},
+    ])
+
+    manager(mongo_uri)
+
+    flagged = {doc["title"] for doc in db.assignments.find({"reminders_pending": {"$exists": True}})}
+    assert flagged == {"open"}
+
+    # Once recorded, later startups leave assignments alone
+    db.assignments.update_many({}, {"$unset": {"reminders_pending": ""}})
+    manager(mongo_uri)
+    assert db.assignments.count_documents({"reminders_pending": {"$exists": True}}) == 0
@@ -0,0 +1,87 @@
+"""Team directory search and the lock that keeps its sync to one process"""
+import os
+
+import pytest
+
+from app.scout.team_directory import TeamDirectory, query_terms, search_terms
+
+TEAMS = [
+    {"team_number": 334, "nickname": "TechKnights", "city": "Brooklyn"},
+    {"team_number": 3341, "nickname": "Robo Lions", "city": "Austin"},
+    {"team_number": 1678, "nickname": "Citrus Circuits", "city": "Davis"},
+    {"team_number": 254, "nickname": "The Cheesy Poofs", "city": "San Jose"},
+]
+
+
+class FakeTBA:
+    def __init__(self, teams=TEAMS):
+        self.pages = [teams, []]
+
+    def get_teams_page(self, page):
+        return self.pages[page] if page < len(self.pages) else []
+
+
+@pytest.fixture
+def directory(mongo_uri):
+    directory = TeamDirectory(mongo_uri, tba=FakeTBA())
+    # Seeded directly: mongomock's bulk_write can't run sync()'s upserts
+    directory.db.tba_teams.insert_many([
+        {"_id": team["team_number"], **team, "search_terms": search_terms(team)}
+        for team in TEAMS
+    ])
+    return directory
+
+
+def numbers(teams):
+    return [team["team_number"] for team in teams]
+
+
+# The ranking expression uses operators mongomock doesn't implement
+needs_server = pytest.mark.skipif(
+    not os.getenv("TEST_MONGO_URI"),
+    reason="mongomock doesn't implement $indexOfCP",
+)
+
+
+@pytest.mark.parametrize("query", ["team 334", "334 robo"])
+def test_mixed_query_matches_on_the_number_or_the_words(query):
+    groups = query_terms(query)
+
+    assert ["n:334"] in groups
+    assert len(groups) == 2
+    assert not any(term.startswith("n:") for term in groups[-1])
+    assert any(set(group) <= set(search_terms(TEAMS[0])) for group in groups)
+
+
+@needs_server
+def test_number_search_ranks_the_exact_team_first(directory):
+    assert numbers(directory.search("334")) == [334, 3341]
+
+
+@needs_server
+def test_name_search(directory):
+    assert numbers(directory.search("cheesy")) == [254]
+
+
+@needs_server
+@pytest.mark.parametrize("query", ["team 334", "334 robo"])
+def test_mixed_search_finds_the_number(directory, query):
+    assert 334 in numbers(directory.search(query))
+
+
+@needs_server
+def test_mixed_search_ranks_a_team_matching_both_first(directory):
+    assert numbers(directory.search("3341 lions"))[0] == 3341
+
+
+def test_only_one_process_holds_the_sync_lock(mongo_uri):
+    first = TeamDirectory(mongo_uri, tba=FakeTBA())
+    second = TeamDirectory(mongo_uri, tba=FakeTBA())
+
+    assert first._acquire_sync_lock()
+    assert not second._acquire_sync_lock()
+    # Holding the lock doesn't count as a completed sync
+    assert second._sync_due()
+
+    first._release_sync_lock()
+    assert second._acquire_sync_lock()
@@ -0,0 +1,123 @@
+"""team_stats must follow every team_data write: add, edit and delete"""
+import pytest
+
+from app.scout.scouting_utils import ALL_SCOPE, ScoutingManager, stats_scope
+
+SCOUTER_ID = "65f000000000000000000001"
+SCOUTING_TEAM = 1234
+SCOPES = (stats_scope(SCOUTING_TEAM, SCOUTER_ID), ALL_SCOPE)
+
+
+def entry(**fields):
+    return {
+        "team_number": 334,
+        "event_code": "2025test",
+        "match_number": 1,
+        "alliance": "red",
+        "auto_coral_level4": 2,
+        "climb_type": "deep",
+        "climb_success": True,
+        "defense_notes": "played defense",
+        **fields,
+    }
+
+
+@pytest.fixture
+def manager(mongo_uri):
+    return ScoutingManager(mongo_uri)
+
+
+def add(manager, **fields):
+    success, entry_id = manager.add_scouting_data(
+        entry(**fields), SCOUTER_ID, scouting_team_number=SCOUTING_TEAM
+    )
+    assert success, entry_id
+    return entry_id
+
+
+def stats(manager, scope, team_number=334):
+    return manager.db.team_stats.find_one({"scope": scope, "team_number": team_number})
+
+
+def notes(doc):
+    return [note["note"] for note in doc["defense_notes"]]
+
+
+def test_adding_an_entry_updates_team_stats(manager):
+    add(manager)
+
+    for scope in SCOPES:
+        doc = stats(manager, scope)
+        assert doc["matches_played"] == 1
+        assert doc["sums"]["auto_coral_level4"] == 2
+        assert doc["deep_climb_successes"] == 1
+        assert doc["last_climb_type"] == "deep"
+        assert notes(doc) == ["played defense"]
+
+
+def test_editing_an_entry_replaces_its_contribution(manager):
+    add(manager, match_number=1, climb_type="shallow")
+    entry_id = add(manager, match_number=2)
+
+    assert manager.update_team_data(
+        entry_id, entry(match_number=2, auto_coral_level4=5, climb_success=False), SCOUTER_ID
+    )
+
+    for scope in SCOPES:
+        doc = stats(manager, scope)
+        assert doc["matches_played"] == 2
+        assert doc["sums"]["auto_coral_level4"] == 7
+        assert doc["climb_successes"] == 1
+        assert notes(doc) == ["played defense", "played defense"]
+
+
+def test_editing_an_entry_to_another_team_moves_its_stats(manager):
+    entry_id = add(manager)
+
+    assert manager.update_team_data(entry_id, entry(team_number=335), SCOUTER_ID)
+
+    for scope in SCOPES:
+        assert stats(manager, scope) is None
+        doc = stats(manager, scope, team_number=335)
+        assert doc["matches_played"] == 1
+        assert doc["sums"]["auto_coral_level4"] == 2
+        assert doc["last_climb_type"] == "deep"
+
+
+def test_deleting_the_only_entry_removes_the_stats(manager):
+    entry_id = add(manager)
+
+    assert manager.delete_team_data(entry_id, SCOUTER_ID)
+
+    for scope in SCOPES:
+        assert stats(manager, scope) is None
+
+
+def test_deleting_an_entry_removes_only_its_note_and_climb(manager):
+    add(manager, match_number=1, climb_type="deep")
+    newest = add(manager, match_number=2, climb_type="shallow", climb_success=False)
+
+    assert manager.delete_team_data(newest, SCOUTER_ID)
+
+    for scope in SCOPES:
+        doc = stats(manager, scope)
+        assert doc["matches_played"] == 1
+        assert doc["deep_climb_attempts"] == 1
+        assert doc["climb_successes"] == 1
+        # Both entries had the same note; only the deleted one's is gone
+        assert notes(doc) == ["played defense"]
+        assert doc["last_climb_type"] == "deep"
+
+
+def test_rebuild_matches_the_running_totals(manager):
+    add(manager, match_number=1)
+    entry_id = add(manager, match_number=2, climb_type="shallow")
+    manager.update_team_data(entry_id, entry(match_number=2, auto_coral_level4=4), SCOUTER_ID)
+    running = {scope: stats(manager, scope) for scope in SCOPES}
+
+    assert manager.rebuild_team_stats() == 2
+
+    for scope in SCOPES:
+        rebuilt = stats(manager, scope)
+        for field in ("matches_played", "sums", "climb_successes", "deep_climb_attempts"):
+            assert rebuilt[field] == running[scope][field]